@@ -2,11 +2,40 @@
 Domain Models for PDF Scanner App.
 Data classes representing core entities.
 """
+import ast
+import json
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 from datetime import datetime
 from enum import Enum
 
+# Slotted dataclasses (no per-instance __dict__) where the runtime supports it
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def encode_quad_points(quad_points: Optional[List[tuple]]) -> Optional[str]:
+    """Serialize quad corners to a JSON string for storage."""
+    if not quad_points:
+        return None
+    # int() also unwraps numpy scalars from quad detection
+    return json.dumps([[int(x), int(y)] for x, y in quad_points])
+
+
+def decode_quad_points(text: Optional[str]) -> Optional[List[tuple]]:
+    """Parse stored quad corners, accepting legacy str(list) values."""
+    if not text:
+        return None
+    try:
+        points = json.loads(text)
+    except ValueError:
+        # Older rows hold repr() of a list of tuples
+        try:
+            points = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return None
+    return [tuple(p) for p in points]
+
 
 class FilterType(Enum):
     """Available image filters for scanned pages."""
@@ -41,7 +70,7 @@ class CompressionPreset(Enum):
         }[self]
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Page:
     """Represents a single scanned page."""
     id: Optional[int] = None
@@ -63,7 +92,7 @@ class Page:
             'image_path': self.image_path,
             'thumbnail_path': self.thumbnail_path,
             'filter_applied': self.filter_applied.value,
-            'quad_points': str(self.quad_points) if self.quad_points else None,
+            'quad_points': encode_quad_points(self.quad_points),
             'rotation': self.rotation,
             'created_at': self.created_at.isoformat(),
         }
@@ -71,12 +100,7 @@ class Page:
     @classmethod
     def from_dict(cls, data: dict) -> 'Page':
         """Create from dictionary."""
-        quad_points = None
-        if data.get('quad_points'):
-            try:
-                quad_points = eval(data['quad_points'])
-            except:
-                pass
+        quad_points = decode_quad_points(data.get('quad_points'))
         return cls(
             id=data.get('id'),
             document_id=data.get('document_id'),
@@ -90,7 +114,7 @@ class Page:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Document:
     """Represents a PDF document."""
     id: Optional[int] = None
@@ -132,23 +156,87 @@ class Document:
 
 @dataclass
 class ScanSession:
-    """Represents an ongoing scan session (for persistence across process death)."""
+    """
+    Represents an ongoing scan session (for persistence across process death).
+    
+    Saves only write pages flagged dirty, so pages must be changed through
+    add_page, remove_page, reorder_pages or update_page. Assigning to a
+    Page's fields directly is not persisted.
+    """
     id: Optional[int] = None
     pages: List[Page] = field(default_factory=list)
     started_at: datetime = field(default_factory=datetime.now)
     is_complete: bool = False
     current_page_index: int = 0
+    # Persistence bookkeeping: orders of pages changed since the last save,
+    # and whether the store holds a copy of every page (False = rewrite all)
+    _dirty_orders: Set[int] = field(default_factory=set, init=False, repr=False, compare=False)
+    _pages_stored: bool = field(default=False, init=False, repr=False, compare=False)
     
-    def to_dict(self) -> dict:
-        """Convert to dictionary for storage."""
+    def header_dict(self) -> dict:
+        """Convert session-level fields (no pages) to a dictionary."""
         return {
             'id': self.id,
-            'pages': [p.to_dict() for p in self.pages],
             'started_at': self.started_at.isoformat(),
             'is_complete': self.is_complete,
             'current_page_index': self.current_page_index,
+            'page_count': self.page_count(),
         }
     
+    def page_count(self) -> int:
+        """Get the number of pages."""
+        return len(self.pages)
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for storage."""
+        data = self.header_dict()
+        data['pages'] = [p.to_dict() for p in self.pages]
+        return data
+    
+    def dirty_pages(self) -> List[Page]:
+        """Get pages that changed since the last mark_clean()."""
+        if not self._pages_stored:
+            return list(self.pages)
+        return [p for p in self.pages if p.order in self._dirty_orders]
+    
+    def update_page(self, index: int, **changes) -> bool:
+        """
+        Change fields of a page in place and flag it for the next save.
+        
+        Args:
+            index: Page index
+            **changes: Page field names and new values
+            
+        Returns:
+            True if the page exists and was updated
+            
+        Raises:
+            AttributeError: If a name is not a Page field
+        """
+        if not 0 <= index < len(self.pages):
+            return False
+        page = self.pages[index]
+        for name, value in changes.items():
+            if name not in Page.__dataclass_fields__:
+                raise AttributeError(f"Page has no field {name!r}")
+            setattr(page, name, value)
+        self.mark_page_dirty(index)
+        return True
+    
+    def mark_page_dirty(self, index: int):
+        """Flag a page modified in place so the next save writes it."""
+        if 0 <= index < len(self.pages):
+            self._dirty_orders.add(self.pages[index].order)
+    
+    def mark_clean(self):
+        """Record that every page is now persisted."""
+        self._dirty_orders.clear()
+        self._pages_stored = True
+    
+    def mark_orders_dirty(self, orders: Iterable[int]):
+        """Flag pages by order as unsaved again (e.g. after a failed write)."""
+        self._dirty_orders.update(orders)
+    
     @classmethod
     def from_dict(cls, data: dict) -> 'ScanSession':
         """Create from dictionary."""
@@ -166,6 +254,7 @@ class ScanSession:
         page.order = len(self.pages)
         self.pages.append(page)
         self.current_page_index = len(self.pages) - 1
+        self._dirty_orders.add(page.order)
     
     def remove_page(self, index: int):
         """Remove a page by index."""
@@ -174,6 +263,7 @@ class ScanSession:
             # Reorder remaining pages
             for i, page in enumerate(self.pages):
                 page.order = i
+            self._dirty_orders.update(range(index, len(self.pages)))
     
     def reorder_pages(self, from_index: int, to_index: int):
         """Move a page from one position to another."""
@@ -183,9 +273,11 @@ class ScanSession:
             # Update order values
             for i, p in enumerate(self.pages):
                 p.order = i
+            lo, hi = sorted((from_index, to_index))
+            self._dirty_orders.update(range(lo, hi + 1))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AppState:
     """Application state for ads and purchases."""
     ads_enabled: bool = True
@@ -213,11 +213,9 @@ class ScanDocumentUseCase:
     def update_page(self, page_index: int, **kwargs):
         """Update a page in the current session."""
         session = self.get_or_create_session()
-        if 0 <= page_index < len(session.pages):
-            page = session.pages[page_index]
-            for key, value in kwargs.items():
-                if hasattr(page, key):
-                    setattr(page, key, value)
+        # Unknown keys are ignored, as before
+        changes = {k: v for k, v in kwargs.items() if k in Page.__dataclass_fields__}
+        if session.update_page(page_index, **changes):
             self.session_store.save_session(session)
             Logger.info(f"ScanUseCase: Updated page {page_index}")
     
@@ -281,8 +279,8 @@ class ExportPDFUseCase:
                               progress_callback: Callable[[int, int], None] = None) -> ProcessingResult:
         """Export scan session to PDF with specified compression."""
         from app.infra.pdf.pdf_build import PDFBuilder
-        from app.infra.pdf.pdf_compress import compress_images_for_pdf
-        from app.infra.imaging.exif_sanitize import sanitize_image
+        from app.infra.pdf.pdf_compress import compress_images_for_pdf_batch
+        from app.infra.imaging.exif_sanitize import sanitize_images_batch
         
         result = ProcessingResult()
         start_time = datetime.now()
@@ -301,54 +299,80 @@ class ExportPDFUseCase:
             output_path = os.path.join(self.documents_path, filename)
             
             # Process images with compression and sanitization
-            processed_images = []
-            total = len(session.pages)
-            
-            for i, page in enumerate(session.pages):
-                if progress_callback:
-                    Clock.schedule_once(lambda dt, idx=i: progress_callback(idx + 1, total), 0)
-                
+            source_paths = []
+            for page in session.pages:
                 if not os.path.exists(page.image_path):
                     Logger.warning(f"ExportUseCase: Page image not found: {page.image_path}")
                     continue
-                
-                # Sanitize (strip EXIF) and compress
-                sanitized_path = sanitize_image(page.image_path)
-                compressed_path = compress_images_for_pdf(
-                    sanitized_path, 
-                    preset.max_dimension, 
-                    preset.jpeg_quality
-                )
-                processed_images.append(compressed_path)
+                source_paths.append(page.image_path)
+            
+            def on_sanitized(done, total):
+                if progress_callback:
+                    Clock.schedule_once(lambda dt: progress_callback(done, total), 0)
+            
+            # Sanitize (strip EXIF) on a worker pool; compression runs as one
+            # batch below
+            sanitized_paths = sanitize_images_batch(source_paths, on_sanitized)
+            
+            # Compress all pages in parallel, keeping the JPEG bytes in memory
+            processed_images = compress_images_for_pdf_batch(
+                sanitized_paths,
+                preset.max_dimension,
+                preset.jpeg_quality,
+                as_bytes=True
+            )
             
             if not processed_images:
                 result.error_message = "No valid images to export"
                 return result
             
-            # Build PDF
+            # Build PDF; metadata sanitize and thumbnail finish in background
+            doc = Document(
+                name=os.path.splitext(filename)[0],
+                file_path=output_path,
+                page_count=len(processed_images),
+            )
+            thumb_path = os.path.splitext(output_path)[0] + '_thumb.jpg'
+            doc_lock = threading.Lock()
+            
+            def on_postprocessed(thumbnail_path):
+                # Only touch the thumbnail column; the row may have been
+                # renamed or deleted on the UI thread in the meantime
+                with doc_lock:
+                    doc.thumbnail_path = thumbnail_path or ''
+                    if doc.id is None:
+                        # Not saved yet; the save below picks it up
+                        return
+                    if not self.document_repo.set_thumbnail(doc.id, doc.thumbnail_path):
+                        if thumbnail_path and os.path.exists(thumbnail_path):
+                            try:
+                                os.remove(thumbnail_path)
+                            except OSError:
+                                pass
+            
             builder = PDFBuilder()
-            success = builder.images_to_pdf(processed_images, output_path)
+            success = builder.images_bytes_to_pdf(
+                processed_images, output_path,
+                thumbnail_path=thumb_path,
+                completion_callback=on_postprocessed
+            )
             
             if success:
                 result.success = True
                 result.output_path = output_path
                 
                 # Save document record
-                doc = Document(
-                    name=os.path.splitext(filename)[0],
-                    file_path=output_path,
-                    page_count=len(processed_images),
-                    file_size=os.path.getsize(output_path) if os.path.exists(output_path) else 0,
-                )
-                self.document_repo.save_document(doc)
+                with doc_lock:
+                    doc.file_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+                    self.document_repo.save_document(doc)
                 
                 Logger.info(f"ExportUseCase: PDF created at {output_path}")
             else:
                 result.error_message = "Failed to create PDF"
             
-            # Cleanup temp compressed images
-            for img_path in processed_images:
-                if img_path != page.image_path and os.path.exists(img_path):
+            # Cleanup temp sanitized images
+            for original_path, img_path in zip(source_paths, sanitized_paths):
+                if img_path != original_path and os.path.exists(img_path):
                     try:
                         os.remove(img_path)
                     except:
@@ -1,13 +1,20 @@
 """
 Imaging package for PDF Scanner App.
 """
+import os
+
+# Keep native libraries single-threaded per image; pages are parallelized
+# by the scanner pipeline executor instead. Must be set before OpenCV loads.
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+
 from .quad_detect import QuadDetector
 from .warp import PerspectiveWarper
 from .filters import ImageFilters
-from .exif_sanitize import sanitize_image
+from .exif_sanitize import sanitize_image, sanitize_images_batch, sanitize_image_to_bytes
 from .scanner_pipeline import ScannerPipeline
 
 __all__ = [
     'QuadDetector', 'PerspectiveWarper', 'ImageFilters',
-    'sanitize_image', 'ScannerPipeline',
+    'sanitize_image', 'sanitize_images_batch', 'sanitize_image_to_bytes',
+    'ScannerPipeline',
 ]
@@ -3,9 +3,30 @@ EXIF Sanitization for PDF Scanner App.
 Strips metadata from images for privacy protection.
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Callable, List, Optional
 from kivy.logger import Logger
 from PIL import Image
 
+# Pages sanitized at once. Pillow decodes, copies and encodes with the GIL
+# released, but each page holds a full decoded bitmap, so stay small.
+SANITIZE_WORKERS = 2
+
+_executor = ThreadPoolExecutor(max_workers=SANITIZE_WORKERS,
+                               thread_name_prefix='exif-sanitize')
+
+
+def _strip_metadata(image_path: str) -> Image.Image:
+    """Open an image and rebuild it from raw pixels, dropping all metadata."""
+    with Image.open(image_path) as img:
+        # Convert to RGB if necessary (for JPEG)
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        
+        # New image from the raw pixel buffer only; no info/EXIF carried over
+        return Image.frombytes(img.mode, img.size, img.tobytes())
+
 
 def sanitize_image(image_path: str, output_path: str = None) -> str:
     """
@@ -23,24 +44,8 @@ def sanitize_image(image_path: str, output_path: str = None) -> str:
             base, ext = os.path.splitext(image_path)
             output_path = f"{base}_sanitized.jpg"
         
-        # Open image
-        img = Image.open(image_path)
-        
-        # Get image data without EXIF
-        data = list(img.getdata())
-        
-        # Create new image without metadata
-        clean_img = Image.new(img.mode, img.size)
-        clean_img.putdata(data)
-        
-        # Convert to RGB if necessary (for JPEG)
-        if clean_img.mode == 'RGBA':
-            clean_img = clean_img.convert('RGB')
-        elif clean_img.mode not in ('RGB', 'L'):
-            clean_img = clean_img.convert('RGB')
-        
         # Save without EXIF
-        clean_img.save(output_path, 'JPEG', quality=95)
+        _strip_metadata(image_path).save(output_path, 'JPEG', quality=95)
         
         Logger.info(f"EXIF: Sanitized image saved to {output_path}")
         return output_path
@@ -51,6 +56,52 @@ def sanitize_image(image_path: str, output_path: str = None) -> str:
         return image_path
 
 
+def sanitize_images_batch(image_paths: List[str],
+                          progress_callback: Optional[Callable[[int, int], None]] = None) -> List[str]:
+    """
+    Sanitize several images on a small shared thread pool.
+    
+    Args:
+        image_paths: Paths to source images
+        progress_callback: Called with (done, total) as each image finishes,
+            from the calling thread
+        
+    Returns:
+        Sanitized image paths, in the same order as image_paths
+    """
+    total = len(image_paths)
+    if total < 2:
+        paths = map(sanitize_image, image_paths)
+    else:
+        # sanitize_image never raises; failures keep the original path
+        paths = _executor.map(sanitize_image, image_paths)
+    
+    results = []
+    for path in paths:
+        results.append(path)
+        if progress_callback:
+            progress_callback(len(results), total)
+    return results
+
+
+def sanitize_image_to_bytes(image_path: str) -> bytes:
+    """
+    Remove EXIF metadata and return the clean image as JPEG bytes.
+    
+    Args:
+        image_path: Path to source image
+        
+    Returns:
+        Encoded JPEG data without metadata
+        
+    Raises:
+        Exception: If the image cannot be read or encoded
+    """
+    buffer = BytesIO()
+    _strip_metadata(image_path).save(buffer, 'JPEG', quality=95)
+    return buffer.getvalue()
+
+
 def strip_exif_in_place(image_path: str) -> bool:
     """
     Strip EXIF metadata from image in place.
@@ -70,12 +121,8 @@ def strip_exif_in_place(image_path: str) -> bool:
             Logger.info("EXIF: No metadata found")
             return True
         
-        # Get image data
-        data = list(img.getdata())
-        
-        # Create clean image
-        clean_img = Image.new(img.mode, img.size)
-        clean_img.putdata(data)
+        # Create clean image from the raw pixel buffer
+        clean_img = Image.frombytes(img.mode, img.size, img.tobytes())
         
         # Convert mode if needed
         if clean_img.mode == 'RGBA':
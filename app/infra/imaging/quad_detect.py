@@ -65,6 +65,18 @@ class QuadDetector:
             Logger.error(f"QuadDetect: Detection from bytes failed: {e}")
             return QuadResult(detected=False)
     
+    def detect_from_image(self, img: Image.Image) -> QuadResult:
+        """Detect document quad from an already decoded PIL image."""
+        try:
+            if self.use_opencv:
+                rgb = np.asarray(img.convert('RGB'))
+                return self._process_opencv(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+            else:
+                return self._process_pillow(img)
+        except Exception as e:
+            Logger.error(f"QuadDetect: Detection from image failed: {e}")
+            return QuadResult(detected=False)
+    
     def _detect_opencv(self, image_path: str) -> QuadResult:
         """Detect using OpenCV."""
         # Load image
@@ -96,16 +108,17 @@ class QuadDetector:
         """Process image with OpenCV to find quad."""
         original_height, original_width = img.shape[:2]
         
+        # Grayscale first so the downscale moves one byte per pixel
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        
         # Downscale for processing
         scale = 1.0
         if original_width > self.DOWNSCALE_WIDTH:
             scale = self.DOWNSCALE_WIDTH / original_width
-            img = cv2.resize(img, None, fx=scale, fy=scale)
+            gray = cv2.resize(gray, None, fx=scale, fy=scale,
+                              interpolation=cv2.INTER_AREA)
         
-        height, width = img.shape[:2]
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape[:2]
         
         # Blur to reduce noise
         blurred = cv2.GaussianBlur(gray, (self.BLUR_SIZE, self.BLUR_SIZE), 0)
@@ -173,7 +186,10 @@ class QuadDetector:
         """Detect using Pillow (fallback)."""
         try:
             img = Image.open(image_path)
-            return self._process_pillow(img)
+            original_size = img.size
+            # JPEGs decode straight to reduced-size grayscale
+            img.draft('L', (self.DOWNSCALE_WIDTH, self.DOWNSCALE_WIDTH))
+            return self._process_pillow(img, original_size)
         except Exception as e:
             Logger.error(f"QuadDetect: Pillow detection failed: {e}")
             return QuadResult(detected=False)
@@ -181,29 +197,40 @@ class QuadDetector:
     def _detect_pillow_bytes(self, image_bytes: bytes, width: int, height: int) -> QuadResult:
         """Detect from bytes using Pillow."""
         try:
-            from io import BytesIO
-            img = Image.open(BytesIO(image_bytes))
+            if len(image_bytes) == width * height * 4:
+                img = Image.frombuffer('RGBA', (width, height), image_bytes, 'raw', 'RGBA', 0, 1)
+            elif len(image_bytes) == width * height * 3:
+                img = Image.frombuffer('RGB', (width, height), image_bytes, 'raw', 'RGB', 0, 1)
+            else:
+                # Encoded image data
+                from io import BytesIO
+                img = Image.open(BytesIO(image_bytes))
             return self._process_pillow(img)
         except Exception as e:
             Logger.error(f"QuadDetect: Pillow bytes detection failed: {e}")
             return QuadResult(detected=False)
     
-    def _process_pillow(self, img: Image.Image) -> QuadResult:
-        """Process image with Pillow to detect edges."""
-        original_width, original_height = img.size
-        
-        # Downscale for processing
-        scale = 1.0
-        if original_width > self.DOWNSCALE_WIDTH:
-            scale = self.DOWNSCALE_WIDTH / original_width
-            new_width = int(original_width * scale)
-            new_height = int(original_height * scale)
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    def _process_pillow(self, img: Image.Image,
+                        original_size: Optional[Tuple[int, int]] = None) -> QuadResult:
+        """
+        Process image with Pillow to detect edges.
+        
+        Args:
+            img: Image to analyze (may already be draft-reduced)
+            original_size: Full image size when img was reduced on decode
+        """
+        original_width, original_height = original_size or img.size
+        
+        # Grayscale first so the downscale moves one byte per pixel
+        gray = img.convert('L')
         
-        width, height = img.size
+        # Downscale for processing (box filter: area average, like INTER_AREA)
+        if gray.width > self.DOWNSCALE_WIDTH:
+            new_height = int(gray.height * self.DOWNSCALE_WIDTH / gray.width)
+            gray = gray.resize((self.DOWNSCALE_WIDTH, new_height), Image.Resampling.BOX)
+        scale = gray.width / original_width
         
-        # Convert to grayscale
-        gray = img.convert('L')
+        width, height = gray.size
         
         # Apply edge detection
         edges = gray.filter(ImageFilter.FIND_EDGES)
@@ -240,27 +267,22 @@ class QuadDetector:
     
     def _find_content_bbox(self, edges_img: Image.Image) -> Optional[Tuple[int, int, int, int]]:
         """Find bounding box of content in edge image."""
-        # Convert to pixels
-        pixels = list(edges_img.getdata())
         width, height = edges_img.size
         
-        min_x, min_y = width, height
-        max_x, max_y = 0, 0
-        edge_count = 0
-        
-        for y in range(height):
-            for x in range(width):
-                if pixels[y * width + x] > 128:
-                    edge_count += 1
-                    min_x = min(min_x, x)
-                    max_x = max(max_x, x)
-                    min_y = min(min_y, y)
-                    max_y = max(max_y, y)
+        # Count and bound edge pixels in C (histogram/getbbox) rather than
+        # walking every pixel in Python
+        mask = edges_img.point(lambda v: 255 if v > 128 else 0)
+        edge_count = mask.histogram()[255]
         
         # Require minimum edge pixels
         if edge_count < 100:
             return None
         
+        # getbbox's right/lower edges are exclusive
+        min_x, min_y, max_x, max_y = mask.getbbox()
+        max_x -= 1
+        max_y -= 1
+        
         # Add margin
         margin = 10
         min_x = max(0, min_x - margin)
@@ -329,6 +351,23 @@ class QuadDetector:
         except:
             return 128  # Default to mid-brightness
     
+    def estimate_frame_brightness(self, pixels: bytes, channels: int = 4,
+                                  sample_step: int = 61) -> float:
+        """
+        Estimate average brightness (0-255) of a raw RGB(A) frame.
+        
+        Reads every sample_step-th pixel straight from the buffer (strided
+        bytes slices, no decode), which is plenty for a mean.
+        """
+        step = channels * sample_step
+        r = pixels[0::step]
+        if not r:
+            return 128
+        g = pixels[1::step]
+        b = pixels[2::step]
+        # Rec. 601 luma weights
+        return (0.299 * sum(r) + 0.587 * sum(g) + 0.114 * sum(b)) / len(r)
+    
     def is_low_light(self, image_path: str, threshold: float = 50) -> bool:
         """Check if image appears to be in low light conditions."""
         return self.estimate_brightness(image_path) < threshold
@@ -5,15 +5,31 @@ Orchestrates the complete scanning workflow with background processing.
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Callable, List, Tuple
 from kivy.logger import Logger
 from kivy.clock import Clock
 
 from app.domain.models import Page, FilterType, QuadResult, ProcessingResult
-from .quad_detect import QuadDetector
+from .quad_detect import QuadDetector, OPENCV_AVAILABLE
 from .warp import PerspectiveWarper
 from .filters import ImageFilters
-from .exif_sanitize import sanitize_image
+from .exif_sanitize import sanitize_image_to_bytes
+
+
+# Shared page-level worker pool
+_page_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_page_executor() -> ThreadPoolExecutor:
+    """Get the shared executor used to process pages in parallel."""
+    global _page_executor
+    if _page_executor is None:
+        _page_executor = ThreadPoolExecutor(
+            max_workers=ScannerPipeline.MAX_PAGE_WORKERS,
+            thread_name_prefix='scan-page'
+        )
+    return _page_executor
 
 
 class ScannerPipeline:
@@ -22,16 +38,25 @@ class ScannerPipeline:
     # Preview throttling (FPS)
     PREVIEW_FRAME_INTERVAL = 0.2  # 5 FPS for detection
     
+    # Pages processed concurrently (each page uses a single native thread)
+    MAX_PAGE_WORKERS = min(4, os.cpu_count() or 1)
+    
+    # Intermediate files written by process_capture (safe to delete)
+    TEMP_PREFIXES = ('warped_', 'rotated_', 'deskewed_', 'filtered_', 'sanitized_')
+    
     def __init__(self, cache_path: str):
         self.cache_path = cache_path
         self.detector = QuadDetector()
         self.warper = PerspectiveWarper()
         self.filters = ImageFilters()
         
-        self._processing_thread: Optional[threading.Thread] = None
         self._is_processing = False
         self._last_preview_time = 0
         
+        if OPENCV_AVAILABLE:
+            import cv2
+            cv2.setNumThreads(1)
+        
         # Ensure cache directory exists
         os.makedirs(cache_path, exist_ok=True)
     
@@ -75,6 +100,18 @@ class ScannerPipeline:
         """
         return self.detector.detect(image_path)
     
+    def detect_document_from_image(self, img) -> QuadResult:
+        """
+        Detect document in a captured frame that is already in memory.
+        
+        Args:
+            img: Decoded PIL image
+            
+        Returns:
+            QuadResult with detection info
+        """
+        return self.detector.detect_from_image(img)
+    
     def process_capture(self, image_path: str, quad_points: Optional[List[Tuple[int, int]]] = None,
                         filter_type: FilterType = FilterType.ORIGINAL,
                         rotation: int = 0,
@@ -140,7 +177,13 @@ class ScannerPipeline:
             
             timestamp = int(time.time() * 1000)
             final_path = os.path.join(self.cache_path, f"page_{timestamp}.jpg")
-            current_path = sanitize_image(current_path, final_path)
+            try:
+                jpeg_bytes = sanitize_image_to_bytes(current_path)
+                with open(final_path, 'wb') as f:
+                    f.write(jpeg_bytes)
+                current_path = final_path
+            except Exception as e:
+                Logger.error(f"Pipeline: Sanitization failed: {e}")
             
             result.success = True
             result.output_path = current_path
@@ -182,8 +225,7 @@ class ScannerPipeline:
             if completion_callback:
                 Clock.schedule_once(lambda dt: completion_callback(result), 0)
         
-        self._processing_thread = threading.Thread(target=process, daemon=True)
-        self._processing_thread.start()
+        _get_page_executor().submit(process)
     
     def is_low_light(self, image_path: str) -> bool:
         """Check if image is in low light conditions."""
@@ -203,16 +245,13 @@ class ScannerPipeline:
         keep_set = set(keep_paths) if keep_paths else set()
         
         try:
-            for filename in os.listdir(self.cache_path):
-                filepath = os.path.join(self.cache_path, filename)
-                if filepath not in keep_set:
-                    # Only delete processing temp files
-                    if any(prefix in filename for prefix in ['warped_', 'rotated_', 
-                                                              'deskewed_', 'filtered_',
-                                                              'sanitized_']):
+            # scandir avoids a stat per entry; startswith(tuple) is one C call
+            with os.scandir(self.cache_path) as entries:
+                for entry in entries:
+                    if entry.name.startswith(self.TEMP_PREFIXES) and entry.path not in keep_set:
                         try:
-                            os.remove(filepath)
-                        except:
+                            os.unlink(entry.path)
+                        except OSError:
                             pass
             Logger.info("Pipeline: Cleaned up temp files")
         except Exception as e:
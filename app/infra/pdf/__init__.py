@@ -3,9 +3,13 @@ PDF package for PDF Scanner App.
 """
 from .pdf_build import PDFBuilder
 from .pdf_tools import PDFTools
-from .pdf_compress import compress_images_for_pdf, compress_pdf
+from .pdf_compress import (
+    compress_images_for_pdf, compress_image_to_bytes,
+    compress_images_for_pdf_batch, compress_pdf
+)
 
 __all__ = [
     'PDFBuilder', 'PDFTools',
-    'compress_images_for_pdf', 'compress_pdf',
+    'compress_images_for_pdf', 'compress_image_to_bytes',
+    'compress_images_for_pdf_batch', 'compress_pdf',
 ]
@@ -3,11 +3,35 @@ PDF Builder for PDF Scanner App.
 Converts images to PDF using available libraries.
 """
 import os
-from typing import List, Optional
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
 from kivy.logger import Logger
 
 from PIL import Image
 
+from .pdf_tools import _atomic_write_pdf
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+
+# Shared worker for post-build steps (metadata sanitize, thumbnail)
+_postprocess_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_postprocess_executor() -> ThreadPoolExecutor:
+    """Get the shared post-processing executor."""
+    global _postprocess_executor
+    if _postprocess_executor is None:
+        _postprocess_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='pdf-postprocess'
+        )
+    return _postprocess_executor
+
 
 class PDFBuilder:
     """Builds PDF files from scanned images."""
@@ -20,14 +44,19 @@ class PDFBuilder:
         pass
     
     def images_to_pdf(self, image_paths: List[str], output_path: str,
-                      title: str = None) -> bool:
+                      title: str = None, thumbnail_path: str = None,
+                      completion_callback: Callable[[Optional[str]], None] = None) -> bool:
         """
         Convert a list of images to a PDF file.
         
+        Thin wrapper over images_bytes_to_pdf that reads each image file.
+        
         Args:
             image_paths: List of paths to image files
             output_path: Output PDF file path
             title: Optional title for PDF metadata
+            thumbnail_path: Optional path for a first-page thumbnail
+            completion_callback: See images_bytes_to_pdf
             
         Returns:
             True if successful, False otherwise
@@ -36,9 +65,68 @@ class PDFBuilder:
             Logger.error("PDFBuilder: No images provided")
             return False
         
+        # Read images as bytes
+        image_bytes_list = []
+        for path in image_paths:
+            if not os.path.exists(path):
+                Logger.warning(f"PDFBuilder: Image not found: {path}")
+                continue
+            
+            with open(path, 'rb') as f:
+                image_bytes_list.append(f.read())
+        
+        return self.images_bytes_to_pdf(
+            image_bytes_list, output_path, title,
+            thumbnail_path, completion_callback
+        )
+    
+    def images_bytes_to_pdf(self, image_bytes_list: List[bytes], output_path: str,
+                            title: str = None, thumbnail_path: str = None,
+                            completion_callback: Callable[[Optional[str]], None] = None) -> bool:
+        """
+        Convert already-encoded images (e.g. JPEG bytes) to a PDF file.
+        
+        Metadata is sanitized before this returns, so the file is final
+        once it reports success. The first-page thumbnail is a separate
+        file: with a completion_callback it is written on a background
+        worker and the callback receives its path (or None).
+        
+        Args:
+            image_bytes_list: Encoded image data, one entry per page
+            output_path: Output PDF file path
+            title: Optional title for PDF metadata
+            thumbnail_path: Optional path for a first-page thumbnail
+            completion_callback: Optional callback(thumbnail_path) run on the
+                worker thread once post-processing finishes
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not image_bytes_list:
+            Logger.error("PDFBuilder: No images provided")
+            return False
+        
+        if not self._build(image_bytes_list, output_path):
+            return False
+        
+        # Rewrites the file in place; must not race callers using it next
+        self._sanitize_pdf_metadata(output_path, title)
+        
+        if completion_callback is None:
+            self._postprocess(output_path, thumbnail_path,
+                              first_page=image_bytes_list[0])
+        else:
+            _get_postprocess_executor().submit(
+                self._postprocess, output_path, thumbnail_path,
+                completion_callback, image_bytes_list[0]
+            )
+        return True
+    
+    def _build(self, image_bytes_list: List[bytes], output_path: str) -> bool:
+        """Write the PDF file, preferring img2pdf over Pillow."""
         # Try img2pdf first (better quality, maintains resolution)
         try:
-            return self._build_with_img2pdf(image_paths, output_path, title)
+            return self._build_with_img2pdf(image_bytes_list, output_path)
         except ImportError:
             Logger.info("PDFBuilder: img2pdf not available, using Pillow")
         except Exception as e:
@@ -46,28 +134,30 @@ class PDFBuilder:
         
         # Fallback to Pillow
         try:
-            return self._build_with_pillow(image_paths, output_path, title)
+            return self._build_with_pillow(image_bytes_list, output_path)
         except Exception as e:
             Logger.error(f"PDFBuilder: Pillow build failed: {e}")
             return False
     
-    def _build_with_img2pdf(self, image_paths: List[str], output_path: str,
-                            title: str = None) -> bool:
-        """Build PDF using img2pdf library."""
-        import img2pdf
-        
-        # Read images as bytes
-        image_bytes_list = []
-        for path in image_paths:
-            if not os.path.exists(path):
-                Logger.warning(f"PDFBuilder: Image not found: {path}")
-                continue
-            
-            with open(path, 'rb') as f:
-                image_bytes_list.append(f.read())
+    def _postprocess(self, pdf_path: str, thumbnail_path: str = None,
+                     completion_callback: Callable[[Optional[str]], None] = None,
+                     first_page: bytes = None):
+        """Write the thumbnail for a built PDF."""
+        thumb = None
+        try:
+            if thumbnail_path and first_page:
+                thumb = self.write_thumbnail(first_page, thumbnail_path)
+            elif thumbnail_path:
+                thumb = self.extract_first_page_image(pdf_path, thumbnail_path)
+        except Exception as e:
+            Logger.error(f"PDFBuilder: Post-processing failed: {e}")
         
-        if not image_bytes_list:
-            return False
+        if completion_callback:
+            completion_callback(thumb)
+    
+    def _build_with_img2pdf(self, image_bytes_list: List[bytes], output_path: str) -> bool:
+        """Build PDF using img2pdf library (embeds JPEG streams as-is)."""
+        import img2pdf
         
         # Convert to PDF
         pdf_bytes = img2pdf.convert(image_bytes_list)
@@ -76,25 +166,17 @@ class PDFBuilder:
         with open(output_path, 'wb') as f:
             f.write(pdf_bytes)
         
-        # Update metadata to neutral values
-        self._sanitize_pdf_metadata(output_path, title)
-        
         Logger.info(f"PDFBuilder: Created PDF with img2pdf: {output_path}")
         return True
     
-    def _build_with_pillow(self, image_paths: List[str], output_path: str,
-                           title: str = None) -> bool:
+    def _build_with_pillow(self, image_bytes_list: List[bytes], output_path: str) -> bool:
         """Build PDF using Pillow's save method."""
         images = []
         first_image = None
         
-        for path in image_paths:
-            if not os.path.exists(path):
-                Logger.warning(f"PDFBuilder: Image not found: {path}")
-                continue
-            
+        for i, image_bytes in enumerate(image_bytes_list):
             try:
-                img = Image.open(path)
+                img = Image.open(BytesIO(image_bytes))
                 
                 # Convert to RGB if necessary (PDF doesn't support RGBA)
                 if img.mode == 'RGBA':
@@ -111,7 +193,7 @@ class PDFBuilder:
                     images.append(img)
                     
             except Exception as e:
-                Logger.warning(f"PDFBuilder: Failed to load image {path}: {e}")
+                Logger.warning(f"PDFBuilder: Failed to load image {i + 1}: {e}")
         
         if first_image is None:
             return False
@@ -127,9 +209,6 @@ class PDFBuilder:
         else:
             first_image.save(output_path, 'PDF', resolution=150.0)
         
-        # Sanitize metadata
-        self._sanitize_pdf_metadata(output_path, title)
-        
         Logger.info(f"PDFBuilder: Created PDF with Pillow: {output_path}")
         return True
     
@@ -139,7 +218,8 @@ class PDFBuilder:
         Uses pypdf to update metadata.
         """
         try:
-            from pypdf import PdfReader, PdfWriter
+            if not PYPDF_AVAILABLE:
+                raise ImportError("pypdf not available")
             
             reader = PdfReader(pdf_path)
             writer = PdfWriter()
@@ -158,9 +238,8 @@ class PDFBuilder:
                 '/Keywords': '',
             })
             
-            # Write back
-            with open(pdf_path, 'wb') as f:
-                writer.write(f)
+            # Write back via temp file so readers never see a partial PDF
+            _atomic_write_pdf(writer, pdf_path)
             
             Logger.info("PDFBuilder: Sanitized PDF metadata")
             
@@ -172,13 +251,42 @@ class PDFBuilder:
     def get_page_count(self, pdf_path: str) -> int:
         """Get the number of pages in a PDF."""
         try:
-            from pypdf import PdfReader
+            if not PYPDF_AVAILABLE:
+                raise ImportError("pypdf not available")
             reader = PdfReader(pdf_path)
             return len(reader.pages)
         except Exception as e:
             Logger.error(f"PDFBuilder: Failed to get page count: {e}")
             return 0
     
+    def write_thumbnail(self, image_bytes: bytes, output_path: str,
+                        max_size: int = 256) -> Optional[str]:
+        """
+        Write a small JPEG thumbnail from an encoded page image.
+        
+        Recents rows show these instead of decoding full-size pages.
+        
+        Args:
+            image_bytes: Encoded page image (e.g. JPEG bytes)
+            output_path: Thumbnail file path
+            max_size: Longest side of the thumbnail
+            
+        Returns:
+            output_path if written, None otherwise
+        """
+        try:
+            with Image.open(BytesIO(image_bytes)) as img:
+                # JPEG pages decode straight at reduced scale
+                img.draft('RGB', (max_size, max_size))
+                img.thumbnail((max_size, max_size), Image.Resampling.BILINEAR)
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                img.save(output_path, 'JPEG', quality=80)
+            return output_path
+        except Exception as e:
+            Logger.error(f"PDFBuilder: Thumbnail failed: {e}")
+            return None
+    
     def extract_first_page_image(self, pdf_path: str, output_path: str,
                                   max_size: int = 300) -> Optional[str]:
         """
@@ -188,7 +296,8 @@ class PDFBuilder:
         you'd need pdf2image or similar, which requires poppler.
         """
         try:
-            from pypdf import PdfReader
+            if not PYPDF_AVAILABLE:
+                raise ImportError("pypdf not available")
             
             reader = PdfReader(pdf_path)
             if not reader.pages:
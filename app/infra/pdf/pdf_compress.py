@@ -3,9 +3,43 @@ PDF Compression for PDF Scanner App.
 Compresses scanned document PDFs by resizing/recompressing images.
 """
 import os
-from typing import Tuple
+import shutil
+import struct
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import List, Optional, Tuple
 from kivy.logger import Logger
-from PIL import Image
+import PIL
+from PIL import Image, features
+
+from .pdf_tools import _atomic_write_pdf
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+# Pillow-SIMD publishes ".postN" versions of the upstream release
+PILLOW_SIMD = '.post' in PIL.__version__
+
+try:
+    LIBJPEG_TURBO = bool(features.check_feature('libjpeg_turbo'))
+except Exception:
+    LIBJPEG_TURBO = False
+
+# With libjpeg-turbo the extra Huffman-optimization pass costs ~30% of
+# encode time for a few percent of size; skip it there.
+JPEG_OPTIMIZE = not LIBJPEG_TURBO
+
+# Progressive scans are a few percent smaller than baseline at the same
+# quality; below this quality baseline is about as small
+PROGRESSIVE_MIN_QUALITY = 50
+
+Logger.info(f"Compress: Pillow {PIL.__version__}"
+            f"{' (SIMD)' if PILLOW_SIMD else ''}"
+            f"{', libjpeg-turbo' if LIBJPEG_TURBO else ''} loaded")
 
 
 # Compression presets
@@ -15,6 +49,83 @@ PRESETS = {
     'high': {'max_dimension': 2500, 'jpeg_quality': 80},
 }
 
+# Content streams shorter than this on a page with image XObjects are
+# just image placement ("q ... cm /Im0 Do Q") and not worth deflating
+IMAGE_ONLY_CONTENT_LIMIT = 256
+
+# Shared by every export. Pillow releases the GIL while resizing and
+# encoding, so threads scale with cores without forking the app.
+_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                               thread_name_prefix='pdf-compress')
+
+# JPEG start-of-frame markers carrying the image dimensions (SOF0-SOF15,
+# excluding DHT 0xC4, JPG 0xC8 and DAC 0xCC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# zlib level 6 is ~30% faster than 9 for a few percent larger streams
+CONTENT_STREAM_ZLIB_LEVEL = 6
+
+
+def _prepare_image(image_path: str, max_dimension: int) -> Tuple[Image.Image, Tuple[int, int]]:
+    """
+    Open, downscale and convert an image to RGB for JPEG encoding.
+    
+    Returns:
+        Tuple of (prepared image, original size)
+    """
+    img = Image.open(image_path)
+    original_size = img.size
+    
+    # Check if resizing needed
+    needs_resize = max(original_size) > max_dimension
+    
+    if needs_resize:
+        # Calculate new size maintaining aspect ratio
+        ratio = max_dimension / max(original_size)
+        new_size = (int(original_size[0] * ratio), int(original_size[1] * ratio))
+        
+        # JPEG only: have libjpeg decode straight to 1/2, 1/4 or 1/8
+        # scale (never below new_size); no-op for other formats
+        img.draft('RGB', new_size)
+        
+        # Cheap integer box reduction next; Lanczos only covers the
+        # remaining sub-2x ratio
+        factor = int(max(img.size) / max_dimension)
+        if factor >= 2:
+            img = img.reduce(factor)
+        
+        if img.size != new_size:
+            img = img.resize(new_size, Image.Resampling.LANCZOS)
+    
+    # Convert to RGB if necessary
+    if img.mode == 'RGBA':
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[3])
+        img = background
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    
+    return img, original_size
+
+
+def _jpeg_save_options(jpeg_quality: int) -> dict:
+    """Get Pillow JPEG save options for a quality setting."""
+    return {
+        'quality': jpeg_quality,
+        'optimize': JPEG_OPTIMIZE,
+        'progressive': jpeg_quality >= PROGRESSIVE_MIN_QUALITY,
+        'subsampling': 2,  # 4:2:0 chroma
+    }
+
+
+def _log_compression(original_size: Tuple[int, int], new_size: Tuple[int, int],
+                     original_file_size: int, new_file_size: int):
+    """Log compression stats."""
+    reduction = (1 - new_file_size / original_file_size) * 100 if original_file_size else 0.0
+    Logger.info(f"Compress: {original_size} -> {new_size}, "
+                f"{original_file_size // 1024}KB -> {new_file_size // 1024}KB "
+                f"({reduction:.1f}% reduction)")
+
 
 def compress_images_for_pdf(image_path: str, max_dimension: int = 2000,
                             jpeg_quality: int = 65) -> str:
@@ -30,41 +141,17 @@ def compress_images_for_pdf(image_path: str, max_dimension: int = 2000,
         Path to compressed image (may be same as input if no compression needed)
     """
     try:
-        img = Image.open(image_path)
-        original_size = img.size
-        
-        # Check if resizing needed
-        needs_resize = max(original_size) > max_dimension
-        
-        if needs_resize:
-            # Calculate new size maintaining aspect ratio
-            ratio = max_dimension / max(original_size)
-            new_size = (int(original_size[0] * ratio), int(original_size[1] * ratio))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-        
-        # Convert to RGB if necessary
-        if img.mode == 'RGBA':
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            background.paste(img, mask=img.split()[3])
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
+        img, original_size = _prepare_image(image_path, max_dimension)
         
         # Generate output path
         base, ext = os.path.splitext(image_path)
         output_path = f"{base}_compressed.jpg"
         
         # Save with compression
-        img.save(output_path, 'JPEG', quality=jpeg_quality, optimize=True)
+        img.save(output_path, 'JPEG', **_jpeg_save_options(jpeg_quality))
         
-        # Log compression stats
-        original_file_size = os.path.getsize(image_path)
-        new_file_size = os.path.getsize(output_path)
-        reduction = (1 - new_file_size / original_file_size) * 100
-        
-        Logger.info(f"Compress: {original_size} -> {img.size}, "
-                    f"{original_file_size // 1024}KB -> {new_file_size // 1024}KB "
-                    f"({reduction:.1f}% reduction)")
+        _log_compression(original_size, img.size,
+                         os.path.getsize(image_path), os.path.getsize(output_path))
         
         return output_path
         
@@ -73,7 +160,92 @@ def compress_images_for_pdf(image_path: str, max_dimension: int = 2000,
         return image_path
 
 
-def compress_pdf(pdf_path: str, output_path: str, preset: str = 'balanced') -> bool:
+def compress_image_to_bytes(image_path: str, max_dimension: int = 2000,
+                            jpeg_quality: int = 65) -> bytes:
+    """
+    Compress an image for PDF inclusion, returning JPEG bytes in memory.
+    
+    Same processing as compress_images_for_pdf without the temp file.
+    
+    Args:
+        image_path: Path to source image
+        max_dimension: Maximum width or height in pixels
+        jpeg_quality: JPEG quality (1-100)
+        
+    Returns:
+        Compressed JPEG data (the original file bytes if compression fails)
+    """
+    try:
+        img, original_size = _prepare_image(image_path, max_dimension)
+        
+        buffer = BytesIO()
+        img.save(buffer, 'JPEG', **_jpeg_save_options(jpeg_quality))
+        data = buffer.getvalue()
+        
+        _log_compression(original_size, img.size,
+                         os.path.getsize(image_path), len(data))
+        
+        return data
+        
+    except Exception as e:
+        Logger.error(f"Compress: Failed to compress image: {e}")
+        with open(image_path, 'rb') as f:
+            return f.read()
+
+
+def compress_images_for_pdf_batch(image_paths: List[str], max_dimension: int = 2000,
+                                  jpeg_quality: int = 65,
+                                  as_bytes: bool = False) -> list:
+    """
+    Compress several images for PDF inclusion in parallel.
+    
+    Runs on a module-level thread pool shared across exports. A page that
+    fails is logged and handled on its own: path mode keeps the original
+    path, bytes mode drops the page.
+    
+    Args:
+        image_paths: Paths to source images
+        max_dimension: Maximum width or height in pixels
+        jpeg_quality: JPEG quality (1-100)
+        as_bytes: Return JPEG bytes (compress_image_to_bytes) instead of
+            temp file paths
+        
+    Returns:
+        Compressed image paths (or bytes), in the same order as image_paths;
+        pages that failed are omitted in bytes mode
+    """
+    compress = compress_image_to_bytes if as_bytes else compress_images_for_pdf
+    job = partial(compress, max_dimension=max_dimension, jpeg_quality=jpeg_quality)
+    futures = [_executor.submit(job, path) for path in image_paths]
+    
+    results = []
+    for path, future in zip(image_paths, futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            Logger.error(f"Compress: Failed to compress {path}: {e}")
+            if not as_bytes:
+                results.append(path)
+    return results
+
+
+def _is_image_only_page(page) -> bool:
+    """Check for a scanned page: image XObjects drawn by a trivial content stream."""
+    try:
+        if '/Resources' not in page:
+            return False
+        resources = page['/Resources'].get_object()
+        if '/XObject' not in resources or not resources['/XObject'].get_object():
+            return False
+        
+        contents = page.get_contents()
+        return contents is None or len(contents.get_data()) < IMAGE_ONLY_CONTENT_LIMIT
+    except Exception:
+        return False
+
+
+def compress_pdf(pdf_path: str, output_path: str, preset: str = 'balanced',
+                 compress_streams: bool = False) -> bool:
     """
     Compress a PDF by extracting, recompressing, and rebuilding.
     Note: This works for image-based PDFs (scanned documents).
@@ -82,14 +254,16 @@ def compress_pdf(pdf_path: str, output_path: str, preset: str = 'balanced') -> b
         pdf_path: Path to source PDF
         output_path: Path for compressed output
         preset: Compression preset ('small', 'balanced', 'high')
+        compress_streams: Deflate page content streams. PDFs built by this
+            app already have minimal streams, so only enable this for
+            externally supplied PDFs. Image-only pages are always skipped.
         
     Returns:
         True if successful
     """
     try:
-        from pypdf import PdfReader, PdfWriter
-        import tempfile
-        import shutil
+        if not PYPDF_AVAILABLE:
+            raise ImportError("pypdf not available")
         
         settings = PRESETS.get(preset, PRESETS['balanced'])
         max_dim = settings['max_dimension']
@@ -114,17 +288,22 @@ def compress_pdf(pdf_path: str, output_path: str, preset: str = 'balanced') -> b
         for page in reader.pages:
             writer.add_page(page)
         
-        # Compress content streams
-        for page in writer.pages:
-            page.compress_content_streams()
+        # Compress content streams (nothing to gain on image-only pages)
+        if compress_streams:
+            for page in writer.pages:
+                if not _is_image_only_page(page):
+                    page.compress_content_streams(level=CONTENT_STREAM_ZLIB_LEVEL)
+        
+        # Deduplicate identical objects (e.g. repeated images) document-wide
+        if hasattr(writer, 'compress_identical_objects'):  # pypdf >= 4.3
+            writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
         
         writer.add_metadata({
             '/Creator': 'PDF Scanner',
             '/Producer': 'PDF Scanner',
         })
         
-        with open(output_path, 'wb') as f:
-            writer.write(f)
+        _atomic_write_pdf(writer, output_path)
         
         # Log compression
         original_size = os.path.getsize(pdf_path)
@@ -159,12 +338,68 @@ def get_preset_settings(preset_name: str) -> Tuple[int, int]:
     return settings['max_dimension'], settings['jpeg_quality']
 
 
-def estimate_output_size(image_paths: list, preset: str = 'balanced') -> int:
+def _fast_image_size(path: str) -> Tuple[int, int]:
     """
-    Estimate the output PDF size for given images and preset.
+    Read (width, height) from a JPEG or PNG header without decoding.
+    
+    Walks JPEG segment markers up to the SOFn frame header (skipping EXIF
+    and other APPn blocks) or reads the PNG IHDR chunk. Falls back to
+    Pillow for anything else.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(24)
+        
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        
+        if head[:2] == b'\xff\xd8':
+            f.seek(2)
+            while True:
+                marker = f.read(4)
+                if len(marker) < 4 or marker[0] != 0xFF:
+                    break
+                code = marker[1]
+                length = struct.unpack('>H', marker[2:4])[0]
+                if code in _JPEG_SOF_MARKERS:
+                    frame = f.read(5)
+                    if len(frame) < 5:
+                        break
+                    height, width = struct.unpack('>HH', frame[1:5])
+                    return width, height
+                f.seek(length - 2, os.SEEK_CUR)
+    
+    with Image.open(path) as img:
+        return img.size
+
+
+def read_image_dimensions(image_paths: list) -> List[Optional[Tuple[int, int]]]:
+    """
+    Read (width, height) for each image from its header.
     
     Args:
         image_paths: List of image file paths
+        
+    Returns:
+        List of sizes, with None for unreadable images
+    """
+    dims = []
+    for path in image_paths:
+        try:
+            dims.append(_fast_image_size(path))
+        except Exception:
+            dims.append(None)
+    return dims
+
+
+def estimate_size_from_dimensions(dims: list, preset: str = 'balanced') -> int:
+    """
+    Estimate the output PDF size from pre-read image dimensions.
+    
+    Pure arithmetic, so callers can cache the dimensions and re-estimate
+    for each preset without touching the disk.
+    
+    Args:
+        dims: Image sizes as returned by read_image_dimensions
         preset: Compression preset name
         
     Returns:
@@ -175,19 +410,18 @@ def estimate_output_size(image_paths: list, preset: str = 'balanced') -> int:
     # Rough estimation based on image dimensions and quality
     total_pixels = 0
     
-    for path in image_paths:
-        try:
-            with Image.open(path) as img:
-                w, h = img.size
-                # Apply max dimension constraint
-                if max(w, h) > max_dim:
-                    ratio = max_dim / max(w, h)
-                    w = int(w * ratio)
-                    h = int(h * ratio)
-                total_pixels += w * h
-        except:
+    for size in dims:
+        if size is None:
             # Fallback estimate for unreadable images
             total_pixels += max_dim * max_dim
+            continue
+        w, h = size
+        # Apply max dimension constraint
+        if max(w, h) > max_dim:
+            ratio = max_dim / max(w, h)
+            w = int(w * ratio)
+            h = int(h * ratio)
+        total_pixels += w * h
     
     # Estimate bytes per pixel based on JPEG quality
     # This is a rough approximation
@@ -203,16 +437,33 @@ def estimate_output_size(image_paths: list, preset: str = 'balanced') -> int:
     estimated_size = int(total_pixels * bytes_per_pixel)
     
     # Add PDF overhead (very rough)
-    pdf_overhead = 1024 + len(image_paths) * 512
+    pdf_overhead = 1024 + len(dims) * 512
     
     return estimated_size + pdf_overhead
 
 
+def estimate_output_size(image_paths: list, preset: str = 'balanced') -> int:
+    """
+    Estimate the output PDF size for given images and preset.
+    
+    Args:
+        image_paths: List of image file paths
+        preset: Compression preset name
+        
+    Returns:
+        Estimated size in bytes
+    """
+    return estimate_size_from_dimensions(read_image_dimensions(image_paths), preset)
+
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
+
+@lru_cache(maxsize=4096)
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human-readable form."""
-    if size_bytes < 1024:
+    # Every 10 bits is one 1024x unit step
+    unit = min(3, max(0, (int(size_bytes).bit_length() - 1) // 10))
+    if not unit:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    else:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    return f"{size_bytes / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
@@ -3,13 +3,60 @@ PDF Tools for PDF Scanner App.
 Merge, split, and analyze PDF files.
 """
 import os
+import re
+import threading
+from collections import OrderedDict
 from typing import List, Tuple, Optional, Callable
 from kivy.logger import Logger
 
+try:
+    from pypdf import PdfReader, PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+# get_pdf_info results keyed by (path, mtime_ns, size), least recently used first
+INFO_CACHE_SIZE = 256
+_info_cache: "OrderedDict[Tuple[str, int, int], dict]" = OrderedDict()
+_info_cache_lock = threading.Lock()
+
+# Byte offset of the last cross-reference section
+_STARTXREF_RE = re.compile(rb'startxref\s+(\d+)')
+
+# Userspace write buffer for PDF output (fewer, larger write syscalls)
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _atomic_write_pdf(writer, output_path: str):
+    """
+    Write a PdfWriter to disk atomically.
+    
+    Output goes to a sibling temp file which is fsynced and then renamed
+    over output_path, so a crash never leaves a truncated PDF behind.
+    
+    Args:
+        writer: pypdf PdfWriter to serialize
+        output_path: Final PDF path
+    """
+    tmp_path = output_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            writer.write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 class PDFTools:
     """PDF manipulation utilities - merge, split, encryption detection."""
     
+    # Bytes read from each end of a file when sniffing for /Encrypt
+    ENCRYPT_SNIFF_BYTES = 4096
+    
     def __init__(self):
         pass
     
@@ -24,7 +71,13 @@ class PDFTools:
             True if encrypted, False otherwise
         """
         try:
-            from pypdf import PdfReader
+            # Decide from the trailer bytes when possible; parse otherwise
+            marker = self._has_encrypt_marker(pdf_path)
+            if marker is not None:
+                return marker
+            
+            if not PYPDF_AVAILABLE:
+                raise ImportError("pypdf not available")
             
             reader = PdfReader(pdf_path)
             return reader.is_encrypted
@@ -34,6 +87,49 @@ class PDFTools:
             # Return True on error to be safe (don't process unknown files)
             return True
     
+    def _has_encrypt_marker(self, pdf_path: str) -> Optional[bool]:
+        """
+        Look for the /Encrypt trailer key without parsing the PDF.
+        
+        Args:
+            pdf_path: Path to PDF file
+            
+        Returns:
+            True if an /Encrypt token was found, False if the latest trailer
+            dictionary was read in full without one, None if undecided
+        """
+        n = self.ENCRYPT_SNIFF_BYTES
+        with open(pdf_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            # Linearized files carry a first-page trailer near the start
+            if b'/Encrypt' in f.read(n):
+                return True
+            f.seek(max(0, size - n))
+            tail = f.read()
+            if b'/Encrypt' in tail:
+                return True
+            
+            start = tail.rfind(b'startxref')
+            if start < 0:
+                return None
+            # Classic table: the whole trailer dictionary precedes startxref
+            if tail.rfind(b'trailer', 0, start) >= 0:
+                return False
+            
+            # Cross-reference stream: the trailer keys are in the stream
+            # object's dictionary at the startxref offset, which can sit
+            # well before the tail once the stream data is large
+            match = _STARTXREF_RE.match(tail, start)
+            if not match or int(match.group(1)) >= size:
+                return None
+            f.seek(int(match.group(1)))
+            xref = f.read(n)
+        
+        end = xref.find(b'stream')
+        if end < 0:
+            return None
+        return b'/Encrypt' in xref[:end]
+    
     def get_page_count(self, pdf_path: str) -> int:
         """
         Get the number of pages in a PDF.
@@ -45,7 +141,8 @@ class PDFTools:
             Number of pages, or 0 on error
         """
         try:
-            from pypdf import PdfReader
+            if not PYPDF_AVAILABLE:
+                raise ImportError("pypdf not available")
             
             reader = PdfReader(pdf_path)
             if reader.is_encrypted:
@@ -70,7 +167,8 @@ class PDFTools:
             True if successful, False otherwise
         """
         try:
-            from pypdf import PdfWriter, PdfReader
+            if not PYPDF_AVAILABLE:
+                raise ImportError("pypdf not available")
             
             writer = PdfWriter()
             total = len(pdf_paths)
@@ -90,8 +188,7 @@ class PDFTools:
                         Logger.warning(f"PDFTools: Skipping encrypted PDF: {path}")
                         continue
                     
-                    for page in reader.pages:
-                        writer.add_page(page)
+                    writer.append(reader, import_outline=False)
                         
                 except Exception as e:
                     Logger.error(f"PDFTools: Error reading {path}: {e}")
@@ -109,8 +206,7 @@ class PDFTools:
             })
             
             # Write output
-            with open(output_path, 'wb') as f:
-                writer.write(f)
+            _atomic_write_pdf(writer, output_path)
             
             Logger.info(f"PDFTools: Merged {total} PDFs into {output_path}")
             return True
@@ -134,7 +230,8 @@ class PDFTools:
             List of created file paths, empty list on failure
         """
         try:
-            from pypdf import PdfReader, PdfWriter
+            if not PYPDF_AVAILABLE:
+                raise ImportError("pypdf not available")
             
             reader = PdfReader(pdf_path)
             
@@ -142,6 +239,8 @@ class PDFTools:
                 Logger.error("PDFTools: Cannot split encrypted PDF")
                 return []
             
+            # len() flattens the page tree once; append() then indexes the
+            # reader's cached page list, so each range is O(pages in range)
             total_pages = len(reader.pages)
             output_paths = []
             
@@ -157,9 +256,7 @@ class PDFTools:
                     continue
                 
                 writer = PdfWriter()
-                
-                for page_idx in range(start_idx, end_idx):
-                    writer.add_page(reader.pages[page_idx])
+                writer.append(reader, pages=(start_idx, end_idx), import_outline=False)
                 
                 # Set neutral metadata
                 writer.add_metadata({
@@ -171,8 +268,7 @@ class PDFTools:
                 output_filename = f"{output_prefix}_part{i + 1}.pdf"
                 output_path = os.path.join(output_dir, output_filename)
                 
-                with open(output_path, 'wb') as f:
-                    writer.write(f)
+                _atomic_write_pdf(writer, output_path)
                 
                 output_paths.append(output_path)
                 Logger.info(f"PDFTools: Created split PDF: {output_path}")
@@ -197,7 +293,8 @@ class PDFTools:
             True if successful
         """
         try:
-            from pypdf import PdfReader, PdfWriter
+            if not PYPDF_AVAILABLE:
+                raise ImportError("pypdf not available")
             
             reader = PdfReader(pdf_path)
             
@@ -206,26 +303,28 @@ class PDFTools:
                 return False
             
             total_pages = len(reader.pages)
-            writer = PdfWriter()
+            page_indices = []
             
             for page_num in page_numbers:
                 page_idx = page_num - 1  # Convert to 0-indexed
                 if 0 <= page_idx < total_pages:
-                    writer.add_page(reader.pages[page_idx])
+                    page_indices.append(page_idx)
                 else:
                     Logger.warning(f"PDFTools: Page {page_num} out of range")
             
-            if len(writer.pages) == 0:
+            if not page_indices:
                 Logger.error("PDFTools: No valid pages to extract")
                 return False
             
+            writer = PdfWriter()
+            writer.append(reader, pages=page_indices, import_outline=False)
+            
             writer.add_metadata({
                 '/Creator': 'PDF Scanner',
                 '/Producer': 'PDF Scanner',
             })
             
-            with open(output_path, 'wb') as f:
-                writer.write(f)
+            _atomic_write_pdf(writer, output_path)
             
             Logger.info(f"PDFTools: Extracted {len(page_numbers)} pages to {output_path}")
             return True
@@ -257,10 +356,20 @@ class PDFTools:
             info['error'] = 'File not found'
             return info
         
-        info['file_size'] = os.path.getsize(pdf_path)
+        st = os.stat(pdf_path)
+        info['file_size'] = st.st_size
+        
+        # Reuse the last parse while the file is unchanged
+        key = (pdf_path, st.st_mtime_ns, st.st_size)
+        with _info_cache_lock:
+            cached = _info_cache.get(key)
+            if cached is not None:
+                _info_cache.move_to_end(key)
+                return dict(cached)
         
         try:
-            from pypdf import PdfReader
+            if not PYPDF_AVAILABLE:
+                raise ImportError("pypdf not available")
             
             reader = PdfReader(pdf_path)
             info['is_encrypted'] = reader.is_encrypted
@@ -276,5 +385,11 @@ class PDFTools:
                     
         except Exception as e:
             info['error'] = str(e)
+            return info
+        
+        with _info_cache_lock:
+            _info_cache[key] = dict(info)
+            if len(_info_cache) > INFO_CACHE_SIZE:
+                _info_cache.popitem(last=False)
         
         return info
@@ -4,18 +4,36 @@ Thread-safe database operations.
 """
 import sqlite3
 import threading
-from typing import Optional, List, Any
+from datetime import datetime
+from typing import Optional, List, Any, Iterator
 from contextlib import contextmanager
 from kivy.logger import Logger
 
+# Bind bools as 0/1 INTEGERs explicitly rather than relying on int subclassing
+sqlite3.register_adapter(bool, int)
+
+# Columns selected as "name [TIMESTAMP]" come back as datetime objects
+sqlite3.register_converter(
+    "TIMESTAMP", lambda value: datetime.fromisoformat(value.decode())
+)
+
+# SQL expression for the current local time in isoformat(), evaluated by SQLite
+NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
 
 class DatabaseManager:
     """Thread-safe SQLite database manager."""
     
+    # Connection tuning
+    MMAP_SIZE = 256 * 1024 * 1024  # bytes of memory-mapped I/O
+    CACHE_SIZE_KIB = -20000  # negative = KiB, i.e. ~20 MB page cache
+    STATEMENT_CACHE_SIZE = 512  # prepared statements kept per connection
+    
     def __init__(self, db_path: str):
         self.db_path = db_path
         self._local = threading.local()
         self._lock = threading.RLock()
+        self._wal_enabled = False
         
     def _get_connection(self) -> sqlite3.Connection:
         """Get thread-local database connection."""
@@ -23,18 +41,115 @@ class DatabaseManager:
             self._local.connection = sqlite3.connect(
                 self.db_path,
                 check_same_thread=False,
-                timeout=30.0
+                timeout=30.0,
+                cached_statements=self.STATEMENT_CACHE_SIZE,
+                detect_types=sqlite3.PARSE_COLNAMES
             )
             self._local.connection.row_factory = sqlite3.Row
-            # Enable foreign keys
-            self._local.connection.execute("PRAGMA foreign_keys = ON")
+            self._configure_connection(self._local.connection)
         return self._local.connection
     
+    def _get_ro_connection(self) -> sqlite3.Connection:
+        """Get thread-local read-only connection for fetches."""
+        if getattr(self._local, 'ro_connection', None) is None:
+            self._local.ro_connection = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                timeout=30.0,
+                cached_statements=self.STATEMENT_CACHE_SIZE,
+                detect_types=sqlite3.PARSE_COLNAMES
+            )
+            self._local.ro_connection.row_factory = sqlite3.Row
+            conn = self._local.ro_connection
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+            conn.execute(f"PRAGMA cache_size = {self.CACHE_SIZE_KIB}")
+        return self._local.ro_connection
+    
+    @contextmanager
+    def _read_cursor(self, read_only: bool):
+        """Get a cursor for a fetch, on the read-only connection if allowed."""
+        # Inside a transaction the writer's own uncommitted rows must be visible
+        if not read_only or self._in_transaction():
+            with self.get_cursor() as cursor:
+                yield cursor
+            return
+        
+        cursor = self._get_ro_connection().cursor()
+        try:
+            yield cursor
+        except Exception as e:
+            Logger.error(f"Database error: {e}")
+            raise
+        finally:
+            cursor.close()
+    
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Apply per-connection pragmas."""
+        # Enable foreign keys
+        conn.execute("PRAGMA foreign_keys = ON")
+        
+        # WAL is persistent in the database file; switch once per manager
+        if not self._wal_enabled:
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._wal_enabled = True
+        
+        # WAL + NORMAL survives process death; only an OS crash can lose
+        # the last commits, and it avoids an fsync per transaction
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size = {self.CACHE_SIZE_KIB}")
+        # Keep dirty pages in cache until commit instead of spilling mid-transaction
+        conn.execute("PRAGMA cache_spill = OFF")
+    
+    def _in_transaction(self) -> bool:
+        """Check if this thread is inside a transaction() scope."""
+        return getattr(self._local, 'tx_depth', 0) > 0
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into a single commit.
+        
+        Statements run through execute/execute_many inside this scope are
+        committed (or rolled back on error) together when the outermost
+        scope exits. Nested scopes join the outer transaction.
+        """
+        with self._lock:
+            conn = self._get_connection()
+            depth = getattr(self._local, 'tx_depth', 0)
+            if depth == 0:
+                conn.execute("BEGIN IMMEDIATE")
+            self._local.tx_depth = depth + 1
+            try:
+                yield
+            except Exception as e:
+                self._local.tx_depth = depth
+                if depth == 0:
+                    conn.rollback()
+                    Logger.error(f"Database transaction rolled back: {e}")
+                raise
+            else:
+                self._local.tx_depth = depth
+                if depth == 0:
+                    conn.commit()
+    
     @contextmanager
     def get_cursor(self):
         """Get a database cursor with automatic commit/rollback."""
         conn = self._get_connection()
         cursor = conn.cursor()
+        
+        if self._in_transaction():
+            # The enclosing transaction() commits or rolls back
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+        
         try:
             yield cursor
             conn.commit()
@@ -46,31 +161,64 @@ class DatabaseManager:
             cursor.close()
     
     def execute(self, query: str, params: tuple = ()) -> Optional[int]:
-        """Execute a query and return lastrowid for inserts."""
+        """Execute a write query and return lastrowid for inserts."""
         with self._lock:
             with self.get_cursor() as cursor:
                 cursor.execute(query, params)
                 return cursor.lastrowid
     
+    def execute_count(self, query: str, params: tuple = ()) -> int:
+        """Execute a write query and return the number of rows changed."""
+        with self._lock:
+            with self.get_cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.rowcount
+    
     def execute_many(self, query: str, params_list: List[tuple]):
         """Execute a query with multiple parameter sets."""
         with self._lock:
             with self.get_cursor() as cursor:
                 cursor.executemany(query, params_list)
     
-    def fetch_one(self, query: str, params: tuple = ()) -> Optional[sqlite3.Row]:
+    # Reads are not serialized: each thread has its own connections and WAL
+    # lets readers run alongside the single writer. By default they go
+    # through a mode=ro connection that only ever takes shared locks.
+    
+    def fetch_one(self, query: str, params: tuple = (),
+                  read_only: bool = True) -> Optional[sqlite3.Row]:
         """Fetch a single row."""
-        with self._lock:
-            with self.get_cursor() as cursor:
-                cursor.execute(query, params)
-                return cursor.fetchone()
+        with self._read_cursor(read_only) as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchone()
     
-    def fetch_all(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+    def fetch_all(self, query: str, params: tuple = (),
+                  read_only: bool = True) -> List[sqlite3.Row]:
         """Fetch all rows."""
-        with self._lock:
-            with self.get_cursor() as cursor:
-                cursor.execute(query, params)
-                return cursor.fetchall()
+        with self._read_cursor(read_only) as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+    
+    def iter_all(self, query: str, params: tuple = (), chunk: int = 64,
+                 read_only: bool = True) -> Iterator[sqlite3.Row]:
+        """
+        Stream rows in chunks of fetchmany() instead of materializing them.
+        
+        Args:
+            query: SELECT statement
+            params: Query parameters
+            chunk: Rows fetched per round trip
+            read_only: Use the read-only connection when possible
+            
+        Returns:
+            Iterator over the result rows
+        """
+        with self._read_cursor(read_only) as cursor:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk)
+                if not rows:
+                    break
+                yield from rows
     
     def initialize(self):
         """Create database tables if they don't exist."""
@@ -110,13 +258,24 @@ class DatabaseManager:
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS scan_sessions (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        session_data TEXT NOT NULL,
+                        session_data BLOB NOT NULL,
                         started_at TEXT NOT NULL,
                         is_complete INTEGER DEFAULT 0,
                         updated_at TEXT NOT NULL
                     )
                 ''')
                 
+                # Per-page rows of a scan session, so saves only write changes
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS session_pages (
+                        session_id INTEGER NOT NULL,
+                        page_order INTEGER NOT NULL,
+                        data BLOB NOT NULL,
+                        PRIMARY KEY (session_id, page_order),
+                        FOREIGN KEY (session_id) REFERENCES scan_sessions(id) ON DELETE CASCADE
+                    ) WITHOUT ROWID
+                ''')
+                
                 # App state table (ads, purchases, settings)
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS app_state (
@@ -136,15 +295,20 @@ class DatabaseManager:
                     CREATE INDEX IF NOT EXISTS idx_documents_created 
                     ON documents(created_at DESC)
                 ''')
+                # Composite indexes serve both the filter and the ORDER BY
                 cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_pages_document 
-                    ON pages(document_id)
+                    CREATE INDEX IF NOT EXISTS idx_pages_document_order 
+                    ON pages(document_id, page_order)
                 ''')
                 cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_sessions_incomplete 
-                    ON scan_sessions(is_complete)
+                    CREATE INDEX IF NOT EXISTS idx_sessions_complete_updated 
+                    ON scan_sessions(is_complete, updated_at DESC)
                 ''')
                 
+                # Superseded by the composite indexes above
+                cursor.execute('DROP INDEX IF EXISTS idx_pages_document')
+                cursor.execute('DROP INDEX IF EXISTS idx_sessions_incomplete')
+                
         Logger.info("Database: Tables initialized")
     
     def close(self):
@@ -153,3 +317,6 @@ class DatabaseManager:
             self._local.connection.close()
             self._local.connection = None
             Logger.info("Database: Connection closed")
+        if getattr(self._local, 'ro_connection', None):
+            self._local.ro_connection.close()
+            self._local.ro_connection = None
@@ -3,12 +3,132 @@ Data Repositories for PDF Scanner App.
 CRUD operations for domain entities.
 """
 import json
-from typing import List, Optional
+import threading
+from dataclasses import replace
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 from kivy.logger import Logger
 
-from app.domain.models import Document, Page, AppState, FilterType
-from .db import DatabaseManager
+from app.domain.models import (
+    Document, Page, AppState, FilterType,
+    encode_quad_points, decode_quad_points,
+)
+from .db import DatabaseManager, NOW_SQL
+
+
+# Stored filter value -> FilterType, a plain dict lookup per page row
+_FILTER_CACHE = {f.value: f for f in FilterType}
+
+
+# SQL is built once at import so every call passes the same string object
+# to sqlite3's per-connection statement cache (the NOW_SQL ones would
+# otherwise be re-formatted on each call)
+
+_SQL_INSERT_DOCUMENT = f'''
+    INSERT INTO documents 
+    (name, file_path, thumbnail_path, page_count, file_size, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, {NOW_SQL}, {NOW_SQL})
+'''
+
+_SQL_UPDATE_DOCUMENT = f'''
+    UPDATE documents SET
+        name = ?, file_path = ?, thumbnail_path = ?,
+        page_count = ?, file_size = ?, updated_at = {NOW_SQL}
+    WHERE id = ?
+'''
+
+_SQL_RENAME_DOCUMENT = f'''
+    UPDATE documents SET name = ?, updated_at = {NOW_SQL} WHERE id = ?
+'''
+
+_SQL_SET_DOCUMENT_THUMBNAIL = f'''
+    UPDATE documents SET thumbnail_path = ?, updated_at = {NOW_SQL} WHERE id = ?
+'''
+
+# Timestamp columns are tagged so sqlite3's TIMESTAMP converter parses them
+_DOCUMENT_COLUMNS = '''
+    id, name, file_path, thumbnail_path, page_count, file_size,
+    created_at AS "created_at [TIMESTAMP]", updated_at AS "updated_at [TIMESTAMP]"
+'''
+
+_SQL_SELECT_DOCUMENT = f'SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE id = ?'
+
+_SQL_SELECT_DOCUMENTS = f'''
+    SELECT {_DOCUMENT_COLUMNS} FROM documents 
+    ORDER BY created_at DESC 
+    LIMIT ? OFFSET ?
+'''
+
+_SQL_DELETE_DOCUMENT = 'DELETE FROM documents WHERE id = ?'
+
+_RECENT_VIEW_KEYS = (
+    'id', 'name', 'file_path', 'thumbnail_path', 'page_count', 'file_size', 'created_at'
+)
+
+_SQL_SELECT_DOCUMENTS_SIGNATURE = '''
+    SELECT COUNT(*), MAX(updated_at), MAX(id) FROM documents
+'''
+
+_SQL_SELECT_RECENT_VIEW = '''
+    SELECT id, name, file_path, thumbnail_path, page_count, file_size,
+           created_at AS "created_at [TIMESTAMP]"
+    FROM documents 
+    ORDER BY created_at DESC 
+    LIMIT ?
+'''
+
+
+_SQL_INSERT_PAGE = f'''
+    INSERT INTO pages 
+    (document_id, page_order, image_path, thumbnail_path, 
+     filter_applied, quad_points, rotation, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, {NOW_SQL})
+'''
+
+_SQL_UPDATE_PAGE = '''
+    UPDATE pages SET
+        document_id = ?, page_order = ?, image_path = ?,
+        thumbnail_path = ?, filter_applied = ?, quad_points = ?,
+        rotation = ?
+    WHERE id = ?
+'''
+
+_PAGE_COLUMNS = '''
+    id, document_id, page_order, image_path, thumbnail_path,
+    filter_applied, quad_points, rotation, created_at AS "created_at [TIMESTAMP]"
+'''
+
+_SQL_SELECT_PAGES = f'''
+    SELECT {_PAGE_COLUMNS} FROM pages WHERE document_id = ? ORDER BY page_order
+'''
+
+_SQL_DELETE_PAGES = 'DELETE FROM pages WHERE document_id = ?'
+
+_SQL_UPDATE_QUAD_POINTS = 'UPDATE pages SET quad_points = ? WHERE id = ?'
+
+
+_SQL_SELECT_APP_STATE = '''
+    SELECT ads_enabled, ads_removed_purchased, last_interstitial_time,
+        interstitial_count_today, last_count_reset_date, max_pages_per_document
+    FROM app_state WHERE id = 1
+'''
+
+# Single-row table: insert on first save, update in place afterwards
+_SQL_UPSERT_APP_STATE = f'''
+    INSERT INTO app_state 
+    (id, ads_enabled, ads_removed_purchased, last_interstitial_time,
+     interstitial_count_today, last_count_reset_date, 
+     max_pages_per_document, updated_at)
+    VALUES (1, ?, ?, ?, ?, ?, ?, {NOW_SQL})
+    ON CONFLICT(id) DO UPDATE SET
+        ads_enabled = excluded.ads_enabled,
+        ads_removed_purchased = excluded.ads_removed_purchased,
+        last_interstitial_time = excluded.last_interstitial_time,
+        interstitial_count_today = excluded.interstitial_count_today,
+        last_count_reset_date = excluded.last_count_reset_date,
+        max_pages_per_document = excluded.max_pages_per_document,
+        updated_at = excluded.updated_at
+'''
 
 
 class DocumentRepository:
@@ -19,55 +139,65 @@ class DocumentRepository:
     
     def save_document(self, document: Document) -> int:
         """Save or update a document. Returns document ID."""
-        now = datetime.now().isoformat()
-        
         if document.id:
             # Update existing
-            self.db.execute('''
-                UPDATE documents SET
-                    name = ?, file_path = ?, thumbnail_path = ?,
-                    page_count = ?, file_size = ?, updated_at = ?
-                WHERE id = ?
-            ''', (
+            self.db.execute(_SQL_UPDATE_DOCUMENT, (
                 document.name, document.file_path, document.thumbnail_path,
-                document.page_count, document.file_size, now, document.id
+                document.page_count, document.file_size, document.id
             ))
             return document.id
         else:
             # Insert new
-            doc_id = self.db.execute('''
-                INSERT INTO documents 
-                (name, file_path, thumbnail_path, page_count, file_size, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            doc_id = self.db.execute(_SQL_INSERT_DOCUMENT, (
                 document.name, document.file_path, document.thumbnail_path,
-                document.page_count, document.file_size, now, now
+                document.page_count, document.file_size
             ))
             document.id = doc_id
             return doc_id
     
     def get_document(self, doc_id: int) -> Optional[Document]:
         """Get a document by ID."""
-        row = self.db.fetch_one(
-            'SELECT * FROM documents WHERE id = ?', (doc_id,)
-        )
+        row = self.db.fetch_one(_SQL_SELECT_DOCUMENT, (doc_id,))
         if row:
             return self._row_to_document(row)
         return None
     
     def get_all_documents(self, limit: int = 50, offset: int = 0) -> List[Document]:
         """Get all documents ordered by creation date."""
-        rows = self.db.fetch_all('''
-            SELECT * FROM documents 
-            ORDER BY created_at DESC 
-            LIMIT ? OFFSET ?
-        ''', (limit, offset))
+        rows = self.db.fetch_all(_SQL_SELECT_DOCUMENTS, (limit, offset))
         return [self._row_to_document(row) for row in rows]
     
+    def get_recent_view_dicts(self, limit: int = 20) -> List[Dict]:
+        """
+        Get recent documents as plain dicts for list views, in one query.
+        
+        Skips Document construction; each dict has the keys id, name,
+        file_path, thumbnail_path, page_count, file_size and created_at.
+        """
+        rows = self.db.fetch_all(_SQL_SELECT_RECENT_VIEW, (limit,))
+        keys = _RECENT_VIEW_KEYS
+        return [dict(zip(keys, row)) for row in rows]
+    
+    def get_documents_signature(self) -> tuple:
+        """
+        Get a cheap signature of the documents table.
+        
+        (count, last update, highest id) changes whenever a document is
+        added, updated or deleted, so views can skip reloading otherwise.
+        """
+        row = self.db.fetch_one(_SQL_SELECT_DOCUMENTS_SIGNATURE)
+        return tuple(row) if row else ()
+    
     def delete_document(self, doc_id: int) -> bool:
-        """Delete a document by ID."""
+        """
+        Delete a document by ID, along with its pages.
+        
+        The pages go in the same statement via ON DELETE CASCADE (foreign
+        keys are enabled per connection), so there is one commit and no
+        separate delete_pages_for_document call is needed.
+        """
         try:
-            self.db.execute('DELETE FROM documents WHERE id = ?', (doc_id,))
+            self.db.execute(_SQL_DELETE_DOCUMENT, (doc_id,))
             return True
         except Exception as e:
             Logger.error(f"DocumentRepository: Delete failed: {e}")
@@ -76,27 +206,39 @@ class DocumentRepository:
     def rename_document(self, doc_id: int, new_name: str) -> bool:
         """Rename a document."""
         try:
-            now = datetime.now().isoformat()
-            self.db.execute(
-                'UPDATE documents SET name = ?, updated_at = ? WHERE id = ?',
-                (new_name, now, doc_id)
-            )
+            self.db.execute(_SQL_RENAME_DOCUMENT, (new_name, doc_id))
             return True
         except Exception as e:
             Logger.error(f"DocumentRepository: Rename failed: {e}")
             return False
     
+    def set_thumbnail(self, doc_id: int, thumbnail_path: str) -> bool:
+        """
+        Set a document's thumbnail path.
+        
+        Returns:
+            False if the document no longer exists or the update failed
+        """
+        try:
+            return self.db.execute_count(
+                _SQL_SET_DOCUMENT_THUMBNAIL, (thumbnail_path, doc_id)
+            ) > 0
+        except Exception as e:
+            Logger.error(f"DocumentRepository: Set thumbnail failed: {e}")
+            return False
+    
     def _row_to_document(self, row) -> Document:
-        """Convert database row to Document object."""
+        """Convert a _DOCUMENT_COLUMNS row to Document object."""
+        # Positional access in Document field order
         return Document(
-            id=row['id'],
-            name=row['name'],
-            file_path=row['file_path'] or '',
-            thumbnail_path=row['thumbnail_path'] or '',
-            page_count=row['page_count'] or 0,
-            file_size=row['file_size'] or 0,
-            created_at=datetime.fromisoformat(row['created_at']),
-            updated_at=datetime.fromisoformat(row['updated_at']),
+            row[0],
+            row[1],
+            row[2] or '',
+            row[3] or '',
+            row[4] or 0,
+            row[5] or 0,
+            row[6],
+            row[7],
         )
 
 
@@ -108,73 +250,73 @@ class PageRepository:
     
     def save_page(self, page: Page) -> int:
         """Save or update a page. Returns page ID."""
-        now = datetime.now().isoformat()
-        quad_str = str(page.quad_points) if page.quad_points else None
-        
         if page.id:
             # Update existing
-            self.db.execute('''
-                UPDATE pages SET
-                    document_id = ?, page_order = ?, image_path = ?,
-                    thumbnail_path = ?, filter_applied = ?, quad_points = ?,
-                    rotation = ?
-                WHERE id = ?
-            ''', (
-                page.document_id, page.order, page.image_path,
-                page.thumbnail_path, page.filter_applied.value,
-                quad_str, page.rotation, page.id
-            ))
+            self.db.execute(_SQL_UPDATE_PAGE, self._update_params(page))
             return page.id
         else:
             # Insert new
-            page_id = self.db.execute('''
-                INSERT INTO pages 
-                (document_id, page_order, image_path, thumbnail_path, 
-                 filter_applied, quad_points, rotation, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                page.document_id, page.order, page.image_path,
-                page.thumbnail_path, page.filter_applied.value,
-                quad_str, page.rotation, now
-            ))
+            page_id = self.db.execute(_SQL_INSERT_PAGE, self._insert_params(page))
             page.id = page_id
             return page_id
     
+    def _insert_params(self, page: Page) -> tuple:
+        """Bind parameters for _SQL_INSERT_PAGE."""
+        return (
+            page.document_id, page.order, page.image_path,
+            page.thumbnail_path, page.filter_applied.value,
+            encode_quad_points(page.quad_points), page.rotation
+        )
+    
+    def _update_params(self, page: Page) -> tuple:
+        """Bind parameters for _SQL_UPDATE_PAGE."""
+        return self._insert_params(page) + (page.id,)
+    
     def get_pages_for_document(self, doc_id: int) -> List[Page]:
         """Get all pages for a document."""
-        rows = self.db.fetch_all('''
-            SELECT * FROM pages WHERE document_id = ? ORDER BY page_order
-        ''', (doc_id,))
-        return [self._row_to_page(row) for row in rows]
+        return list(self.iter_pages_for_document(doc_id))
+    
+    def iter_pages_for_document(self, doc_id: int) -> Iterator[Page]:
+        """Yield a document's pages in order, converting rows as they stream in."""
+        for row in self.db.iter_all(_SQL_SELECT_PAGES, (doc_id,)):
+            yield self._row_to_page(row)
     
     def delete_pages_for_document(self, doc_id: int) -> bool:
         """Delete all pages for a document."""
         try:
-            self.db.execute('DELETE FROM pages WHERE document_id = ?', (doc_id,))
+            self.db.execute(_SQL_DELETE_PAGES, (doc_id,))
             return True
         except Exception as e:
             Logger.error(f"PageRepository: Delete failed: {e}")
             return False
     
+    def _migrate_quad_points(self, page_id: int, quad_points: List[tuple]):
+        """Rewrite a legacy repr()-encoded quad_points value as JSON."""
+        try:
+            self.db.execute(
+                _SQL_UPDATE_QUAD_POINTS, (encode_quad_points(quad_points), page_id)
+            )
+        except Exception as e:
+            Logger.warning(f"PageRepository: Quad migration failed: {e}")
+    
     def _row_to_page(self, row) -> Page:
-        """Convert database row to Page object."""
-        quad_points = None
-        if row['quad_points']:
-            try:
-                quad_points = eval(row['quad_points'])
-            except:
-                pass
+        """Convert a _PAGE_COLUMNS row to Page object."""
+        quad_text = row[6]
+        quad_points = decode_quad_points(quad_text)
+        if quad_points and quad_text.startswith('[('):
+            self._migrate_quad_points(row[0], quad_points)
         
+        # Positional access in Page field order
         return Page(
-            id=row['id'],
-            document_id=row['document_id'],
-            order=row['page_order'],
-            image_path=row['image_path'] or '',
-            thumbnail_path=row['thumbnail_path'] or '',
-            filter_applied=FilterType(row['filter_applied'] or 'original'),
-            quad_points=quad_points,
-            rotation=row['rotation'] or 0,
-            created_at=datetime.fromisoformat(row['created_at']),
+            row[0],
+            row[1],
+            row[2],
+            row[3] or '',
+            row[4] or '',
+            _FILTER_CACHE.get(row[5], FilterType.ORIGINAL),
+            quad_points,
+            row[7] or 0,
+            row[8],
         )
 
 
@@ -183,75 +325,62 @@ class AppStateRepository:
     
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        # Last state read or written; the row only changes via save_app_state
+        self._cache: Optional[AppState] = None
+        self._cache_lock = threading.Lock()
     
     def get_app_state(self) -> Optional[AppState]:
         """Get the current app state."""
-        row = self.db.fetch_one('SELECT * FROM app_state WHERE id = 1')
+        with self._cache_lock:
+            if self._cache is not None:
+                # Callers may mutate what they get back; keep the cache intact
+                return replace(self._cache)
+        
+        row = self.db.fetch_one(_SQL_SELECT_APP_STATE)
         if row:
-            return self._row_to_state(row)
+            state = self._row_to_state(row)
+            with self._cache_lock:
+                self._cache = replace(state)
+            return state
         return None
     
     def save_app_state(self, state: AppState) -> bool:
         """Save or update the app state."""
-        now = datetime.now().isoformat()
         last_interstitial = state.last_interstitial_time.isoformat() if state.last_interstitial_time else None
         
+        params = (
+            state.ads_enabled,
+            state.ads_removed_purchased,
+            last_interstitial,
+            state.interstitial_count_today,
+            state.last_count_reset_date,
+            state.max_pages_per_document
+        )
+        
         try:
-            # Try update first
-            row = self.db.fetch_one('SELECT id FROM app_state WHERE id = 1')
-            
-            if row:
-                self.db.execute('''
-                    UPDATE app_state SET
-                        ads_enabled = ?, ads_removed_purchased = ?,
-                        last_interstitial_time = ?, interstitial_count_today = ?,
-                        last_count_reset_date = ?, max_pages_per_document = ?,
-                        updated_at = ?
-                    WHERE id = 1
-                ''', (
-                    1 if state.ads_enabled else 0,
-                    1 if state.ads_removed_purchased else 0,
-                    last_interstitial,
-                    state.interstitial_count_today,
-                    state.last_count_reset_date,
-                    state.max_pages_per_document,
-                    now
-                ))
-            else:
-                self.db.execute('''
-                    INSERT INTO app_state 
-                    (id, ads_enabled, ads_removed_purchased, last_interstitial_time,
-                     interstitial_count_today, last_count_reset_date, 
-                     max_pages_per_document, updated_at)
-                    VALUES (1, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    1 if state.ads_enabled else 0,
-                    1 if state.ads_removed_purchased else 0,
-                    last_interstitial,
-                    state.interstitial_count_today,
-                    state.last_count_reset_date,
-                    state.max_pages_per_document,
-                    now
-                ))
+            self.db.execute(_SQL_UPSERT_APP_STATE, params)
+            with self._cache_lock:
+                self._cache = replace(state)
             return True
         except Exception as e:
             Logger.error(f"AppStateRepository: Save failed: {e}")
             return False
     
     def _row_to_state(self, row) -> AppState:
-        """Convert database row to AppState object."""
+        """Convert an _SQL_SELECT_APP_STATE row to AppState object."""
         last_time = None
-        if row['last_interstitial_time']:
+        if row[2]:
             try:
-                last_time = datetime.fromisoformat(row['last_interstitial_time'])
+                last_time = datetime.fromisoformat(row[2])
             except:
                 pass
         
+        # Positional access in AppState field order
         return AppState(
-            ads_enabled=bool(row['ads_enabled']),
-            ads_removed_purchased=bool(row['ads_removed_purchased']),
-            last_interstitial_time=last_time,
-            interstitial_count_today=row['interstitial_count_today'] or 0,
-            last_count_reset_date=row['last_count_reset_date'],
-            max_pages_per_document=row['max_pages_per_document'] or 200,
+            bool(row[0]),
+            bool(row[1]),
+            last_time,
+            row[3] or 0,
+            row[4],
+            row[5] or 200,
         )
@@ -3,12 +3,155 @@ Session Store for PDF Scanner App.
 Persists scan sessions across process death.
 """
 import json
-from typing import Optional
+import queue
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from kivy.logger import Logger
 
-from app.domain.models import ScanSession
-from .db import DatabaseManager
+from app.domain.models import Page, ScanSession
+from .db import DatabaseManager, NOW_SQL
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+    _ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Compressed payloads carry a 4-byte tag; plain JSON starts with '{'
+ZSTD_MAGIC = b'ZST1'
+ZLIB_MAGIC = b'ZLB1'
+
+# Smaller payloads (most single pages) fit in a row uncompressed
+COMPRESS_MIN_BYTES = 512
+
+
+def _dumps(data: dict) -> bytes:
+    """Serialize session data to compact JSON bytes, compressed if large."""
+    if ORJSON_AVAILABLE:
+        raw = orjson.dumps(data)
+    else:
+        raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return raw
+    if ZSTD_AVAILABLE:
+        return ZSTD_MAGIC + _ZSTD_COMPRESSOR.compress(raw)
+    return ZLIB_MAGIC + zlib.compress(raw, 6)
+
+
+def _loads(data) -> dict:
+    """Parse session data stored as (compressed) JSON bytes or legacy TEXT."""
+    if isinstance(data, bytes):
+        magic = data[:4]
+        if magic == ZSTD_MAGIC:
+            if not ZSTD_AVAILABLE:
+                raise ImportError("zstandard not available")
+            data = _ZSTD_DECOMPRESSOR.decompress(data[4:])
+        elif magic == ZLIB_MAGIC:
+            data = zlib.decompress(data[4:])
+    
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Async saves arriving within this window are merged into one write
+SAVE_COALESCE_SECONDS = 0.1
+
+
+# SQL is built once at import so every call hits sqlite3's statement cache
+
+_SQL_INSERT_SESSION = f'''
+    INSERT INTO scan_sessions 
+    (session_data, started_at, is_complete, updated_at)
+    VALUES (?, ?, ?, {NOW_SQL})
+'''
+
+_SQL_UPDATE_SESSION = f'''
+    UPDATE scan_sessions SET
+        session_data = ?, is_complete = ?, updated_at = {NOW_SQL}
+    WHERE id = ?
+'''
+
+_SQL_UPSERT_SESSION_PAGE = '''
+    INSERT OR REPLACE INTO session_pages (session_id, page_order, data)
+    VALUES (?, ?, ?)
+'''
+
+# Drops rows left past the end after pages were removed
+_SQL_TRIM_SESSION_PAGES = '''
+    DELETE FROM session_pages WHERE session_id = ? AND page_order >= ?
+'''
+
+_SQL_SELECT_SESSION_PAGES = '''
+    SELECT data FROM session_pages WHERE session_id = ? ORDER BY page_order
+'''
+
+_SQL_SELECT_ACTIVE_SESSION = '''
+    SELECT * FROM scan_sessions 
+    WHERE is_complete = 0 
+    ORDER BY updated_at DESC 
+    LIMIT 1
+'''
+
+_SQL_SELECT_SESSION = 'SELECT * FROM scan_sessions WHERE id = ?'
+
+_SQL_DELETE_SESSION = 'DELETE FROM scan_sessions WHERE id = ?'
+
+_SQL_COMPLETE_SESSION = f'''
+    UPDATE scan_sessions SET is_complete = 1, updated_at = {NOW_SQL}
+    WHERE id = ?
+'''
+
+_SQL_DELETE_OLD_SESSIONS = '''
+    DELETE FROM scan_sessions 
+    WHERE is_complete = 1 AND updated_at < ?
+'''
+
+
+class _LazySession(ScanSession):
+    """
+    ScanSession whose pages are fetched and parsed on first access.
+    
+    Until then the page count comes from the stored header, and there are
+    no dirty pages (nothing can have changed pages that were never loaded).
+    """
+    
+    _pages_loader: Optional[Callable[[], List[Page]]] = None
+    _stored_page_count: Optional[int] = None
+    
+    @property
+    def pages(self) -> List[Page]:
+        if self._pages_loader is not None:
+            loader, self._pages_loader = self._pages_loader, None
+            self._pages = loader()
+        return self._pages
+    
+    @pages.setter
+    def pages(self, value: List[Page]):
+        self._pages_loader = None
+        self._pages = value
+    
+    def page_count(self) -> int:
+        if self._pages_loader is not None and self._stored_page_count is not None:
+            return self._stored_page_count
+        return len(self.pages)
+    
+    def dirty_pages(self) -> List[Page]:
+        if self._pages_loader is not None:
+            return []
+        return super().dirty_pages()
 
 
 class SessionStore:
@@ -16,55 +159,154 @@ class SessionStore:
     
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        # Single background writer for save_session_async (started lazily)
+        self._save_queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
     
-    def save_session(self, session: ScanSession) -> int:
-        """Save or update a scan session. Returns session ID."""
-        now = datetime.now().isoformat()
-        session_data = json.dumps(session.to_dict())
+    @staticmethod
+    def _snapshot(session: ScanSession) -> Tuple[bytes, Dict[int, bytes]]:
+        """Serialize the session header and its unsaved pages."""
+        header = _dumps(session.header_dict())
+        pages = {page.order: _dumps(page.to_dict()) for page in session.dirty_pages()}
+        return header, pages
+    
+    def _write(self, session: ScanSession, header: bytes,
+               pages: Dict[int, bytes], page_count: int) -> int:
+        """Write a serialized session in one transaction. Returns session ID or -1."""
+        is_new = not session.id
         
         try:
-            if session.id:
-                # Update existing
-                self.db.execute('''
-                    UPDATE scan_sessions SET
-                        session_data = ?, is_complete = ?, updated_at = ?
-                    WHERE id = ?
-                ''', (session_data, 1 if session.is_complete else 0, now, session.id))
-                return session.id
-            else:
-                # Insert new
-                session_id = self.db.execute('''
-                    INSERT INTO scan_sessions 
-                    (session_data, started_at, is_complete, updated_at)
-                    VALUES (?, ?, ?, ?)
-                ''', (
-                    session_data,
-                    session.started_at.isoformat(),
-                    1 if session.is_complete else 0,
-                    now
-                ))
-                session.id = session_id
-                Logger.info(f"SessionStore: Created new session {session_id}")
-                return session_id
+            with self.db.transaction():
+                if not is_new:
+                    # Update existing
+                    self.db.execute(_SQL_UPDATE_SESSION, (
+                        header, session.is_complete, session.id
+                    ))
+                else:
+                    # Insert new
+                    session.id = self.db.execute(_SQL_INSERT_SESSION, (
+                        header,
+                        session.started_at.isoformat(),
+                        session.is_complete
+                    ))
+                    Logger.info(f"SessionStore: Created new session {session.id}")
+                
+                if pages:
+                    self.db.execute_many(_SQL_UPSERT_SESSION_PAGE, [
+                        (session.id, order, data) for order, data in pages.items()
+                    ])
+                self.db.execute(_SQL_TRIM_SESSION_PAGES, (session.id, page_count))
+            
+            return session.id
         except Exception as e:
+            if is_new:
+                session.id = None  # the insert was rolled back
             Logger.error(f"SessionStore: Save failed: {e}")
             return -1
     
+    def save_session(self, session: ScanSession) -> int:
+        """
+        Save or update a scan session. Returns session ID.
+        
+        Only the session header and the pages changed since the last save
+        are written; pages live one per row in session_pages.
+        """
+        header, pages = self._snapshot(session)
+        session_id = self._write(session, header, pages, session.page_count())
+        if session_id != -1:
+            session.mark_clean()
+        return session_id
+    
+    def save_session_async(self, session: ScanSession):
+        """
+        Queue a save of the session on the background writer thread.
+        
+        The header and changed pages are serialized now, so the session can
+        keep changing while the write is pending. Saves of the same session
+        arriving within SAVE_COALESCE_SECONDS are merged into one write.
+        Use flush() where the data must be on disk (pause/stop).
+        """
+        header, pages = self._snapshot(session)
+        session.mark_clean()
+        self._save_queue.put((session, header, pages, session.page_count()))
+        
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name='session-writer', daemon=True
+                )
+                self._writer.start()
+    
+    def flush(self):
+        """Block until every queued async save has been written."""
+        if self._writer is not None:
+            self._save_queue.join()
+    
+    def _writer_loop(self):
+        """Consume queued saves, merging bursts per session."""
+        while True:
+            items = [self._save_queue.get()]
+            time.sleep(SAVE_COALESCE_SECONDS)
+            while True:
+                try:
+                    items.append(self._save_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # Latest header and page count win; page rows accumulate
+            merged = {}
+            for session, header, pages, page_count in items:
+                entry = merged.get(id(session))
+                if entry is None:
+                    merged[id(session)] = [session, header, dict(pages), page_count]
+                else:
+                    entry[1] = header
+                    entry[2].update(pages)
+                    entry[3] = page_count
+            
+            for session, header, pages, page_count in merged.values():
+                # Rows past the final page count are trimmed anyway
+                pages = {o: d for o, d in pages.items() if o < page_count}
+                if self._write(session, header, pages, page_count) == -1:
+                    session.mark_orders_dirty(pages)
+            
+            for _ in items:
+                self._save_queue.task_done()
+    
+    def _load_session(self, row) -> ScanSession:
+        """Build a ScanSession from its header row; pages load lazily."""
+        session_data = _loads(row['session_data'])
+        session_id = row['id']
+        
+        if 'pages' in session_data:
+            # Legacy row with pages embedded in the header; the next save
+            # writes them all out to session_pages
+            session = ScanSession.from_dict(session_data)
+            session.id = session_id
+            return session
+        
+        session = _LazySession.from_dict(session_data)
+        session.id = session_id
+        session.mark_clean()
+        # Headers written before page_count was stored load pages to count
+        session._stored_page_count = session_data.get('page_count')
+        session._pages_loader = lambda: self._load_pages(session_id)
+        return session
+    
+    def _load_pages(self, session_id: int) -> List[Page]:
+        """Read and parse the pages of a session in order."""
+        rows = self.db.fetch_all(_SQL_SELECT_SESSION_PAGES, (session_id,))
+        return [Page.from_dict(_loads(r['data'])) for r in rows]
+    
     def get_active_session(self) -> Optional[ScanSession]:
         """Get the most recent incomplete session."""
         try:
-            row = self.db.fetch_one('''
-                SELECT * FROM scan_sessions 
-                WHERE is_complete = 0 
-                ORDER BY updated_at DESC 
-                LIMIT 1
-            ''')
+            row = self.db.fetch_one(_SQL_SELECT_ACTIVE_SESSION)
             
             if row:
-                session_data = json.loads(row['session_data'])
-                session = ScanSession.from_dict(session_data)
-                session.id = row['id']
-                Logger.info(f"SessionStore: Restored session {session.id} with {len(session.pages)} pages")
+                session = self._load_session(row)
+                Logger.info(f"SessionStore: Restored session {session.id}")
                 return session
         except Exception as e:
             Logger.error(f"SessionStore: Get active session failed: {e}")
@@ -74,15 +316,10 @@ class SessionStore:
     def get_session(self, session_id: int) -> Optional[ScanSession]:
         """Get a specific session by ID."""
         try:
-            row = self.db.fetch_one(
-                'SELECT * FROM scan_sessions WHERE id = ?', (session_id,)
-            )
+            row = self.db.fetch_one(_SQL_SELECT_SESSION, (session_id,))
             
             if row:
-                session_data = json.loads(row['session_data'])
-                session = ScanSession.from_dict(session_data)
-                session.id = row['id']
-                return session
+                return self._load_session(row)
         except Exception as e:
             Logger.error(f"SessionStore: Get session failed: {e}")
         
@@ -91,7 +328,7 @@ class SessionStore:
     def delete_session(self, session_id: int) -> bool:
         """Delete a session by ID."""
         try:
-            self.db.execute('DELETE FROM scan_sessions WHERE id = ?', (session_id,))
+            self.db.execute(_SQL_DELETE_SESSION, (session_id,))
             Logger.info(f"SessionStore: Deleted session {session_id}")
             return True
         except Exception as e:
@@ -101,11 +338,7 @@ class SessionStore:
     def mark_complete(self, session_id: int) -> bool:
         """Mark a session as complete."""
         try:
-            now = datetime.now().isoformat()
-            self.db.execute('''
-                UPDATE scan_sessions SET is_complete = 1, updated_at = ?
-                WHERE id = ?
-            ''', (now, session_id))
+            self.db.execute(_SQL_COMPLETE_SESSION, (session_id,))
             Logger.info(f"SessionStore: Marked session {session_id} as complete")
             return True
         except Exception as e:
@@ -119,18 +352,7 @@ class SessionStore:
             from datetime import timedelta
             cutoff = (datetime.now() - timedelta(days=days)).isoformat()
             
-            # Count first
-            row = self.db.fetch_one('''
-                SELECT COUNT(*) as count FROM scan_sessions 
-                WHERE is_complete = 1 AND updated_at < ?
-            ''', (cutoff,))
-            count = row['count'] if row else 0
-            
-            # Delete
-            self.db.execute('''
-                DELETE FROM scan_sessions 
-                WHERE is_complete = 1 AND updated_at < ?
-            ''', (cutoff,))
+            count = self.db.execute_count(_SQL_DELETE_OLD_SESSIONS, (cutoff,))
             
             Logger.info(f"SessionStore: Cleaned up {count} old sessions")
             return count
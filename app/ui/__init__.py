@@ -1,10 +1,35 @@
 """
 UI package for PDF Scanner App.
+
+Names are imported on first attribute access (PEP 562) so that importing
+app.ui.screens.* does not load every widget up front.
 """
-from .theme import Theme
-from .widgets import RoundedButton, DocumentCard, CornerHandle, FilterChip
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY = {
+    'Theme': '.theme',
+    'RoundedButton': '.widgets',
+    'DocumentCard': '.widgets',
+    'DocumentCardView': '.widgets',
+    'CornerHandle': '.widgets',
+    'FilterChip': '.widgets',
+}
 
 __all__ = [
     'Theme',
-    'RoundedButton', 'DocumentCard', 'CornerHandle', 'FilterChip',
+    'RoundedButton', 'DocumentCard', 'DocumentCardView', 'CornerHandle',
+    'FilterChip',
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,13 +1,33 @@
 """
 Screens package for PDF Scanner App.
+
+Screens are imported on first attribute access (PEP 562), so importing one
+screen module does not pull in every other screen and its dependencies.
 """
-from .home import HomeScreen
-from .scanner import ScannerScreen
-from .crop_adjust import CropAdjustScreen
-from .export import ExportScreen
-from .settings import SettingsScreen
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY = {
+    'HomeScreen': '.home',
+    'ScannerScreen': '.scanner',
+    'CropAdjustScreen': '.crop_adjust',
+    'ExportScreen': '.export',
+    'SettingsScreen': '.settings',
+}
 
 __all__ = [
     'HomeScreen', 'ScannerScreen', 'CropAdjustScreen',
     'ExportScreen', 'SettingsScreen',
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
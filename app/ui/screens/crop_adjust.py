@@ -3,6 +3,8 @@ Crop Adjust Screen for PDF Scanner App.
 Manual crop adjustment with draggable corners and filter preview.
 """
 import os
+import threading
+from array import array
 from typing import Optional, List, Tuple
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
@@ -12,16 +14,39 @@ from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.uix.widget import Widget
 from kivy.uix.scrollview import ScrollView
-from kivy.graphics import Color, Line, Rectangle
+from kivy.graphics import Color, Line, Rectangle, PushMatrix, PopMatrix, Rotate, Scale
 from kivy.clock import Clock
 from kivy.logger import Logger
 from kivy.app import App
 
 from app.ui.theme import get_theme
+from app.ui.texture_cache import get_cached_texture, load_pixels, texture_from_pixels
 from app.ui.widgets import RoundedButton, CornerHandle, FilterChip
 from app.domain.models import ScanSession, Page, FilterType, QuadResult
 
 
+def _to_rotated(x: float, y: float, w: int, h: int, rotation: int) -> Tuple[float, float]:
+    """Map a point in a w x h image to the image rotated clockwise by rotation."""
+    if rotation == 90:
+        return h - y, x
+    if rotation == 180:
+        return w - x, h - y
+    if rotation == 270:
+        return y, w - x
+    return x, y
+
+
+def _from_rotated(x: float, y: float, w: int, h: int, rotation: int) -> Tuple[float, float]:
+    """Inverse of _to_rotated: map back to the unrotated w x h image."""
+    if rotation == 90:
+        return y, h - x
+    if rotation == 180:
+        return w - x, h - y
+    if rotation == 270:
+        return w - y, x
+    return x, y
+
+
 class CropAdjustScreen(Screen):
     """Screen for adjusting crop corners and applying filters."""
     
@@ -37,8 +62,41 @@ class CropAdjustScreen(Screen):
         self.rotation: int = 0
         self.corner_handles: List[CornerHandle] = []
         self.quad_points: List[Tuple[int, int]] = []
-        
-        self._build_ui()
+        # Original image pixel size, read once per image for coordinate mapping
+        self._orig_size: Optional[Tuple[int, int]] = None
+        # Handles moved since the last frame; touch moves are coalesced
+        # into at most one quad update per frame
+        self._pending_handles = set()
+        self._move_trigger = Clock.create_trigger(self._flush_moves, 0)
+        # Crop outline, created once per image and updated in place
+        self._crop_line: Optional[Line] = None
+        self._line_pts = array('f', [0.0] * 10)
+        # Displayed image rect plus image-pixels-per-screen-pixel factors,
+        # valid until the container or texture changes
+        self._disp_rect_cache: Optional[Tuple[float, ...]] = None
+        # Set when the current image's size could not be read; drag updates
+        # short-circuit instead of retrying
+        self._image_open_failed = False
+        # Bar widget -> background Rectangle, synced by _sync_rect
+        self._rect_syncs = {}
+        # Preview rotation instructions, created with the image widget
+        self._rotate_instr: Optional[Rotate] = None
+        # Created on first confirm; one per screen so its busy guard holds
+        # across presses
+        self._pipeline = None
+        self._scale_instr: Optional[Scale] = None
+        # Widgets are built on first use, not at app start
+        self._built = False
+    
+    def _ensure_ui(self):
+        """Build the widget tree once, on first use."""
+        if not self._built:
+            self._built = True
+            self._build_ui()
+    
+    def on_pre_enter(self, *args):
+        """Called before the screen is shown."""
+        self._ensure_ui()
     
     def _build_ui(self):
         """Build the crop adjust screen UI."""
@@ -54,7 +112,7 @@ class CropAdjustScreen(Screen):
         with top_bar.canvas.before:
             Color(*self.theme.get_color('surface'))
             self.top_bar_bg = Rectangle(size=top_bar.size)
-        top_bar.bind(size=lambda *x: setattr(self.top_bar_bg, 'size', top_bar.size))
+        self._bind_rect(top_bar, self.top_bar_bg)
         
         # Back/Cancel button
         back_btn = RoundedButton(
@@ -106,12 +164,25 @@ class CropAdjustScreen(Screen):
             Color(0.1, 0.1, 0.1, 1)
             self.img_bg = Rectangle(size=self.image_container.size)
         self.image_container.bind(size=self._update_image_bg)
+        self.image_container.bind(pos=self._invalidate_disp_rect,
+                                  size=self._invalidate_disp_rect)
         
         # Image widget
         self.image_widget = Image(
             allow_stretch=True,
             keep_ratio=True
         )
+        self.image_widget.bind(texture=self._invalidate_disp_rect,
+                               pos=self._invalidate_disp_rect,
+                               size=self._invalidate_disp_rect)
+        # Rotation preview is a GL transform on the existing texture; the
+        # pixels are only rotated by the pipeline on confirm
+        with self.image_widget.canvas.before:
+            PushMatrix()
+            self._rotate_instr = Rotate(angle=0, origin=self.image_widget.center)
+            self._scale_instr = Scale(1, 1, 1)
+        with self.image_widget.canvas.after:
+            PopMatrix()
         self.image_container.add_widget(self.image_widget)
         
         # Crop overlay widget
@@ -134,7 +205,7 @@ class CropAdjustScreen(Screen):
         with filter_bar.canvas.before:
             Color(*self.theme.get_color('surface'))
             self.filter_bar_bg = Rectangle(size=filter_bar.size)
-        filter_bar.bind(size=lambda *x: setattr(self.filter_bar_bg, 'size', filter_bar.size))
+        self._bind_rect(filter_bar, self.filter_bar_bg)
         
         filter_scroll = ScrollView(
             do_scroll_y=False,
@@ -172,7 +243,7 @@ class CropAdjustScreen(Screen):
         with bottom_bar.canvas.before:
             Color(*self.theme.get_color('surface'))
             self.bottom_bar_bg = Rectangle(size=bottom_bar.size)
-        bottom_bar.bind(size=lambda *x: setattr(self.bottom_bar_bg, 'size', bottom_bar.size))
+        self._bind_rect(bottom_bar, self.bottom_bar_bg)
         
         # Retake button
         retake_btn = RoundedButton(
@@ -196,12 +267,23 @@ class CropAdjustScreen(Screen):
         self.add_widget(root)
         self.root_layout = root
     
+    def _bind_rect(self, widget, rect):
+        """Keep a background rectangle on a bar matched to its widget."""
+        self._rect_syncs[widget] = rect
+        widget.bind(pos=self._sync_rect, size=self._sync_rect)
+    
+    def _sync_rect(self, widget, *args):
+        rect = self._rect_syncs[widget]
+        rect.pos = widget.pos
+        rect.size = widget.size
+    
     def _update_image_bg(self, *args):
         self.img_bg.size = self.image_container.size
     
     def set_image(self, image_path: str, quad_result: QuadResult,
                   session: ScanSession, page_index: int):
         """Set the image to adjust."""
+        self._ensure_ui()
         self.image_path = image_path
         self.quad_result = quad_result
         self.session = session
@@ -209,81 +291,181 @@ class CropAdjustScreen(Screen):
         self.current_filter = FilterType.ORIGINAL
         self.rotation = 0
         
+        # Drop the previous image's outline and handles; recreated once the
+        # image size is known
+        self.crop_overlay.canvas.clear()
+        self._crop_line = None
+        # Handles are kept for reuse; detach them until repositioned
+        self.handles_container.clear_widgets()
+        self._pending_handles.clear()
+        self._orig_size = None
+        self._image_open_failed = False
+        self._disp_rect_cache = None
+        # Detected quad is usable immediately; the fallback needs the size
+        self.quad_points = list(quad_result.points) if quad_result.is_valid else []
+        
+        # Show a cached texture right away; decode, size read and quad
+        # fallback run off the UI thread
+        texture = get_cached_texture(image_path)
+        self._update_image_display(texture)
+        self._update_rotation_transform()
+        threading.Thread(
+            target=self._load_image_meta,
+            args=(image_path, quad_result, texture is None),
+            daemon=True
+        ).start()
+    
+    def _load_image_meta(self, image_path: str, quad_result: QuadResult,
+                         need_pixels: bool):
+        """Read image size and compute the initial quad (worker thread)."""
+        orig_size = None
+        pixels = None
+        if need_pixels:
+            # Downscaled decode for the preview texture; also gives the size
+            pixels = load_pixels(image_path)
+            if pixels:
+                orig_size = pixels[0]
+        else:
+            try:
+                from PIL import Image as PILImage
+                # Header-only read; no pixel decode
+                with PILImage.open(image_path) as img:
+                    orig_size = img.size
+            except (ImportError, OSError) as e:
+                # OSError also covers PIL.UnidentifiedImageError
+                Logger.warning(f"CropAdjust: Could not read image size: {e}")
+        
         # Set quad points
         if quad_result.is_valid:
-            self.quad_points = list(quad_result.points)
+            quad_points = list(quad_result.points)
         else:
             # Use full frame fallback
-            from PIL import Image as PILImage
-            try:
-                img = PILImage.open(image_path)
-                w, h = img.size
+            if orig_size:
+                w, h = orig_size
                 margin = 20
-                self.quad_points = [
+                quad_points = [
                     (margin, margin),
                     (w - margin, margin),
                     (w - margin, h - margin),
                     (margin, h - margin)
                 ]
-            except:
-                self.quad_points = [(20, 20), (780, 20), (780, 580), (20, 580)]
+            else:
+                quad_points = [(20, 20), (780, 20), (780, 580), (20, 580)]
+        
+        Clock.schedule_once(
+            lambda dt: self._apply_image_meta(image_path, orig_size, quad_points, pixels), 0
+        )
+    
+    def _apply_image_meta(self, image_path: str,
+                          orig_size: Optional[Tuple[int, int]],
+                          quad_points: List[Tuple[int, int]],
+                          pixels: Optional[tuple] = None):
+        """Apply results of _load_image_meta on the UI thread."""
+        if image_path != self.image_path:
+            # Another image was set while this one was loading
+            return
         
-        # Update UI
-        self._update_image_display()
+        if pixels:
+            _, size, data = pixels
+            self._update_image_display(texture_from_pixels(image_path, size, data))
+        
+        self._orig_size = orig_size
+        self._image_open_failed = orig_size is None
+        self._disp_rect_cache = None
+        self.quad_points = quad_points
+        
+        # Let the layout settle before placing handles
         Clock.schedule_once(lambda dt: self._create_corner_handles(), 0.1)
     
-    def _update_image_display(self):
-        """Update the image widget."""
-        if self.image_path:
-            self.image_widget.source = self.image_path
-            self.image_widget.reload()
+    def _update_image_display(self, texture):
+        """Update the image widget with a (downscaled) preview texture."""
+        self.image_widget.texture = texture
     
     def _create_corner_handles(self):
-        """Create draggable corner handles."""
-        self.handles_container.clear_widgets()
-        self.corner_handles = []
-        
+        """Place the draggable corner handles, creating them on first use."""
         if not self.quad_points or len(self.quad_points) != 4:
+            self.handles_container.clear_widgets()
             return
         
         # Get image display rect (accounting for aspect ratio)
         img_rect = self._get_image_display_rect()
         if not img_rect:
+            self.handles_container.clear_widgets()
             return
         
-        img_x, img_y, img_w, img_h = img_rect
+        img_x, img_y, img_w, img_h, scale_x, scale_y = img_rect
         
-        # Get original image size
-        try:
-            from PIL import Image as PILImage
-            img = PILImage.open(self.image_path)
-            orig_w, orig_h = img.size
-        except:
-            return
-        
-        # Create handles at scaled positions
-        for i, (qx, qy) in enumerate(self.quad_points):
-            # Scale to display coordinates
-            screen_x = img_x + (qx / orig_w) * img_w
-            screen_y = img_y + img_h - (qy / orig_h) * img_h  # Flip Y
+        # One set of four handles lives for the whole screen lifetime
+        if len(self.corner_handles) != 4:
+            self.handles_container.clear_widgets()
+            self.corner_handles = []
+            for i in range(4):
+                handle = CornerHandle(corner_index=i)
+                handle.bind(on_corner_move=self._on_corner_moved)
+                self.corner_handles.append(handle)
+        
+        orig_w, orig_h = self._orig_size
+        
+        # Move handles to scaled positions
+        for handle, (qx, qy) in zip(self.corner_handles, self.quad_points):
+            # Quad points stay in unrotated image space
+            rx, ry = _to_rotated(qx, qy, orig_w, orig_h, self.rotation)
             
-            handle = CornerHandle(corner_index=i)
+            # Scale to display coordinates
+            screen_x = img_x + rx / scale_x
+            screen_y = img_y + img_h - ry / scale_y  # Flip Y
             handle.center = (screen_x, screen_y)
-            handle.bind(on_corner_move=self._on_corner_moved)
             
-            self.handles_container.add_widget(handle)
-            self.corner_handles.append(handle)
+            if handle.parent is None:
+                self.handles_container.add_widget(handle)
         
         self._draw_crop_lines()
     
-    def _get_image_display_rect(self) -> Optional[Tuple[float, float, float, float]]:
-        """Get the displayed image rectangle (x, y, width, height)."""
-        if not self.image_widget.texture:
+    def _invalidate_disp_rect(self, *args):
+        self._disp_rect_cache = None
+        self._update_rotation_transform()
+    
+    def _update_rotation_transform(self):
+        """Rotate the preview about its center, rescaled to fit the container."""
+        if self._rotate_instr is None:
+            return
+        center = self.image_widget.center
+        self._rotate_instr.origin = center
+        self._rotate_instr.angle = -self.rotation  # Kivy angles are counterclockwise
+        
+        scale = 1.0
+        texture = self.image_widget.texture
+        cont_w, cont_h = self.image_widget.size
+        if texture and self.rotation in (90, 270) and cont_w > 0 and cont_h > 0:
+            tex_w, tex_h = texture.size
+            fit = min(cont_w / tex_w, cont_h / tex_h)
+            fit_rotated = min(cont_w / tex_h, cont_h / tex_w)
+            scale = fit_rotated / fit
+        self._scale_instr.origin = center
+        self._scale_instr.xyz = (scale, scale, 1)
+    
+    def _get_image_display_rect(self) -> Optional[Tuple[float, ...]]:
+        """
+        Get the displayed (rotated) image rectangle and its scale factors.
+        
+        Returns:
+            (x, y, width, height, scale_x, scale_y) where scale_* map screen
+            pixels to pixels of the original image rotated by self.rotation,
+            or None if not yet known.
+        """
+        if self._disp_rect_cache is not None:
+            return self._disp_rect_cache
+        
+        if not self.image_widget.texture or not self._orig_size:
             return None
+        orig_w, orig_h = self._orig_size
         
         # Get image and container sizes
         tex_w, tex_h = self.image_widget.texture.size
         cont_w, cont_h = self.image_container.size
+        if self.rotation in (90, 270):
+            tex_w, tex_h = tex_h, tex_w
+            orig_w, orig_h = orig_h, orig_w
         
         # Calculate display size (keep ratio)
         ratio = min(cont_w / tex_w, cont_h / tex_h)
@@ -294,58 +476,85 @@ class CropAdjustScreen(Screen):
         disp_x = (cont_w - disp_w) / 2 + self.image_container.x
         disp_y = (cont_h - disp_h) / 2 + self.image_container.y
         
-        return (disp_x, disp_y, disp_w, disp_h)
+        if disp_w <= 0 or disp_h <= 0:
+            return None
+        
+        self._disp_rect_cache = (disp_x, disp_y, disp_w, disp_h,
+                                 orig_w / disp_w, orig_h / disp_h)
+        return self._disp_rect_cache
     
     def _on_corner_moved(self, handle):
-        """Handle corner movement."""
-        img_rect = self._get_image_display_rect()
-        if not img_rect:
+        """Handle corner movement (applied on the next frame)."""
+        self._pending_handles.add(handle)
+        self._move_trigger()
+    
+    def _flush_moves(self, dt):
+        """Apply the latest position of every handle moved since last frame."""
+        handles, self._pending_handles = self._pending_handles, set()
+        if self._image_open_failed:
             return
         
-        img_x, img_y, img_w, img_h = img_rect
-        
-        try:
-            from PIL import Image as PILImage
-            img = PILImage.open(self.image_path)
-            orig_w, orig_h = img.size
-        except:
+        img_rect = self._get_image_display_rect()
+        if not img_rect:
             return
         
-        # Convert screen position to image coordinates
-        screen_x, screen_y = handle.center
-        
-        # Clamp to image bounds
-        screen_x = max(img_x, min(img_x + img_w, screen_x))
-        screen_y = max(img_y, min(img_y + img_h, screen_y))
-        handle.center = (screen_x, screen_y)
-        
-        # Convert to image coordinates
-        img_coord_x = int(((screen_x - img_x) / img_w) * orig_w)
-        img_coord_y = int(((img_y + img_h - screen_y) / img_h) * orig_h)  # Flip Y
-        
-        # Update quad points
-        idx = handle.corner_index
-        self.quad_points[idx] = (img_coord_x, img_coord_y)
-        
-        self._draw_crop_lines()
+        img_x, img_y, img_w, img_h, scale_x, scale_y = img_rect
+        # Loop-invariant bounds; y is measured down from the top edge
+        right = img_x + img_w
+        top = img_y + img_h
+        orig_w, orig_h = self._orig_size
+        rotation = self.rotation
+        
+        changed = False
+        for handle in handles:
+            # Convert screen position to image coordinates
+            cx, cy = handle.center
+            
+            # Clamp to image bounds
+            screen_x = img_x if cx < img_x else right if cx > right else cx
+            screen_y = img_y if cy < img_y else top if cy > top else cy
+            if screen_x != cx or screen_y != cy:
+                # Only touch the handle when clamped: every center write
+                # fires its pos binding and redraws its canvas
+                handle.center = (screen_x, screen_y)
+            
+            # Convert to image coordinates
+            rx = (screen_x - img_x) * scale_x
+            ry = (top - screen_y) * scale_y  # Flip Y
+            if rotation:
+                rx, ry = _from_rotated(rx, ry, orig_w, orig_h, rotation)
+            img_coord_x = int(rx)
+            img_coord_y = int(ry)
+            
+            # Update quad points
+            idx = handle.corner_index
+            if self.quad_points[idx] != (img_coord_x, img_coord_y):
+                self.quad_points[idx] = (img_coord_x, img_coord_y)
+                changed = True
+        
+        if changed:
+            self._draw_crop_lines()
     
     def _draw_crop_lines(self):
         """Draw lines connecting corner handles."""
-        self.crop_overlay.canvas.clear()
-        
         if len(self.corner_handles) != 4:
+            if self._crop_line is not None:
+                self._crop_line.points = []
             return
         
-        with self.crop_overlay.canvas:
-            Color(*self.theme.get_color('overlay'))
-            
-            points = []
-            for handle in self.corner_handles:
-                points.extend(handle.center)
-            # Close the quad
-            points.extend(self.corner_handles[0].center)
-            
-            Line(points=points, width=2)
+        # Fill the preallocated buffer in place: 4 corners + closing point
+        points = self._line_pts
+        for i, handle in enumerate(self.corner_handles):
+            points[2 * i], points[2 * i + 1] = handle.center
+        points[8], points[9] = points[0], points[1]
+        
+        if self._crop_line is None:
+            with self.crop_overlay.canvas:
+                Color(*self.theme.get_color('overlay'))
+                self._crop_line = Line(points=points, width=2)
+        else:
+            # Mutate the existing instruction instead of rebuilding the canvas
+            self._crop_line.points = points
     
     def _on_filter_select(self, filter_type: FilterType):
         """Handle filter selection."""
@@ -362,11 +571,19 @@ class CropAdjustScreen(Screen):
         """Rotate image 90° counterclockwise."""
         self.rotation = (self.rotation - 90) % 360
         Logger.info(f"CropAdjust: Rotation = {self.rotation}°")
+        self._apply_rotation()
     
     def _on_rotate_right(self, *args):
         """Rotate image 90° clockwise."""
         self.rotation = (self.rotation + 90) % 360
         Logger.info(f"CropAdjust: Rotation = {self.rotation}°")
+        self._apply_rotation()
+    
+    def _apply_rotation(self):
+        """Update the rotated preview and re-map the handles onto it."""
+        self._disp_rect_cache = None
+        self._update_rotation_transform()
+        self._create_corner_handles()
     
     def _on_retake(self, *args):
         """Discard and go back to scanner."""
@@ -392,10 +609,11 @@ class CropAdjustScreen(Screen):
         if not app:
             return
         
-        # Process image with pipeline
-        from app.infra.imaging.scanner_pipeline import ScannerPipeline
-        
-        pipeline = ScannerPipeline(app.get_cache_path())
+        # Process image with pipeline (imported here, off the startup path)
+        if self._pipeline is None:
+            from app.infra.imaging.scanner_pipeline import ScannerPipeline
+            self._pipeline = ScannerPipeline(app.get_cache_path())
+        pipeline = self._pipeline
         
         def on_complete(result):
             if result.success:
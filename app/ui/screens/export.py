@@ -2,8 +2,11 @@
 Export Screen for PDF Scanner App.
 PDF export with compression presets and sharing.
 """
+import hashlib
 import os
-from typing import Optional
+import threading
+from types import MappingProxyType
+from typing import Dict, Optional, Set, Tuple
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
@@ -17,12 +20,107 @@ from kivy.graphics import Color, Rectangle
 from kivy.clock import Clock
 from kivy.logger import Logger
 from kivy.app import App
+from kivy.factory import Factory
+from kivy.lang import Builder
 
 from app.ui.theme import get_theme
 from app.ui.widgets import RoundedButton
 from app.domain.models import ScanSession, CompressionPreset
 
 
+# Left-aligned labels that wrap to their width; a KV rule keeps text_size
+# in sync without a Python closure per label
+Builder.load_string("""
+<ExportLabel@Label>:
+    text_size: self.width, None
+""")
+ExportLabel = Factory.ExportLabel
+
+# Preset button labels
+_PRESET_DESCRIPTIONS = MappingProxyType({
+    CompressionPreset.SMALL: "Small\n~0.5MB/page",
+    CompressionPreset.BALANCED: "Balanced\n~1MB/page",
+    CompressionPreset.HIGH: "High\n~2MB/page",
+})
+
+# Preview thumbnails are rendered at 2x the 80x90 display size
+THUMB_SIZE = (160, 180)
+
+# (image_path, mtime) -> thumbnail path
+_thumb_cache: Dict[Tuple[str, float], str] = {}
+
+
+def _get_thumbnail(path: str, cache_dir: str,
+                   size: Tuple[int, int] = THUMB_SIZE) -> Optional[str]:
+    """
+    Get a small JPEG thumbnail for a page image, generating it if needed.
+    
+    Args:
+        path: Path to full-resolution page image
+        cache_dir: App cache directory
+        size: Maximum thumbnail (width, height)
+        
+    Returns:
+        Path to thumbnail, or None if it could not be created
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    
+    key = (path, mtime)
+    thumb_path = _thumb_cache.get(key)
+    if thumb_path:
+        return thumb_path
+    
+    thumbs_dir = os.path.join(cache_dir, 'thumbs')
+    name = hashlib.sha1(path.encode('utf-8')).hexdigest()
+    thumb_path = os.path.join(thumbs_dir, f"{name}.jpg")
+    
+    try:
+        # Reuse a thumbnail from a previous run if the page is unchanged
+        if not (os.path.exists(thumb_path) and os.path.getmtime(thumb_path) >= mtime):
+            from PIL import Image as PILImage
+            
+            os.makedirs(thumbs_dir, exist_ok=True)
+            with PILImage.open(path) as img:
+                img.draft('RGB', size)
+                img.thumbnail(size, PILImage.Resampling.LANCZOS)
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                img.save(thumb_path, 'JPEG', quality=80)
+    except Exception as e:
+        Logger.warning(f"Export: Thumbnail failed for {path}: {e}")
+        return None
+    
+    _thumb_cache[key] = thumb_path
+    return thumb_path
+
+
+def _split(path: str) -> Tuple[str, str]:
+    return os.path.dirname(path), os.path.basename(path)
+
+
+def _present_files(paths) -> Set[Tuple[str, str]]:
+    """
+    Find which of the given files exist with one directory read per folder.
+    
+    Args:
+        paths: File paths (usually all in one session folder)
+        
+    Returns:
+        Set of (dirname, basename) pairs that exist
+    """
+    present = set()
+    for folder in {os.path.dirname(p) for p in paths if p}:
+        try:
+            with os.scandir(folder or '.') as entries:
+                present.update((folder, entry.name) for entry in entries)
+        except OSError:
+            pass
+    return present
+
+
 class ExportScreen(Screen):
     """Screen for exporting scan session to PDF."""
     
@@ -33,8 +131,30 @@ class ExportScreen(Screen):
         self.selected_preset: CompressionPreset = CompressionPreset.BALANCED
         self.output_path: Optional[str] = None
         self.is_exporting = False
-        
-        self._build_ui()
+        # Bumped on every preview rebuild so stale thumbnail jobs are ignored
+        self._preview_generation = 0
+        # Preview Image widgets, reused across sessions with the same page count
+        self._thumb_widgets: list = []
+        # Page dimensions keyed by ((path, mtime), ...) so preset switches
+        # re-estimate without touching the disk
+        self._base_sizes: Optional[list] = None
+        self._base_sizes_sig: Optional[tuple] = None
+        self._size_cache: Dict[str, int] = {}
+        # Latest (current, total) export progress, drawn at most once per frame
+        self._progress_pending: Optional[Tuple[int, int]] = None
+        self._progress_trigger = Clock.create_trigger(self._flush_progress, 0)
+        # Widgets are built on first use, not at app start
+        self._built = False
+    
+    def _ensure_ui(self):
+        """Build the widget tree once, on first use."""
+        if not self._built:
+            self._built = True
+            self._build_ui()
+    
+    def on_pre_enter(self, *args):
+        """Called before the screen is shown."""
+        self._ensure_ui()
     
     def _build_ui(self):
         """Build the export screen UI."""
@@ -58,7 +178,7 @@ class ExportScreen(Screen):
         back_btn.bind(on_release=self._on_back)
         header.add_widget(back_btn)
         
-        title = Label(
+        title = ExportLabel(
             text='Export PDF',
             font_size='22sp',
             color=self.theme.get_color('on_surface'),
@@ -66,13 +186,12 @@ class ExportScreen(Screen):
             valign='middle',
             bold=True
         )
-        title.bind(size=lambda *x: setattr(title, 'text_size', (title.width, None)))
         header.add_widget(title)
         
         root.add_widget(header)
         
         # Pages preview
-        preview_label = Label(
+        preview_label = ExportLabel(
             text='Pages',
             font_size='16sp',
             color=self.theme.get_color('on_surface'),
@@ -80,7 +199,6 @@ class ExportScreen(Screen):
             size_hint_y=None,
             height=30
         )
-        preview_label.bind(size=lambda *x: setattr(preview_label, 'text_size', (preview_label.width, None)))
         root.add_widget(preview_label)
         
         # Horizontal scroll of page thumbnails
@@ -102,7 +220,7 @@ class ExportScreen(Screen):
         root.add_widget(self.pages_scroll)
         
         # Filename input
-        filename_label = Label(
+        filename_label = ExportLabel(
             text='Filename',
             font_size='16sp',
             color=self.theme.get_color('on_surface'),
@@ -110,7 +228,6 @@ class ExportScreen(Screen):
             size_hint_y=None,
             height=30
         )
-        filename_label.bind(size=lambda *x: setattr(filename_label, 'text_size', (filename_label.width, None)))
         root.add_widget(filename_label)
         
         self.filename_input = TextInput(
@@ -126,7 +243,7 @@ class ExportScreen(Screen):
         root.add_widget(self.filename_input)
         
         # Compression presets
-        preset_label = Label(
+        preset_label = ExportLabel(
             text='Quality Preset',
             font_size='16sp',
             color=self.theme.get_color('on_surface'),
@@ -134,21 +251,14 @@ class ExportScreen(Screen):
             size_hint_y=None,
             height=30
         )
-        preset_label.bind(size=lambda *x: setattr(preset_label, 'text_size', (preset_label.width, None)))
         root.add_widget(preset_label)
         
         presets_layout = BoxLayout(size_hint_y=None, height=80, spacing=12)
         
         self.preset_buttons = {}
         for preset in CompressionPreset:
-            desc = {
-                CompressionPreset.SMALL: "Small\n~0.5MB/page",
-                CompressionPreset.BALANCED: "Balanced\n~1MB/page",
-                CompressionPreset.HIGH: "High\n~2MB/page",
-            }
-            
             btn = RoundedButton(
-                text=desc.get(preset, preset.value),
+                text=_PRESET_DESCRIPTIONS.get(preset, preset.value),
                 variant='secondary' if preset != self.selected_preset else 'primary',
                 font_size='13sp'
             )
@@ -160,7 +270,7 @@ class ExportScreen(Screen):
         root.add_widget(presets_layout)
         
         # Size estimate
-        self.size_estimate = Label(
+        self.size_estimate = ExportLabel(
             text='Estimated size: calculating...',
             font_size='14sp',
             color=self.theme.get_color('on_surface_variant'),
@@ -168,7 +278,6 @@ class ExportScreen(Screen):
             size_hint_y=None,
             height=24
         )
-        self.size_estimate.bind(size=lambda *x: setattr(self.size_estimate, 'text_size', (self.size_estimate.width, None)))
         root.add_widget(self.size_estimate)
         
         root.add_widget(Widget())  # Spacer
@@ -230,6 +339,7 @@ class ExportScreen(Screen):
     
     def set_session(self, session: ScanSession):
         """Set the session to export."""
+        self._ensure_ui()
         self.session = session
         self.output_path = None
         self.share_btn.disabled = True
@@ -239,45 +349,91 @@ class ExportScreen(Screen):
     
     def _update_pages_preview(self):
         """Update the pages thumbnail preview."""
-        self.pages_container.clear_widgets()
+        self._preview_generation += 1
         
-        if not self.session or not self.session.pages:
-            return
+        pages = self.session.pages if self.session else []
         
-        for i, page in enumerate(self.session.pages):
-            # Create thumbnail container
-            thumb_container = BoxLayout(
-                orientation='vertical',
-                size_hint=(None, None),
-                size=(80, 110),
-                spacing=4
-            )
+        # Rebuild only when the page count changes; otherwise retarget the
+        # existing Image widgets in place
+        if len(self._thumb_widgets) != len(pages):
+            self.pages_container.clear_widgets()
+            self._thumb_widgets = []
             
-            # Thumbnail image
-            if page.image_path and os.path.exists(page.image_path):
+            for i in range(len(pages)):
+                # Create thumbnail container
+                thumb_container = BoxLayout(
+                    orientation='vertical',
+                    size_hint=(None, None),
+                    size=(80, 110),
+                    spacing=4
+                )
+                
+                # Thumbnail image; small and drawn once, so no mipmaps,
+                # no Kivy cache entry and no CPU-side copy of the pixels
                 thumb = Image(
-                    source=page.image_path,
                     allow_stretch=True,
                     keep_ratio=True,
+                    keep_data=False,
+                    nocache=True,
+                    mipmap=False,
                     size_hint=(None, None),
                     size=(80, 90)
                 )
+                thumb.opacity = 0
+                thumb_container.add_widget(thumb)
+                
+                # Page number
+                num_label = Label(
+                    text=str(i + 1),
+                    font_size='12sp',
+                    color=self.theme.get_color('on_surface'),
+                    size_hint_y=None,
+                    height=16
+                )
+                thumb_container.add_widget(num_label)
+                
+                self.pages_container.add_widget(thumb_container)
+                self._thumb_widgets.append(thumb)
+        
+        # (widget, image_path) pairs filled in by the thumbnail worker
+        pending = []
+        present = _present_files(page.image_path for page in pages)
+        
+        for page, thumb in zip(pages, self._thumb_widgets):
+            if page.image_path and _split(page.image_path) in present:
+                pending.append((thumb, page.image_path))
             else:
-                thumb = Widget(size_hint=(None, None), size=(80, 90))
-            
-            thumb_container.add_widget(thumb)
-            
-            # Page number
-            num_label = Label(
-                text=str(i + 1),
-                font_size='12sp',
-                color=self.theme.get_color('on_surface'),
-                size_hint_y=None,
-                height=16
+                thumb.opacity = 0
+        
+        if pending:
+            app = App.get_running_app()
+            cache_dir = app.get_cache_path() if app else None
+            if cache_dir:
+                threading.Thread(
+                    target=self._load_thumbnails,
+                    args=(pending, cache_dir, self._preview_generation),
+                    daemon=True
+                ).start()
+            else:
+                for thumb, path in pending:
+                    self._set_thumbnail(thumb, path, self._preview_generation)
+    
+    def _load_thumbnails(self, pending, cache_dir: str, generation: int):
+        """Generate preview thumbnails in the background (worker thread)."""
+        for thumb, path in pending:
+            if generation != self._preview_generation:
+                return
+            thumb_path = _get_thumbnail(path, cache_dir) or path
+            Clock.schedule_once(
+                lambda dt, t=thumb, s=thumb_path: self._set_thumbnail(t, s, generation), 0
             )
-            thumb_container.add_widget(num_label)
-            
-            self.pages_container.add_widget(thumb_container)
+    
+    def _set_thumbnail(self, thumb, source: str, generation: int):
+        if generation == self._preview_generation:
+            # Unchanged pages map to the same thumbnail path, so this is a
+            # no-op for them and their texture is not re-uploaded
+            thumb.source = source
+            thumb.opacity = 1
     
     def _update_filename(self):
         """Update default filename based on date."""
@@ -291,11 +447,27 @@ class ExportScreen(Screen):
             self.size_estimate.text = "Estimated size: --"
             return
         
+        # Imported on first use so the PDF stack stays off the startup path
+        from app.infra.pdf.pdf_compress import (
+            read_image_dimensions, estimate_size_from_dimensions, format_file_size
+        )
+        
         # Get image paths
         image_paths = [p.image_path for p in self.session.pages if p.image_path]
         
-        from app.infra.pdf.pdf_compress import estimate_output_size, format_file_size
-        estimated = estimate_output_size(image_paths, self.selected_preset.value)
+        present = _present_files(image_paths)
+        sig = tuple((p, os.path.getmtime(p) if _split(p) in present else None)
+                    for p in image_paths)
+        if sig != self._base_sizes_sig:
+            self._base_sizes = read_image_dimensions(image_paths)
+            self._base_sizes_sig = sig
+            self._size_cache = {}
+        
+        preset = self.selected_preset.value
+        estimated = self._size_cache.get(preset)
+        if estimated is None:
+            estimated = estimate_size_from_dimensions(self._base_sizes, preset)
+            self._size_cache[preset] = estimated
         self.size_estimate.text = f"Estimated size: {format_file_size(estimated)}"
     
     def _on_preset_select(self, btn):
@@ -310,7 +482,6 @@ class ExportScreen(Screen):
             else:
                 button.bg_color = self.theme.get_color('secondary_container')
                 button.color = self.theme.get_color('on_surface')
-            button._update_canvas()
         
         self._update_size_estimate()
     
@@ -330,17 +501,17 @@ class ExportScreen(Screen):
         
         filename = self.filename_input.text.strip() or "Scanned_Document"
         
-        # Export using use case
         from app.domain.usecases import ExportPDFUseCase
         from app.infra.storage.repositories import DocumentRepository
         
+        # Export using use case
         doc_repo = DocumentRepository(app.db_manager)
         export_uc = ExportPDFUseCase(doc_repo, app.get_documents_path())
         
         def progress_update(current, total):
-            progress = (current / total) * 100
-            self.progress_bar.value = progress
-            self.progress_label.text = f"Processing page {current}/{total}..."
+            # May be called from the worker; only the latest value is drawn
+            self._progress_pending = (current, total)
+            self._progress_trigger()
         
         def do_export():
             result = export_uc.export_session_to_pdf(
@@ -351,6 +522,8 @@ class ExportScreen(Screen):
             )
             
             def on_complete(dt):
+                # Drop a progress flush still queued behind the final state
+                self._progress_pending = None
                 self.is_exporting = False
                 self.export_btn.disabled = False
                 
@@ -378,9 +551,16 @@ class ExportScreen(Screen):
             Clock.schedule_once(on_complete, 0)
         
         # Run export in background
-        import threading
         threading.Thread(target=do_export, daemon=True).start()
     
+    def _flush_progress(self, dt):
+        pending, self._progress_pending = self._progress_pending, None
+        if pending is None:
+            return
+        current, total = pending
+        self.progress_bar.value = (current / total) * 100
+        self.progress_label.text = f"Processing page {current}/{total}..."
+    
     def _on_share(self, *args):
         """Share the exported PDF."""
         if not self.output_path or not os.path.exists(self.output_path):
@@ -4,7 +4,8 @@ Main entry point with scan button, import, and recent documents.
 """
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.label import Label
 from kivy.uix.widget import Widget
 from kivy.graphics import Color, Rectangle
@@ -13,7 +14,7 @@ from kivy.logger import Logger
 from kivy.app import App
 
 from app.ui.theme import get_theme
-from app.ui.widgets import RoundedButton, DocumentCard
+from app.ui.widgets import RoundedButton, DocumentCardView, sync_text_width
 
 
 class HomeScreen(Screen):
@@ -22,7 +23,13 @@ class HomeScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.theme = get_theme()
+        # Theme colors used while building, resolved once
+        self._c_on_surface = self.theme.get_color('on_surface')
+        self._c_on_surface_variant = self.theme.get_color('on_surface_variant')
+        self._c_background = self.theme.get_color('background')
         self.recent_documents = []
+        # Documents table signature the recents list was last loaded for
+        self._recents_signature = None
         self._build_ui()
     
     def _build_ui(self):
@@ -36,12 +43,12 @@ class HomeScreen(Screen):
         title = Label(
             text='PDF Scanner',
             font_size='28sp',
-            color=self.theme.get_color('on_surface'),
+            color=self._c_on_surface,
             halign='left',
             valign='middle',
             bold=True
         )
-        title.bind(size=lambda *x: setattr(title, 'text_size', (title.width, None)))
+        title.fbind('size', sync_text_width, title)
         header.add_widget(title)
         
         # Settings button
@@ -51,7 +58,7 @@ class HomeScreen(Screen):
             size_hint=(None, None),
             size=(48, 48)
         )
-        settings_btn.bind(on_release=self._on_settings)
+        settings_btn.fbind('on_release', self._on_settings)
         header.add_widget(settings_btn)
         
         main_layout.add_widget(header)
@@ -64,7 +71,7 @@ class HomeScreen(Screen):
             variant='primary',
             font_size='18sp'
         )
-        scan_btn.bind(on_release=self._on_scan)
+        scan_btn.fbind('on_release', self._on_scan)
         buttons_layout.add_widget(scan_btn)
         
         import_btn = RoundedButton(
@@ -72,7 +79,7 @@ class HomeScreen(Screen):
             variant='secondary',
             size_hint_x=0.4
         )
-        import_btn.bind(on_release=self._on_import)
+        import_btn.fbind('on_release', self._on_import)
         buttons_layout.add_widget(import_btn)
         
         main_layout.add_widget(buttons_layout)
@@ -81,40 +88,60 @@ class HomeScreen(Screen):
         recent_header = Label(
             text='Recent Documents',
             font_size='18sp',
-            color=self.theme.get_color('on_surface'),
+            color=self._c_on_surface,
             halign='left',
             valign='middle',
             size_hint_y=None,
             height=40
         )
-        recent_header.bind(size=lambda *x: setattr(recent_header, 'text_size', (recent_header.width, None)))
+        recent_header.fbind('size', sync_text_width, recent_header)
         main_layout.add_widget(recent_header)
         
-        # Recent documents list
-        self.recents_container = BoxLayout(
+        # Recent documents list; only visible cards exist as widgets
+        self.recents_container = BoxLayout(orientation='vertical')
+        
+        self.empty_label = Label(
+            text='No documents yet.\nTap "Scan Document" to get started!',
+            font_size='14sp',
+            color=self._c_on_surface_variant,
+            halign='center',
+            valign='middle',
+            size_hint_y=None,
+            height=100
+        )
+        self.empty_label.fbind('size', sync_text_width, self.empty_label)
+        
+        self.recents_view = RecycleView(size_hint=(1, 1))
+        self.recents_view.viewclass = DocumentCardView
+        self.recents_view.on_tap_callback = self._on_document_tap
+        self.recents_view.on_long_press_callback = self._on_document_long_press
+        recents_layout = RecycleBoxLayout(
             orientation='vertical',
             spacing=8,
-            size_hint_y=None
+            size_hint_y=None,
+            default_size=(None, 80),
+            default_size_hint=(1, None)
         )
-        self.recents_container.bind(minimum_height=self.recents_container.setter('height'))
+        recents_layout.fbind('minimum_height', recents_layout.setter('height'))
+        self.recents_view.add_widget(recents_layout)
+        self.recents_container.add_widget(self.recents_view)
         
-        recents_scroll = ScrollView(size_hint=(1, 1))
-        recents_scroll.add_widget(self.recents_container)
-        main_layout.add_widget(recents_scroll)
+        main_layout.add_widget(self.recents_container)
         
-        # Banner ad placeholder (at bottom)
+        # Banner ad placeholder (at bottom); only in the tree while ads show
         self.banner_container = BoxLayout(size_hint_y=None, height=60)
-        self._update_banner_placeholder()
-        main_layout.add_widget(self.banner_container)
+        self._banner_in_tree = False
         
         # Set background
         with main_layout.canvas.before:
-            Color(*self.theme.get_color('background'))
+            Color(*self._c_background)
             self.bg_rect = Rectangle(pos=main_layout.pos, size=main_layout.size)
-        main_layout.bind(pos=self._update_bg, size=self._update_bg)
+        main_layout.fbind('pos', self._update_bg)
+        main_layout.fbind('size', self._update_bg)
         
         self.add_widget(main_layout)
         self.main_layout = main_layout
+        self._update_banner_placeholder()
     
     def _update_bg(self, *args):
         self.bg_rect.pos = self.main_layout.pos
@@ -126,20 +153,29 @@ class HomeScreen(Screen):
         
         # Show banner placeholder or actual ad
         app = App.get_running_app()
-        if app and hasattr(app, 'ads_manager') and app.ads_manager:
-            if app.ads_manager.should_show_ads():
-                # Show banner
-                banner_label = Label(
-                    text='[Ad Banner Area]',
-                    font_size='12sp',
-                    color=[0.5, 0.5, 0.5, 0.5]
-                )
-                self.banner_container.add_widget(banner_label)
-                # Trigger native banner
-                app.ads_manager.show_banner()
-            else:
-                # No ads - hide container
-                self.banner_container.height = 0
+        show_ads = bool(app and getattr(app, 'ads_manager', None)
+                        and app.ads_manager.should_show_ads())
+        
+        if not show_ads:
+            # No ads - take the container out of layout entirely
+            if self._banner_in_tree:
+                self.main_layout.remove_widget(self.banner_container)
+                self._banner_in_tree = False
+            return
+        
+        if not self._banner_in_tree:
+            self.main_layout.add_widget(self.banner_container)
+            self._banner_in_tree = True
+        
+        # Show banner
+        banner_label = Label(
+            text='[Ad Banner Area]',
+            font_size='12sp',
+            color=[0.5, 0.5, 0.5, 0.5]
+        )
+        self.banner_container.add_widget(banner_label)
+        # Trigger native banner
+        app.ads_manager.show_banner()
     
     def on_enter(self):
         """Called when screen is shown."""
@@ -147,38 +183,28 @@ class HomeScreen(Screen):
         self._update_banner_placeholder()
     
     def _load_recent_documents(self):
-        """Load and display recent documents."""
-        self.recents_container.clear_widgets()
-        
+        """Load and display recent documents (skipped if nothing changed)."""
         try:
             app = App.get_running_app()
             if app and app.db_manager:
                 from app.infra.storage.repositories import DocumentRepository
                 doc_repo = DocumentRepository(app.db_manager)
-                self.recent_documents = doc_repo.get_all_documents(limit=20)
+                
+                signature = doc_repo.get_documents_signature()
+                if signature == self._recents_signature:
+                    return
+                self._recents_signature = signature
+                
+                if self.empty_label.parent:
+                    self.recents_container.remove_widget(self.empty_label)
+                # Plain row dicts go straight to the RecycleView, which
+                # creates and recycles the cards
+                self.recent_documents = doc_repo.get_recent_view_dicts(limit=20)
+                self.recents_view.data = self.recent_documents
                 
                 if not self.recent_documents:
                     # Show empty state
-                    empty_label = Label(
-                        text='No documents yet.\nTap "Scan Document" to get started!',
-                        font_size='14sp',
-                        color=self.theme.get_color('on_surface_variant'),
-                        halign='center',
-                        valign='middle',
-                        size_hint_y=None,
-                        height=100
-                    )
-                    empty_label.bind(size=lambda *x: setattr(empty_label, 'text_size', (empty_label.width, None)))
-                    self.recents_container.add_widget(empty_label)
-                else:
-                    # Add document cards
-                    for doc in self.recent_documents:
-                        card = DocumentCard(
-                            document=doc,
-                            on_tap=self._on_document_tap,
-                            on_long_press=self._on_document_long_press
-                        )
-                        self.recents_container.add_widget(card)
+                    self.recents_container.add_widget(self.empty_label, index=1)
         except Exception as e:
             Logger.error(f"Home: Failed to load documents: {e}")
     
@@ -230,9 +256,9 @@ class HomeScreen(Screen):
     
     def _on_document_tap(self, document):
         """Handle document tap - open in PDF viewer."""
-        Logger.info(f"Home: Tapped document {document.name}")
-        if document.file_path:
-            self._open_pdf_viewer(document.file_path)
+        Logger.info(f"Home: Tapped document {document['name']}")
+        if document['file_path']:
+            self._open_pdf_viewer(document['file_path'])
     
     def _open_pdf_viewer(self, pdf_path):
         """Open PDF in native viewer."""
@@ -256,7 +282,7 @@ class HomeScreen(Screen):
     
     def _on_document_long_press(self, document):
         """Handle document long press - show share option."""
-        Logger.info(f"Home: Long press on {document.name}")
-        if document.file_path:
+        Logger.info(f"Home: Long press on {document['name']}")
+        if document['file_path']:
             from app.android_bridge.intents import share_file
-            share_file(document.file_path, 'application/pdf', 'Share PDF')
+            share_file(document['file_path'], 'application/pdf', 'Share PDF')
@@ -3,6 +3,8 @@ Scanner Screen for PDF Scanner App.
 Camera preview with document edge detection overlay.
 """
 import os
+import threading
+from array import array
 from typing import Optional, List, Tuple
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
@@ -10,7 +12,7 @@ from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.relativelayout import RelativeLayout
 from kivy.uix.label import Label
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Line, Rectangle, Ellipse
+from kivy.graphics import Color, Line, Rectangle, Ellipse, Fbo
 from kivy.clock import Clock
 from kivy.logger import Logger
 from kivy.app import App
@@ -18,27 +20,80 @@ from kivy.utils import platform
 from kivy.properties import BooleanProperty, ObjectProperty
 
 from app.ui.theme import get_theme
-from app.ui.widgets import RoundedButton, PageCounter
+from app.ui.widgets import RoundedButton, PageCounter, sync_text_width
 from app.domain.models import ScanSession, Page, FilterType, QuadResult
 
 
 class ScannerScreen(Screen):
     """Scanner screen with live camera preview and document detection."""
     
+    # Mean preview brightness (0-255) below which the flash hint shows
+    LOW_LIGHT_THRESHOLD = 50
+    
+    # Raw captures reuse a ring of files; pages keep the pipeline's own
+    # output, so a slot is only read until its crop is confirmed
+    CAPTURE_SLOTS = 8
+    
+    # Preview frames are scaled to this width on the GPU before readback;
+    # the overlay only needs a coarse quad
+    DETECT_WIDTH = 480
+    
     camera_ready = BooleanProperty(False)
     session = ObjectProperty(None, allownone=True)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.theme = get_theme()
+        # Resolved once; the overlay is redrawn for every detection result
+        self._c_overlay = self.theme.get_color('overlay')
+        # Quad outline points, updated in place (4 corners + closing point)
+        self._quad_pts = array('f', [0.0] * 10)
         self.session: Optional[ScanSession] = None
         self.pipeline = None
         self.current_quad: Optional[QuadResult] = None
         self.flash_on = False
         self.low_light_warning = False
         self._permission_requested = False
-        
-        self._build_ui()
+        # Set while a captured frame is being encoded in the background
+        self._capturing = False
+        self._capture_slot = 0
+        # Live detection: frames only record the latest texture; a trigger
+        # (created with the pipeline) runs detection at its preview rate
+        self._last_texture = None
+        self._detecting = False
+        self._detect_trigger = None
+        # Offscreen target the camera frame is drawn into for detection
+        self._detect_fbo: Optional[Fbo] = None
+        self._detect_rect: Optional[Rectangle] = None
+        self._detect_size: Tuple[int, int] = (0, 0)
+        
+        # Widget tree is built on first entry (see _ensure_ui)
+        self._built = False
+        
+        # Importing the pipeline pulls in OpenCV/NumPy; do it off the UI thread
+        self._pending_pipeline = None
+        threading.Thread(target=self._preload_pipeline, daemon=True).start()
+    
+    def _preload_pipeline(self):
+        """Import and construct the scanner pipeline (worker thread)."""
+        try:
+            app = App.get_running_app()
+            if app:
+                from app.infra.imaging.scanner_pipeline import ScannerPipeline
+                self._pending_pipeline = ScannerPipeline(app.get_cache_path())
+        except Exception as e:
+            Logger.warning(f"Scanner: Pipeline preload failed: {e}")
+    
+    def _ensure_ui(self):
+        """Build the widget tree once, on first use."""
+        if not self._built:
+            self._built = True
+            self._build_ui()
+            self._update_page_count()
+    
+    def on_pre_enter(self, *args):
+        """Called before the screen is shown."""
+        self._ensure_ui()
     
     def _build_ui(self):
         """Build the scanner screen UI."""
@@ -50,11 +105,15 @@ class ScannerScreen(Screen):
         with self.camera_container.canvas.before:
             Color(0.1, 0.1, 0.1, 1)
             self.camera_bg = Rectangle(size=self.camera_container.size)
-        self.camera_container.bind(size=self._update_camera_bg)
+        self.camera_container.fbind('size', self._update_camera_bg)
         root.add_widget(self.camera_container)
         
         # Overlay for quad drawing
         self.overlay = Widget()
+        with self.overlay.canvas:
+            # Persistent quad outline; hidden via alpha when there is no quad
+            self._overlay_color = Color(*self._c_overlay[:3], 0)
+            self._overlay_line = Line(points=self._quad_pts, width=3)
         self.camera_container.add_widget(self.overlay)
         
         # Permission/error message
@@ -68,7 +127,7 @@ class ScannerScreen(Screen):
             height=100,
             pos_hint={'center_x': 0.5, 'center_y': 0.5}
         )
-        self.message_label.bind(size=lambda *x: setattr(self.message_label, 'text_size', (self.message_label.width, None)))
+        self.message_label.fbind('size', sync_text_width, self.message_label)
         root.add_widget(self.message_label)
         
         # Top bar
@@ -87,7 +146,7 @@ class ScannerScreen(Screen):
             size_hint=(None, None),
             size=(48, 48)
         )
-        back_btn.bind(on_release=self._on_back)
+        back_btn.fbind('on_release', self._on_back)
         top_bar.add_widget(back_btn)
         
         top_bar.add_widget(Widget())  # Spacer
@@ -106,7 +165,7 @@ class ScannerScreen(Screen):
             size_hint=(None, None),
             size=(48, 48)
         )
-        self.flash_btn.bind(on_release=self._on_flash_toggle)
+        self.flash_btn.fbind('on_release', self._on_flash_toggle)
         top_bar.add_widget(self.flash_btn)
         
         root.add_widget(top_bar)
@@ -139,7 +198,7 @@ class ScannerScreen(Screen):
             size_hint=(None, None),
             size=(56, 56)
         )
-        self.preview_btn.bind(on_release=self._on_preview)
+        self.preview_btn.fbind('on_release', self._on_preview)
         bottom_bar.add_widget(self.preview_btn)
         
         bottom_bar.add_widget(Widget())  # Spacer
@@ -152,7 +211,7 @@ class ScannerScreen(Screen):
             size_hint=(1, 1),
             radius=40
         )
-        self.capture_btn_inner.bind(on_release=self._on_capture)
+        self.capture_btn_inner.fbind('on_release', self._on_capture)
         capture_btn.add_widget(self.capture_btn_inner)
         bottom_bar.add_widget(capture_btn)
         
@@ -165,7 +224,7 @@ class ScannerScreen(Screen):
             size_hint=(None, None),
             size=(80, 56)
         )
-        self.done_btn.bind(on_release=self._on_done)
+        self.done_btn.fbind('on_release', self._on_done)
         self.done_btn.disabled = True
         bottom_bar.add_widget(self.done_btn)
         
@@ -217,7 +276,7 @@ class ScannerScreen(Screen):
                 size=(200, 48),
                 pos_hint={'center_x': 0.5, 'center_y': 0.35}
             )
-            self.grant_btn.bind(on_release=self._request_permission)
+            self.grant_btn.fbind('on_release', self._request_permission)
             self.root_layout.add_widget(self.grant_btn)
     
     def _show_permission_denied_permanently(self):
@@ -236,7 +295,7 @@ class ScannerScreen(Screen):
                 size=(200, 48),
                 pos_hint={'center_x': 0.5, 'center_y': 0.35}
             )
-            self.settings_btn.bind(on_release=self._open_settings)
+            self.settings_btn.fbind('on_release', self._open_settings)
             self.root_layout.add_widget(self.settings_btn)
     
     def _request_permission(self, *args):
@@ -272,11 +331,17 @@ class ScannerScreen(Screen):
         self._hide_permission_ui()
         
         try:
-            # Initialize pipeline
+            # Initialize pipeline (normally already built by _preload_pipeline)
             app = App.get_running_app()
-            if app:
-                from app.infra.imaging.scanner_pipeline import ScannerPipeline
-                self.pipeline = ScannerPipeline(app.get_cache_path())
+            if app and not self.pipeline:
+                self.pipeline = self._pending_pipeline
+                if not self.pipeline:
+                    from app.infra.imaging.scanner_pipeline import ScannerPipeline
+                    self.pipeline = ScannerPipeline(app.get_cache_path())
+            if self.pipeline and self._detect_trigger is None:
+                self._detect_trigger = Clock.create_trigger(
+                    self._run_detection, self.pipeline.PREVIEW_FRAME_INTERVAL
+                )
             
             # Start camera (platform-specific)
             if platform == 'android':
@@ -329,6 +394,12 @@ class ScannerScreen(Screen):
     
     def _stop_camera(self):
         """Stop camera preview."""
+        if self._detect_trigger is not None:
+            self._detect_trigger.cancel()
+        self._last_texture = None
+        # Release the offscreen target with the camera
+        self._detect_fbo = None
+        self._detect_rect = None
         if hasattr(self, 'camera') and self.camera:
             self.camera.play = False
             if self.camera.parent:
@@ -336,39 +407,97 @@ class ScannerScreen(Screen):
             self.camera = None
         self.camera_ready = False
     
-    def _on_camera_frame(self, camera, texture):
+    def _on_camera_frame(self, camera, *args):
         """Handle camera frame for document detection."""
-        if not self.pipeline or not texture:
+        self._last_texture = camera.texture
+        if self._detect_trigger is not None:
+            self._detect_trigger()
+    
+    def _run_detection(self, dt):
+        """Run preview detection on the latest frame (off the UI thread)."""
+        texture = self._last_texture
+        if not self.pipeline or not texture or self._detecting or self._capturing:
+            return
+        
+        width, height, pixels = self._read_detect_pixels(texture)
+        self._update_low_light(pixels)
+        if self.pipeline.detect_document_preview(
+            pixels, width, height, self._on_preview_quad
+        ):
+            self._detecting = True
+    
+    def _read_detect_pixels(self, texture) -> Tuple[int, int, bytes]:
+        """
+        Downscale a camera frame on the GPU and read back the small copy.
+        
+        texture.pixels would allocate a full-size FBO and copy the whole
+        frame back on the UI thread every detection tick.
+        
+        Returns:
+            (width, height, RGBA bytes), rows bottom-up
+        """
+        tw, th = texture.size
+        w = min(self.DETECT_WIDTH, tw)
+        h = max(1, round(th * w / tw))
+        
+        if self._detect_fbo is None or self._detect_size != (w, h):
+            self._detect_fbo = Fbo(size=(w, h))
+            with self._detect_fbo:
+                Color(1, 1, 1, 1)
+                self._detect_rect = Rectangle(pos=(0, 0), size=(w, h), texture=texture)
+            self._detect_size = (w, h)
+        elif self._detect_rect.texture is not texture:
+            self._detect_rect.texture = texture
+        
+        self._detect_fbo.draw()
+        return w, h, self._detect_fbo.pixels
+    
+    def _update_low_light(self, pixels: bytes):
+        """Show or hide the low light warning for a preview frame."""
+        brightness = self.pipeline.detector.estimate_frame_brightness(pixels)
+        low_light = brightness < self.LOW_LIGHT_THRESHOLD
+        if low_light != self.low_light_warning:
+            self.low_light_warning = low_light
+            self.low_light_label.opacity = 1 if low_light else 0
+    
+    def _on_preview_quad(self, quad: QuadResult):
+        """Show a preview detection result (UI thread)."""
+        self._detecting = False
+        if not self.camera_ready:
             return
         
-        # Throttled detection in pipeline handles frame rate
-        # For now, we'll detect on capture only to save resources
+        if quad.is_valid:
+            # Texture readback rows run bottom-up; flip into image space
+            frame_h = quad.frame_size[1]
+            quad.points = [(x, frame_h - y) for x, y in quad.points]
+        self.current_quad = quad
+        self._draw_quad_overlay(quad)
     
     def _draw_quad_overlay(self, quad: QuadResult):
         """Draw document quad overlay on preview."""
-        self.overlay.canvas.clear()
-        
         if not quad.is_valid:
+            self._overlay_color.a = 0
             return
         
-        with self.overlay.canvas:
-            Color(*self.theme.get_color('overlay'))
-            
-            # Scale points to overlay size
-            scale_x = self.overlay.width / quad.frame_size[0]
-            scale_y = self.overlay.height / quad.frame_size[1]
-            
-            points = []
-            for x, y in quad.points:
-                # Flip Y coordinate (camera coords vs screen coords)
-                screen_x = x * scale_x
-                screen_y = self.overlay.height - (y * scale_y)
-                points.extend([screen_x, screen_y])
-            
-            # Close the quad
-            points.extend(points[:2])
-            
-            Line(points=points, width=3)
+        # Scale points to overlay size
+        overlay_h = self.overlay.height
+        scale_x = self.overlay.width / quad.frame_size[0]
+        scale_y = overlay_h / quad.frame_size[1]
+        
+        pts = self._quad_pts
+        i = 0
+        for x, y in quad.points:
+            # Flip Y coordinate (camera coords vs screen coords)
+            pts[i] = x * scale_x
+            pts[i + 1] = overlay_h - y * scale_y
+            i += 2
+        
+        # Close the quad
+        pts[8] = pts[0]
+        pts[9] = pts[1]
+        
+        self._overlay_line.points = pts
+        self._overlay_color.rgba = self._c_overlay
     
     def _on_capture(self, *args):
         """Capture current frame."""
@@ -388,37 +517,74 @@ class ScannerScreen(Screen):
             Clock.schedule_once(lambda dt: setattr(self.message_label, 'text', ''), 3)
             return
         
+        if self._capturing:
+            return
+        
         self.message_label.text = "Capturing..."
         
         try:
             # Capture image from camera
             if hasattr(self, 'camera') and self.camera and self.camera.texture:
-                # Save camera texture to file
-                import time
-                cache_path = app.get_cache_path() if app else '/tmp'
-                timestamp = int(time.time() * 1000)
-                capture_path = os.path.join(cache_path, f"capture_{timestamp}.jpg")
+                # One GPU readback on the UI thread; encoding and detection
+                # run on a worker
+                texture = self.camera.texture
+                pixels = texture.pixels
+                size = tuple(texture.size)
                 
-                self.camera.export_to_png(capture_path)  # Actually saves as PNG
+                cache_path = app.get_cache_path() if app else '/tmp'
+                capture_path = os.path.join(cache_path, f"capture_{self._capture_slot}.jpg")
+                self._capture_slot = (self._capture_slot + 1) % self.CAPTURE_SLOTS
                 
                 # Create session if needed
                 if self.session is None:
                     self.session = ScanSession()
                 
-                # Detect document and go to crop screen
-                self._process_capture(capture_path)
+                self._capturing = True
+                threading.Thread(
+                    target=self._save_capture,
+                    args=(pixels, size, capture_path),
+                    daemon=True
+                ).start()
         except Exception as e:
-            Logger.error(f"Scanner: Capture failed: {e}")
-            self.message_label.text = f"Capture failed: {e}"
-            Clock.schedule_once(lambda dt: setattr(self.message_label, 'text', ''), 3)
+            self._on_capture_failed(e)
     
-    def _process_capture(self, image_path: str):
+    def _save_capture(self, pixels: bytes, size: Tuple[int, int], capture_path: str):
+        """Encode a captured frame to JPEG and detect the document (worker thread)."""
+        try:
+            from PIL import Image as PILImage
+            
+            img = PILImage.frombytes('RGBA', size, pixels)
+            # GL readback rows run bottom-up
+            img = img.transpose(PILImage.Transpose.FLIP_TOP_BOTTOM).convert('RGB')
+            img.save(capture_path, 'JPEG', quality=90)
+            
+            # Detect on the in-memory frame instead of re-reading the file
+            if self.pipeline:
+                quad = self.pipeline.detect_document_from_image(img)
+            else:
+                quad = QuadResult(detected=False)
+        except Exception as e:
+            Clock.schedule_once(lambda dt, err=e: self._on_capture_failed(err), 0)
+            return
+        
+        Clock.schedule_once(lambda dt: self._process_capture(capture_path, quad), 0)
+    
+    def _on_capture_failed(self, error: Exception):
+        self._capturing = False
+        Logger.error(f"Scanner: Capture failed: {error}")
+        self.message_label.text = f"Capture failed: {error}"
+        Clock.schedule_once(lambda dt: setattr(self.message_label, 'text', ''), 3)
+    
+    def _process_capture(self, image_path: str, quad: Optional[QuadResult] = None):
         """Process captured image and navigate to crop screen."""
+        self._capturing = False
+        
         # Detect document quad
-        if self.pipeline:
-            quad = self.pipeline.detect_document(image_path)
-        else:
-            quad = QuadResult(detected=False)
+        if quad is None:
+            if self.pipeline:
+                quad = self.pipeline.detect_document(image_path)
+            else:
+                quad = QuadResult(detected=False)
         
         # Store for crop screen
         self.manager.get_screen('crop_adjust').set_image(
@@ -466,14 +632,12 @@ class ScannerScreen(Screen):
     
     def _update_page_count(self):
         """Update page counter display."""
-        if self.session:
-            self.page_counter.current = len(self.session.pages) - 1 if self.session.pages else 0
-            self.page_counter.total = len(self.session.pages)
-            self.done_btn.disabled = len(self.session.pages) == 0
-        else:
-            self.page_counter.current = 0
-            self.page_counter.total = 0
-            self.done_btn.disabled = True
+        if not self._built:
+            return
+        count = len(self.session.pages) if self.session else 0
+        self.page_counter.current = count - 1 if count else 0
+        self.page_counter.total = count
+        self.done_btn.disabled = count == 0
     
     def add_page(self, page: Page):
         """Add a processed page to the session."""
@@ -496,8 +660,7 @@ class ScannerScreen(Screen):
         if self.session and self.session.pages:
             app = App.get_running_app()
             if app and app.session_store:
-                app.session_store.save_session(self.session)
-                Logger.info("Scanner: Session saved")
+                app.session_store.save_session_async(self.session)
     
     def clear_session(self):
         """Clear the current session."""
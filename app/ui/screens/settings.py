@@ -6,14 +6,37 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.label import Label
-from kivy.uix.widget import Widget
 from kivy.graphics import Color, Rectangle
 from kivy.clock import Clock
 from kivy.logger import Logger
 from kivy.app import App
 
 from app.ui.theme import get_theme
-from app.ui.widgets import RoundedButton
+from app.ui.widgets import RoundedButton, sync_text_width
+
+
+def _set_if_changed(widget, attr: str, value):
+    """Assign a widget property only when the value differs (colors compare by items)."""
+    current = getattr(widget, attr)
+    if isinstance(value, tuple):
+        current = tuple(current)
+    if current != value:
+        setattr(widget, attr, value)
+
+
+def _fit_height(layout):
+    """
+    Size a vertical BoxLayout to its fixed-height children once.
+    
+    Settings sections never change shape after they are built, so this
+    replaces a minimum_height -> height binding.
+    """
+    children = layout.children
+    layout.height = (
+        sum(child.height for child in children)
+        + layout.spacing * max(len(children) - 1, 0)
+        + layout.padding[1] + layout.padding[3]
+    )
 
 
 class SettingsScreen(Screen):
@@ -22,17 +45,31 @@ class SettingsScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.theme = get_theme()
-        self._build_ui()
+        # App services, cached while the screen is shown
+        self._app = None
+        self._ads = None
+        self._state_repo = None
+        # Widget tree is built on first entry (see _ensure_ui)
+        self._built = False
+    
+    def _ensure_ui(self):
+        """Build the widget tree once, on first use."""
+        if not self._built:
+            self._built = True
+            self._build_ui()
     
     def _build_ui(self):
         """Build the settings screen UI."""
+        gc = self.theme.get_color
         root = BoxLayout(orientation='vertical', padding=16, spacing=0)
         
         # Background
         with root.canvas.before:
-            Color(*self.theme.get_color('background'))
+            Color(*gc('background'))
             self.bg_rect = Rectangle()
-        root.bind(pos=self._update_bg, size=self._update_bg)
+        self._bg_trigger = Clock.create_trigger(self._update_bg, -1)
+        root.fbind('pos', self._bg_trigger)
+        root.fbind('size', self._bg_trigger)
         
         # Header
         header = BoxLayout(size_hint_y=None, height=56, spacing=8)
@@ -43,18 +80,18 @@ class SettingsScreen(Screen):
             size_hint=(None, None),
             size=(48, 48)
         )
-        back_btn.bind(on_release=self._on_back)
+        back_btn.fbind('on_release', self._on_back)
         header.add_widget(back_btn)
         
         title = Label(
             text='Settings',
             font_size='22sp',
-            color=self.theme.get_color('on_surface'),
+            color=gc('on_surface'),
             halign='left',
             valign='middle',
             bold=True
         )
-        title.bind(size=lambda *x: setattr(title, 'text_size', (title.width, None)))
+        title.fbind('width', sync_text_width, title)
         header.add_widget(title)
         
         root.add_widget(header)
@@ -68,7 +105,6 @@ class SettingsScreen(Screen):
             padding=[0, 24],
             size_hint_y=None
         )
-        content.bind(minimum_height=content.setter('height'))
         
         # Remove Ads section
         ads_section = self._create_section(
@@ -79,12 +115,12 @@ class SettingsScreen(Screen):
         self.ads_status = Label(
             text='Loading...',
             font_size='14sp',
-            color=self.theme.get_color('on_surface_variant'),
+            color=gc('on_surface_variant'),
             halign='left',
             size_hint_y=None,
             height=24
         )
-        self.ads_status.bind(size=lambda *x: setattr(self.ads_status, 'text_size', (self.ads_status.width, None)))
+        self.ads_status.fbind('width', sync_text_width, self.ads_status)
         ads_section.add_widget(self.ads_status)
         
         ads_buttons = BoxLayout(size_hint_y=None, height=48, spacing=12)
@@ -93,7 +129,7 @@ class SettingsScreen(Screen):
             text='Purchase Remove Ads',
             variant='primary'
         )
-        self.purchase_btn.bind(on_release=self._on_purchase)
+        self.purchase_btn.fbind('on_release', self._on_purchase)
         ads_buttons.add_widget(self.purchase_btn)
         
         self.restore_btn = RoundedButton(
@@ -101,10 +137,11 @@ class SettingsScreen(Screen):
             variant='outline',
             size_hint_x=0.4
         )
-        self.restore_btn.bind(on_release=self._on_restore)
+        self.restore_btn.fbind('on_release', self._on_restore)
         ads_buttons.add_widget(self.restore_btn)
         
         ads_section.add_widget(ads_buttons)
+        _fit_height(ads_section)
         content.add_widget(ads_section)
         
         # Max pages setting
@@ -116,14 +153,15 @@ class SettingsScreen(Screen):
         self.pages_label = Label(
             text='200 pages',
             font_size='16sp',
-            color=self.theme.get_color('on_surface'),
+            color=gc('on_surface'),
             halign='left',
             size_hint_y=None,
             height=30
         )
-        self.pages_label.bind(size=lambda *x: setattr(self.pages_label, 'text_size', (self.pages_label.width, None)))
+        self.pages_label.fbind('width', sync_text_width, self.pages_label)
         pages_section.add_widget(self.pages_label)
         
+        _fit_height(pages_section)
         content.add_widget(pages_section)
         
         # Privacy policy
@@ -138,9 +176,10 @@ class SettingsScreen(Screen):
             size_hint_y=None,
             height=48
         )
-        privacy_btn.bind(on_release=self._on_privacy)
+        privacy_btn.fbind('on_release', self._on_privacy)
         privacy_section.add_widget(privacy_btn)
         
+        _fit_height(privacy_section)
         content.add_widget(privacy_section)
         
         # About section
@@ -152,18 +191,18 @@ class SettingsScreen(Screen):
         version_label = Label(
             text='PDF Scanner v1.0.0',
             font_size='14sp',
-            color=self.theme.get_color('on_surface_variant'),
+            color=gc('on_surface_variant'),
             halign='left',
             size_hint_y=None,
             height=24
         )
-        version_label.bind(size=lambda *x: setattr(version_label, 'text_size', (version_label.width, None)))
+        version_label.fbind('width', sync_text_width, version_label)
         about_section.add_widget(version_label)
         
+        _fit_height(about_section)
         content.add_widget(about_section)
         
-        content.add_widget(Widget())  # Spacer
-        
+        _fit_height(content)
         content_scroll.add_widget(content)
         root.add_widget(content_scroll)
         
@@ -177,7 +216,6 @@ class SettingsScreen(Screen):
             spacing=8,
             size_hint_y=None
         )
-        section.bind(minimum_height=section.setter('height'))
         
         title_label = Label(
             text=title,
@@ -188,7 +226,7 @@ class SettingsScreen(Screen):
             size_hint_y=None,
             height=28
         )
-        title_label.bind(size=lambda *x: setattr(title_label, 'text_size', (title_label.width, None)))
+        title_label.fbind('width', sync_text_width, title_label)
         section.add_widget(title_label)
         
         if description:
@@ -200,7 +238,7 @@ class SettingsScreen(Screen):
                 size_hint_y=None,
                 height=40
             )
-            desc_label.bind(size=lambda *x: setattr(desc_label, 'text_size', (desc_label.width, None)))
+            desc_label.fbind('width', sync_text_width, desc_label)
             section.add_widget(desc_label)
         
         return section
@@ -209,6 +247,17 @@ class SettingsScreen(Screen):
         self.bg_rect.pos = self.root_layout.pos
         self.bg_rect.size = self.root_layout.size
     
+    def on_pre_enter(self, *args):
+        """Build the UI if needed and cache the app services used by the handlers."""
+        self._ensure_ui()
+        self._app = App.get_running_app()
+        self._ads = self._app.ads_manager if self._app else None
+        self._state_repo = self._app.app_state_repo if self._app else None
+    
+    def on_leave(self, *args):
+        """Drop cached app services."""
+        self._app = self._ads = self._state_repo = None
+    
     def on_enter(self):
         """Called when screen is shown."""
         self._update_ads_status()
@@ -216,61 +265,59 @@ class SettingsScreen(Screen):
     
     def _update_ads_status(self):
         """Update the ads status display."""
-        app = App.get_running_app()
+        ads = self._ads
         
-        if app and app.ads_manager:
-            if app.ads_manager.app_state.ads_removed_purchased:
-                self.ads_status.text = "✓ Ads removed - Thank you!"
-                self.ads_status.color = self.theme.get_color('success')
+        if ads:
+            if ads.app_state.ads_removed_purchased:
+                _set_if_changed(self.ads_status, 'text', "✓ Ads removed - Thank you!")
+                _set_if_changed(self.ads_status, 'color', self.theme.get_color('success'))
                 self.purchase_btn.disabled = True
-                self.purchase_btn.text = "Purchased"
+                _set_if_changed(self.purchase_btn, 'text', "Purchased")
             else:
-                self.ads_status.text = "Ads are currently enabled"
-                self.ads_status.color = self.theme.get_color('on_surface_variant')
+                _set_if_changed(self.ads_status, 'text', "Ads are currently enabled")
+                _set_if_changed(self.ads_status, 'color', self.theme.get_color('on_surface_variant'))
                 self.purchase_btn.disabled = False
-                self.purchase_btn.text = "Purchase Remove Ads"
+                _set_if_changed(self.purchase_btn, 'text', "Purchase Remove Ads")
         else:
-            self.ads_status.text = "Billing unavailable"
+            _set_if_changed(self.ads_status, 'text', "Billing unavailable")
     
     def _update_pages_setting(self):
         """Update max pages display."""
-        app = App.get_running_app()
-        
-        if app and app.app_state_repo:
-            state = app.app_state_repo.get_app_state()
+        if self._state_repo:
+            state = self._state_repo.get_app_state()
             if state:
-                self.pages_label.text = f"{state.max_pages_per_document} pages"
+                _set_if_changed(self.pages_label, 'text', f"{state.max_pages_per_document} pages")
     
     def _on_purchase(self, *args):
         """Handle Remove Ads purchase."""
-        app = App.get_running_app()
+        ads = self._ads
         
-        if not app or not app.ads_manager:
+        if not ads:
             return
         
         self.purchase_btn.disabled = True
-        self.purchase_btn.text = "Processing..."
+        _set_if_changed(self.purchase_btn, 'text', "Processing...")
         
         def on_result(success: bool, message: str):
             if success:
-                self.ads_status.text = "✓ Purchase successful! Ads removed."
-                self.ads_status.color = self.theme.get_color('success')
-                self.purchase_btn.text = "Purchased"
+                _set_if_changed(self.ads_status, 'text', "✓ Purchase successful! Ads removed.")
+                _set_if_changed(self.ads_status, 'color', self.theme.get_color('success'))
+                _set_if_changed(self.purchase_btn, 'text', "Purchased")
                 Logger.info("Settings: Purchase successful")
             else:
-                self.ads_status.text = f"Purchase failed: {message}"
-                self.ads_status.color = self.theme.get_color('error')
+                _set_if_changed(self.ads_status, 'text', f"Purchase failed: {message}")
+                _set_if_changed(self.ads_status, 'color', self.theme.get_color('error'))
                 self.purchase_btn.disabled = False
-                self.purchase_btn.text = "Purchase Remove Ads"
+                _set_if_changed(self.purchase_btn, 'text', "Purchase Remove Ads")
                 Logger.error(f"Settings: Purchase failed: {message}")
         
-        app.ads_manager.purchase_remove_ads(on_result)
+        ads.purchase_remove_ads(on_result)
     
     def _on_restore(self, *args):
         """Handle restore purchases."""
-        app = App.get_running_app()
+        ads = self._ads
         
-        if not app or not app.ads_manager:
+        if not ads:
             return
         
         self.restore_btn.disabled = True
@@ -281,17 +328,17 @@ class SettingsScreen(Screen):
             self.restore_btn.text = "Restore"
             
             if success:
-                self.ads_status.text = "✓ Purchases restored! Ads removed."
-                self.ads_status.color = self.theme.get_color('success')
+                _set_if_changed(self.ads_status, 'text', "✓ Purchases restored! Ads removed.")
+                _set_if_changed(self.ads_status, 'color', self.theme.get_color('success'))
                 self.purchase_btn.disabled = True
-                self.purchase_btn.text = "Purchased"
+                _set_if_changed(self.purchase_btn, 'text', "Purchased")
                 Logger.info("Settings: Restore successful")
             else:
-                self.ads_status.text = message
-                self.ads_status.color = self.theme.get_color('on_surface_variant')
+                _set_if_changed(self.ads_status, 'text', message)
+                _set_if_changed(self.ads_status, 'color', self.theme.get_color('on_surface_variant'))
                 Logger.info(f"Settings: Restore result: {message}")
         
-        app.ads_manager.restore_purchases(on_result)
+        ads.restore_purchases(on_result)
     
     def _on_privacy(self, *args):
         """Open privacy policy."""
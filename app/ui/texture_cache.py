@@ -0,0 +1,116 @@
+"""
+Texture cache for PDF Scanner App.
+Downscaled page textures shared across screens, bounded by GPU bytes.
+"""
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+from kivy.graphics.texture import Texture
+from kivy.logger import Logger
+
+# Longest side of cached preview textures; larger than any phone preview
+MAX_LONG_SIDE = 1600
+
+# Total RGB bytes kept alive by the cache
+CACHE_BUDGET_BYTES = 64 * 1024 * 1024
+
+# (path, mtime_ns, max_long) -> Texture, most recently used last.
+# Textures are GL objects, so the cache is only touched on the UI thread.
+_textures: "OrderedDict[tuple, Texture]" = OrderedDict()
+_cache_bytes = 0
+
+
+def _cache_key(path: str, max_long: int) -> Optional[tuple]:
+    try:
+        return (path, os.stat(path).st_mtime_ns, max_long)
+    except OSError:
+        return None
+
+
+def _texture_bytes(texture: Texture) -> int:
+    w, h = texture.size
+    return w * h * 3
+
+
+def get_cached_texture(path: str, max_long: int = MAX_LONG_SIDE) -> Optional[Texture]:
+    """
+    Get a cached texture without decoding anything.
+    
+    Args:
+        path: Image file path
+        max_long: Longest side the texture was created with
+    
+    Returns:
+        Texture, or None on a cache miss
+    """
+    key = _cache_key(path, max_long)
+    texture = _textures.get(key) if key else None
+    if texture is not None:
+        _textures.move_to_end(key)
+    return texture
+
+
+def load_pixels(path: str, max_long: int = MAX_LONG_SIDE) -> Optional[Tuple[tuple, tuple, bytes]]:
+    """
+    Decode and downscale an image to RGB bytes. Safe to call from any thread.
+    
+    Args:
+        path: Image file path
+        max_long: Longest side of the result
+    
+    Returns:
+        (original_size, scaled_size, rgb_bytes), or None if unreadable
+    """
+    try:
+        from PIL import Image as PILImage
+        
+        with PILImage.open(path) as img:
+            orig_size = img.size
+            # Let the JPEG decoder skip detail we are going to drop anyway
+            img.draft('RGB', (max_long, max_long))
+            img.thumbnail((max_long, max_long), PILImage.Resampling.BILINEAR)
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            return orig_size, img.size, img.tobytes()
+    except (ImportError, OSError) as e:
+        Logger.warning(f"TextureCache: Could not load {path}: {e}")
+        return None
+
+
+def texture_from_pixels(path: str, size: tuple, data: bytes,
+                        max_long: int = MAX_LONG_SIDE) -> Texture:
+    """
+    Upload RGB bytes from load_pixels and cache the texture. UI thread only.
+    
+    Args:
+        path: Image file path the pixels came from
+        size: Pixel size of data
+        data: Packed RGB bytes, top row first
+        max_long: Longest side passed to load_pixels
+    
+    Returns:
+        Texture
+    """
+    global _cache_bytes
+    
+    texture = Texture.create(size=size, colorfmt='rgb')
+    texture.blit_buffer(data, colorfmt='rgb', bufferfmt='ubyte')
+    # PIL rows run top-down, GL rows bottom-up
+    texture.flip_vertical()
+    
+    key = _cache_key(path, max_long)
+    if key is None:
+        return texture
+    
+    old = _textures.pop(key, None)
+    if old is not None:
+        _cache_bytes -= _texture_bytes(old)
+    _textures[key] = texture
+    _cache_bytes += _texture_bytes(texture)
+    
+    # Evict least recently used until back under budget (keep the newest)
+    while _cache_bytes > CACHE_BUDGET_BYTES and len(_textures) > 1:
+        _, evicted = _textures.popitem(last=False)
+        _cache_bytes -= _texture_bytes(evicted)
+    
+    return texture
@@ -2,6 +2,7 @@
 Theme and styling for PDF Scanner App.
 Material Design 3 inspired theme system.
 """
+from types import MappingProxyType
 from kivy.utils import get_color_from_hex
 
 
@@ -13,14 +14,29 @@ class Theme:
     
     def __init__(self, dark_mode: bool = False):
         self.dark_mode = dark_mode
+        # Both palettes are parsed once; switching modes swaps references
+        self._palettes = {
+            False: self._make_palette(dark=False),
+            True: self._make_palette(dark=True),
+        }
         self._init_colors()
         self._init_typography()
         self._init_spacing()
     
     def _init_colors(self):
-        """Initialize color palette."""
-        if self.dark_mode:
-            self.colors = {
+        """Select the color palette for the current mode."""
+        self.colors, self._color_tuples = self._palettes[self.dark_mode]
+    
+    def _make_palette(self, dark: bool) -> tuple:
+        """
+        Build a read-only color palette.
+        
+        Returns:
+            (colors, color_tuples): name -> RGBA list, and name -> RGBA tuple
+            as handed out by get_color
+        """
+        if dark:
+            colors = {
                 # Primary colors
                 'primary': get_color_from_hex('#6750A4'),
                 'primary_container': get_color_from_hex('#EADDFF'),
@@ -50,7 +66,7 @@ class Theme:
                 'corner_handle': get_color_from_hex('#6750A4'),
             }
         else:
-            self.colors = {
+            colors = {
                 # Primary colors (Purple)
                 'primary': get_color_from_hex('#6750A4'),
                 'primary_container': get_color_from_hex('#EADDFF'),
@@ -79,6 +95,10 @@ class Theme:
                 'capture_button': get_color_from_hex('#FFFFFF'),
                 'corner_handle': get_color_from_hex('#6750A4'),
             }
+        
+        # get_color hands out tuples, so callers can't alias/mutate the palette
+        color_tuples = {k: tuple(v) for k, v in colors.items()}
+        return MappingProxyType(colors), MappingProxyType(color_tuples)
     
     def _init_typography(self):
         """Initialize typography settings."""
@@ -123,9 +143,9 @@ class Theme:
             'full': 9999,
         }
     
-    def get_color(self, name: str) -> list:
-        """Get a color by name."""
-        return self.colors.get(name, [1, 1, 1, 1])
+    def get_color(self, name: str) -> tuple:
+        """Get a color by name (shared immutable tuple)."""
+        return self._color_tuples.get(name, (1, 1, 1, 1))
     
     def toggle_dark_mode(self):
         """Toggle between light and dark mode."""
@@ -2,20 +2,31 @@
 Custom widgets for PDF Scanner App.
 Reusable UI components.
 """
+import os
 from kivy.uix.button import Button
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.uix.widget import Widget
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.graphics import Color, RoundedRectangle, Ellipse, Line
 from kivy.properties import (
     StringProperty, ListProperty, NumericProperty, 
     BooleanProperty, ObjectProperty
 )
-from kivy.animation import Animation
+from kivy.clock import Clock
 
-from .theme import get_theme
+from app.ui.theme import get_theme
+
+# The theme is a process-wide singleton updated in place (dark mode toggles
+# swap its palette), so one module-level reference serves every widget
+_theme = get_theme()
+
+
+def sync_text_width(label, *args):
+    """Wrap a label's text to its width; shared size handler for fbind."""
+    label.text_size = (label.width, None)
 
 
 class RoundedButton(Button):
@@ -27,39 +38,53 @@ class RoundedButton(Button):
     
     def __init__(self, variant='primary', **kwargs):
         super().__init__(**kwargs)
-        theme = get_theme()
+        gc = _theme.get_color
         
         if variant == 'primary':
-            self.bg_color = theme.get_color('primary')
-            self.text_color = theme.get_color('on_primary')
+            self.bg_color = gc('primary')
+            self.text_color = gc('on_primary')
         elif variant == 'secondary':
-            self.bg_color = theme.get_color('secondary_container')
-            self.text_color = theme.get_color('on_surface')
+            self.bg_color = gc('secondary_container')
+            self.text_color = gc('on_surface')
         elif variant == 'outline':
             self.bg_color = [0, 0, 0, 0]
-            self.text_color = theme.get_color('primary')
+            self.text_color = gc('primary')
         
         self.color = self.text_color
         self.background_color = [0, 0, 0, 0]
         self.background_normal = ''
         
-        self.bind(size=self._update_canvas, pos=self._update_canvas)
-        self._update_canvas()
-    
-    def _update_canvas(self, *args):
+        # Replace Button's own background with one persistent rounded rect
         self.canvas.before.clear()
         with self.canvas.before:
-            Color(*self.bg_color)
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[self.radius])
+            self._bg_color_instr = Color(*self.bg_color)
+            self._bg_rect_instr = RoundedRectangle(
+                pos=self.pos, size=self.size, radius=[self.radius]
+            )
+        self.fbind('size', self._update_canvas)
+        self.fbind('pos', self._update_canvas)
+        self.fbind('bg_color', self._update_bg_color)
+        self.fbind('radius', self._update_radius)
+    
+    def _update_canvas(self, *args):
+        self._bg_rect_instr.pos = self.pos
+        self._bg_rect_instr.size = self.size
+    
+    def _update_bg_color(self, *args):
+        self._bg_color_instr.rgba = self.bg_color
+    
+    def _update_radius(self, *args):
+        self._bg_rect_instr.radius = [self.radius]
     
     def on_press(self):
-        # Subtle press animation
-        anim = Animation(opacity=0.7, duration=0.05)
-        anim.start(self)
+        # Subtle press feedback; plain opacity steps, no Animation per tap
+        self.opacity = 0.7
     
     def on_release(self):
-        anim = Animation(opacity=1.0, duration=0.1)
-        anim.start(self)
+        Clock.schedule_once(self._restore_opacity, 0.05)
+    
+    def _restore_opacity(self, dt):
+        self.opacity = 1.0
 
 
 class DocumentCard(BoxLayout):
@@ -71,6 +96,8 @@ class DocumentCard(BoxLayout):
     doc_size = StringProperty('')
     thumbnail_path = StringProperty('')
     
+    _SIZE_UNITS = ('B', 'KB', 'MB')
+    
     def __init__(self, document=None, on_tap=None, on_long_press=None, **kwargs):
         kwargs.setdefault('orientation', 'horizontal')
         kwargs.setdefault('size_hint_y', None)
@@ -79,52 +106,90 @@ class DocumentCard(BoxLayout):
         kwargs.setdefault('spacing', 12)
         super().__init__(**kwargs)
         
-        self.document = document
+        self.document = None
         self.on_tap_callback = on_tap
         self.on_long_press_callback = on_long_press
         
-        if document:
-            self.doc_name = document.name
-            self.doc_date = document.created_at.strftime('%b %d, %Y')
-            self.doc_pages = document.page_count
-            self.doc_size = self._format_size(document.file_size)
-            self.thumbnail_path = document.thumbnail_path
-        
         self._build_ui()
-        self.bind(size=self._update_bg, pos=self._update_bg)
-        self._update_bg()
+        self.set_document(document)
+        
+        with self.canvas.before:
+            Color(*_theme.get_color('surface_variant'))
+            self._bg_rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[12])
+        # pos and size often change together; update once before the next frame
+        self._bg_trigger = Clock.create_trigger(self._update_bg, -1)
+        self.fbind('size', self._bg_trigger)
+        self.fbind('pos', self._bg_trigger)
+    
+    def set_document(self, document):
+        """Show a document in this card (cards are reused by RecycleView)."""
+        if document is not None and document is self.document:
+            # Same row re-bound while scrolling; labels are already current
+            return
+        self.document = document
+        if document:
+            self._show(document.name, document.created_at, document.page_count,
+                       document.file_size, document.thumbnail_path)
+        else:
+            self._refresh_labels()
+    
+    def _show(self, name, created_at, page_count, file_size, thumbnail_path):
+        self.doc_name = name
+        self.doc_date = created_at.strftime('%b %d, %Y') if created_at else ''
+        self.doc_pages = page_count
+        self.doc_size = self._format_size(file_size)
+        self.thumbnail_path = thumbnail_path or ''
+        self._refresh_labels()
+        self._refresh_thumbnail()
+    
+    def _refresh_labels(self):
+        self.name_label.text = self.doc_name
+        self.meta_label.text = f"{self.doc_pages} pages • {self.doc_size} • {self.doc_date}"
+    
+    def _refresh_thumbnail(self):
+        path = self.thumbnail_path
+        if path and os.path.exists(path):
+            self.thumb_image.source = path
+            self.thumb_image.opacity = 1
+        else:
+            self.thumb_image.source = ''
+            self.thumb_image.opacity = 0
     
     def _build_ui(self):
-        theme = get_theme()
+        gc = _theme.get_color
         
-        # Thumbnail
-        thumb_container = Widget(size_hint=(None, None), size=(60, 60))
-        self.add_widget(thumb_container)
+        # Thumbnail: small pre-generated JPEG, textures shared via Kivy's cache
+        self.thumb_image = Image(
+            size_hint=(None, None), size=(60, 60),
+            nocache=False, mipmap=False, keep_ratio=True, allow_stretch=True,
+            opacity=0
+        )
+        self.add_widget(self.thumb_image)
         
         # Info section
         info_box = BoxLayout(orientation='vertical', spacing=4)
         
-        name_label = Label(
+        self.name_label = name_label = Label(
             text=self.doc_name,
             font_size='16sp',
-            color=theme.get_color('on_surface'),
+            color=gc('on_surface'),
             halign='left',
             valign='middle',
             size_hint_y=None,
             height=24
         )
-        name_label.bind(size=lambda *x: setattr(name_label, 'text_size', (name_label.width, None)))
+        name_label.fbind('width', sync_text_width, name_label)
         
-        meta_label = Label(
+        self.meta_label = meta_label = Label(
             text=f"{self.doc_pages} pages • {self.doc_size} • {self.doc_date}",
             font_size='12sp',
-            color=theme.get_color('on_surface_variant'),
+            color=gc('on_surface_variant'),
             halign='left',
             valign='top',
             size_hint_y=None,
             height=20
         )
-        meta_label.bind(size=lambda *x: setattr(meta_label, 'text_size', (meta_label.width, None)))
+        meta_label.fbind('width', sync_text_width, meta_label)
         
         info_box.add_widget(name_label)
         info_box.add_widget(meta_label)
@@ -133,19 +198,16 @@ class DocumentCard(BoxLayout):
         self.add_widget(info_box)
     
     def _update_bg(self, *args):
-        theme = get_theme()
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(*theme.get_color('surface_variant'))
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[12])
+        # Recycled cards move on every scroll frame; update, don't rebuild
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
     
     def _format_size(self, size_bytes: int) -> str:
-        if size_bytes < 1024:
+        # Each unit is 2**10 of the previous one, so bit_length picks it
+        unit = min((size_bytes.bit_length() - 1) // 10, 2) if size_bytes > 0 else 0
+        if not unit:
             return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        else:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
+        return f"{size_bytes / (1 << (10 * unit)):.1f} {self._SIZE_UNITS[unit]}"
     
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
@@ -163,40 +225,73 @@ class DocumentCard(BoxLayout):
         return super().on_touch_up(touch)
 
 
+class DocumentCardView(RecycleDataViewBehavior, DocumentCard):
+    """DocumentCard used as a RecycleView row.
+    
+    Data items are the dicts from DocumentRepository.get_recent_view_dicts;
+    the row dict itself is passed to the tap callbacks, which are read from
+    the RecycleView's on_tap_callback / on_long_press_callback attributes.
+    """
+    
+    def refresh_view_attrs(self, rv, index, data):
+        self.index = index
+        self.on_tap_callback = getattr(rv, 'on_tap_callback', None)
+        self.on_long_press_callback = getattr(rv, 'on_long_press_callback', None)
+        if data is not self.document:
+            self.document = data
+            self._show(data['name'], data['created_at'], data['page_count'],
+                       data['file_size'], data['thumbnail_path'])
+        return super().refresh_view_attrs(rv, index, {})
+
+
 class CornerHandle(Widget):
     """Draggable corner handle for manual crop adjustment."""
     
+    __events__ = ('on_corner_move',)
+    
     corner_index = NumericProperty(0)  # 0=TL, 1=TR, 2=BR, 3=BL
     handle_color = ListProperty([0.4, 0.2, 0.8, 1])
     handle_radius = NumericProperty(20)
     
+    # Width of the colored ring around the white center
+    INNER_MARGIN = 6
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.size_hint = (None, None)
         self.size = (self.handle_radius * 2, self.handle_radius * 2)
         
-        theme = get_theme()
-        self.handle_color = theme.get_color('corner_handle')
+        self.handle_color = _theme.get_color('corner_handle')
         
-        self.bind(pos=self._update_canvas, size=self._update_canvas)
-        self._update_canvas()
-    
-    def _update_canvas(self, *args):
-        self.canvas.clear()
         with self.canvas:
             # Outer circle
-            Color(*self.handle_color)
-            Ellipse(
-                pos=self.pos, 
-                size=self.size
-            )
+            self._outer_color = Color(*self.handle_color)
+            self._outer = Ellipse()
             # Inner circle (white)
             Color(1, 1, 1, 1)
-            inner_margin = 6
-            Ellipse(
-                pos=(self.x + inner_margin, self.y + inner_margin),
-                size=(self.width - inner_margin * 2, self.height - inner_margin * 2)
-            )
+            self._inner = Ellipse()
+        
+        self.fbind('pos', self._update_canvas)
+        self.fbind('size', self._update_canvas)
+        self.fbind('handle_color', self._update_handle_color)
+        self._update_canvas()
+        
+        # Touch moves arrive faster than frames; dispatch at most once per frame
+        self._move_trigger = Clock.create_trigger(self._dispatch_move, -1)
+        self._last_dispatched = None
+    
+    def _update_canvas(self, *args):
+        # Handles move on every drag event; only reposition the ellipses
+        m = self.INNER_MARGIN
+        x, y = self.pos
+        w, h = self.size
+        self._outer.pos = (x, y)
+        self._outer.size = (w, h)
+        self._inner.pos = (x + m, y + m)
+        self._inner.size = (w - 2 * m, h - 2 * m)
+    
+    def _update_handle_color(self, *args):
+        self._outer_color.rgba = self.handle_color
     
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
@@ -207,8 +302,7 @@ class CornerHandle(Widget):
     def on_touch_move(self, touch):
         if touch.grab_current is self:
             self.center = touch.pos
-            # Dispatch custom event for parent to update quad
-            self.dispatch('on_corner_move')
+            self._move_trigger()
             return True
         return super().on_touch_move(touch)
     
@@ -218,15 +312,18 @@ class CornerHandle(Widget):
             return True
         return super().on_touch_up(touch)
     
+    def _dispatch_move(self, *args):
+        # Dispatch custom event for parent to update quad
+        center = tuple(self.center)
+        if center != self._last_dispatched:
+            self._last_dispatched = center
+            self.dispatch('on_corner_move')
+    
     def on_corner_move(self):
         """Called when corner is moved."""
         pass
 
 
-# Register events
-CornerHandle.register_event_type('on_corner_move')
-
-
 class FilterChip(BoxLayout):
     """Filter selection chip for image filters."""
     
@@ -248,13 +345,15 @@ class FilterChip(BoxLayout):
         if filter_type:
             self.filter_name = filter_type.value.replace('_', ' ').title()
         
+        # Background instructions are created on first draw, then updated
+        self._bg_rect = None
+        self._last_bg_state = None
+        self._bg_trigger = Clock.create_trigger(self._update_bg, -1)
         self._build_ui()
-        self.bind(is_selected=self._update_selection)
+        self.fbind('is_selected', self._update_selection)
         self._update_bg()
     
     def _build_ui(self):
-        theme = get_theme()
-        
         # Preview area
         preview_container = Widget(size_hint=(1, None), height=60)
         self.add_widget(preview_container)
@@ -263,32 +362,42 @@ class FilterChip(BoxLayout):
         label = Label(
             text=self.filter_name,
             font_size='11sp',
-            color=theme.get_color('on_surface'),
+            color=_theme.get_color('on_surface'),
             size_hint_y=None,
             height=20
         )
         self.add_widget(label)
         
-        self.bind(pos=self._update_bg, size=self._update_bg)
+        self.fbind('pos', self._bg_trigger)
+        self.fbind('size', self._bg_trigger)
     
     def _update_bg(self, *args):
-        theme = get_theme()
-        bg_color = theme.get_color('primary_container') if self.is_selected else theme.get_color('surface_variant')
+        state = (self.is_selected, tuple(self.pos), tuple(self.size))
+        if state == self._last_bg_state:
+            return
+        self._last_bg_state = state
         
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(*bg_color)
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[8])
-            
-            if self.is_selected:
-                Color(*theme.get_color('primary'))
-                Line(
-                    rounded_rectangle=(self.x, self.y, self.width, self.height, 8),
-                    width=2
-                )
+        if self._bg_rect is None:
+            with self.canvas.before:
+                self._bg_color_instr = Color()
+                self._bg_rect = RoundedRectangle(radius=[8])
+                self._border_color_instr = Color()
+                self._border = Line(width=2)
+        
+        if self.is_selected:
+            self._bg_color_instr.rgba = _theme.get_color('primary_container')
+            self._border_color_instr.rgba = _theme.get_color('primary')
+        else:
+            self._bg_color_instr.rgba = _theme.get_color('surface_variant')
+            # Border stays in the canvas, just transparent
+            self._border_color_instr.a = 0
+        
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
+        self._border.rounded_rectangle = (self.x, self.y, self.width, self.height, 8)
     
     def _update_selection(self, *args):
-        self._update_bg()
+        self._bg_trigger()
     
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
@@ -308,13 +417,17 @@ class PageCounter(Label):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.font_size = '14sp'
-        theme = get_theme()
-        self.color = theme.get_color('on_surface')
-        self.bind(current=self._update_text, total=self._update_text)
+        self.color = _theme.get_color('on_surface')
+        # current and total usually change together; format once per frame
+        self._text_trigger = Clock.create_trigger(self._update_text, -1)
+        self.fbind('current', self._text_trigger)
+        self.fbind('total', self._text_trigger)
         self._update_text()
     
     def _update_text(self, *args):
-        self.text = f"Page {self.current + 1}" if self.total == 0 else f"{self.current + 1}/{self.total}"
+        text = f"Page {self.current + 1}" if self.total == 0 else f"{self.current + 1}/{self.total}"
+        if text != self.text:
+            self.text = text
 
 
 class LoadingSpinner(Widget):
@@ -323,40 +436,44 @@ class LoadingSpinner(Widget):
     spinning = BooleanProperty(True)
     color = ListProperty([0.4, 0.2, 0.8, 1])
     
+    # Redraw rate; a 15 px arc doesn't need every display frame
+    TICK_INTERVAL = 1 / 30.
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.size_hint = (None, None)
         self.size = (40, 40)
         
-        theme = get_theme()
-        self.color = theme.get_color('primary')
+        self.color = _theme.get_color('primary')
         
         self._angle = 0
-        self.bind(spinning=self._on_spinning_change)
-        self._start_animation()
+        self._tick_event = None
+        with self.canvas:
+            self._color_instr = Color(*self.color)
+            # Arc (simplified spinner), rotated in place each tick
+            self._line = Line(width=3)
+        self._update_arc()
+        
+        self.fbind('pos', self._update_arc)
+        self.fbind('size', self._update_arc)
+        self.fbind('color', self._update_color)
+        self.fbind('spinning', self._on_spinning_change)
+        self._on_spinning_change()
     
     def _on_spinning_change(self, *args):
-        if self.spinning:
-            self._start_animation()
-    
-    def _start_animation(self):
-        if self.spinning:
-            anim = Animation(_angle=360, duration=1)
-            anim.bind(on_complete=lambda *x: self._restart_animation())
-            anim.start(self)
-            self._draw()
-    
-    def _restart_animation(self):
-        self._angle = 0
-        if self.spinning:
-            self._start_animation()
-    
-    def _draw(self):
-        self.canvas.clear()
-        with self.canvas:
-            Color(*self.color)
-            # Draw arc (simplified spinner)
-            Line(
-                circle=(self.center_x, self.center_y, 15, self._angle, self._angle + 270),
-                width=3
-            )
+        if self.spinning and self._tick_event is None:
+            self._tick_event = Clock.schedule_interval(self._tick, self.TICK_INTERVAL)
+        elif not self.spinning and self._tick_event is not None:
+            self._tick_event.cancel()
+            self._tick_event = None
+    
+    def _tick(self, dt):
+        # One full turn per second
+        self._angle = (self._angle + 360 * dt) % 360
+        self._update_arc()
+    
+    def _update_arc(self, *args):
+        self._line.circle = (self.center_x, self.center_y, 15, self._angle, self._angle + 270)
+    
+    def _update_color(self, *args):
+        self._color_instr.rgba = self.color
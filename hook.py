@@ -9,59 +9,102 @@ Usage: Set in buildozer.spec:
     p4a.hook = hook.py
 """
 import os
+import re
 import shutil
-import glob
-from os.path import join, exists, dirname, abspath
+from os.path import join, dirname, abspath
 
 
 # Use __file__ for reliable source directory detection
 SOURCE_DIR = dirname(abspath(__file__))
 
 
-def get_template_dir(build_dir):
-    """Find the AndroidManifest template directory in p4a."""
-    candidates = [
-        join(build_dir, 'android', 'platform', 'python-for-android',
-             'pythonforandroid', 'bootstraps', 'sdl2', 'build', 'templates'),
-    ]
+# p4a's sdl2 bootstrap build dir, relative to <build_dir>/android/platform
+_BOOTSTRAP_BUILD = join('python-for-android', 'pythonforandroid',
+                        'bootstraps', 'sdl2', 'build')
+
+# build_dir -> (template_dirs, gradle_files); reset at each hook entry point
+_build_tree_cache = {}
+
+# Work already done in this process, so a second hook call is a lookup:
+#   'manifest': (template_dir, source mtime_ns) pairs already copied
+#   'patched':  gradle path -> file size once it holds our excludes
+_HOOK_STATE = {'manifest': set(), 'patched': {}}
+
+
+def _scan_build_output(path, template_dirs, gradle_files):
+    """Collect the templates dir and build.gradle directly under path."""
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name == 'templates' and entry.is_dir():
+                    template_dirs.append(entry.path)
+                elif entry.name == 'build.gradle' and entry.is_file():
+                    gradle_files.append(entry.path)
+    except OSError:
+        pass
+
+
+def _walk_build(build_dir):
+    """
+    Find p4a template dirs and build.gradle files in one pass.
+    
+    Covers <platform>/build-*/dists/*/ and the sdl2 bootstrap build dir,
+    reading each directory once instead of globbing per pattern.
     
-    for path in candidates:
-        if exists(path):
-            return path
+    Returns:
+        (template_dirs, gradle_files); bootstrap templates come first,
+        bootstrap build.gradle last (the order the old globs used)
+    """
+    cached = _build_tree_cache.get(build_dir)
+    if cached is not None:
+        return cached
+    
+    platform_dir = join(build_dir, 'android', 'platform')
+    dist_templates, dist_gradles = [], []
+    boot_templates, boot_gradles = [], []
     
-    # Try glob patterns for varying build structures
-    patterns = [
-        join(build_dir, 'android', 'platform', 'build-*', 'dists', '*', 'templates'),
-    ]
+    try:
+        with os.scandir(platform_dir) as it:
+            build_dirs = [e.path for e in it
+                          if e.name.startswith('build-') and e.is_dir(follow_symlinks=False)]
+    except OSError:
+        build_dirs = []
     
-    for pattern in patterns:
-        matches = glob.glob(pattern)
-        if matches:
-            return matches[0]
+    for path in build_dirs:
+        try:
+            with os.scandir(join(path, 'dists')) as it:
+                dists = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+        except OSError:
+            continue
+        for dist in dists:
+            _scan_build_output(dist, dist_templates, dist_gradles)
     
-    return None
+    _scan_build_output(join(platform_dir, _BOOTSTRAP_BUILD), boot_templates, boot_gradles)
+    
+    result = (boot_templates + dist_templates, dist_gradles + boot_gradles)
+    _build_tree_cache[build_dir] = result
+    return result
+
+
+def get_template_dir(build_dir):
+    """Find the AndroidManifest template directory in p4a."""
+    template_dirs, _ = _walk_build(build_dir)
+    return template_dirs[0] if template_dirs else None
 
 
 def get_gradle_files(build_dir):
     """Find all build.gradle files in the build output."""
-    patterns = [
-        join(build_dir, 'android', 'platform', 'build-*', 'dists', '*', 'build.gradle'),
-        join(build_dir, 'android', 'platform', 'python-for-android', 
-             'pythonforandroid', 'bootstraps', 'sdl2', 'build', 'build.gradle'),
-    ]
-    
-    results = []
-    for pattern in patterns:
-        results.extend(glob.glob(pattern))
-    
-    return results
+    _, gradle_files = _walk_build(build_dir)
+    return list(gradle_files)
 
 
 def copy_manifest_template(build_dir):
     """Copy our custom manifest template to p4a templates."""
     source = join(SOURCE_DIR, 'android', 'AndroidManifest.tmpl.xml')
     
-    if not exists(source):
+    try:
+        src_mtime = os.stat(source).st_mtime_ns
+    except FileNotFoundError:
         print(f"[hook.py] WARNING: Manifest template not found: {source}")
         return False
     
@@ -70,13 +113,20 @@ def copy_manifest_template(build_dir):
         print("[hook.py] INFO: p4a template directory not found yet (normal on first run)")
         return False
     
+    copied = _HOOK_STATE['manifest']
+    if (template_dir, src_mtime) in copied:
+        print("[hook.py] Manifest template unchanged, skipping copy")
+        return True
+    
     dest = join(template_dir, 'AndroidManifest.tmpl.xml')
     
     print(f"[hook.py] Copying manifest template:")
     print(f"  Source: {source}")
     print(f"  Dest:   {dest}")
     
-    shutil.copy2(source, dest)
+    # Plain content copy; p4a renders this template, its metadata is irrelevant
+    shutil.copyfile(source, dest)
+    copied.add((template_dir, src_mtime))
     return True
 
 
@@ -93,11 +143,21 @@ PACKAGING_OPTIONS = '''    packagingOptions {
     }
 '''
 
+# Gradle files are patched as raw bytes; the block is pure ASCII
+_PACKAGING_OPTIONS_BYTES = PACKAGING_OPTIONS.encode('ascii')
+_PATCH_SENTINEL = b"META-INF/DEPENDENCIES"
+
+# Prefix of build.gradle checked for our excludes before reading the rest
+_GRADLE_HEAD_BYTES = 4096
+
+# The 'android {' line of build.gradle, newline included
+_ANDROID_BLOCK_RE = re.compile(rb'^[ \t]*android\b[^\n]*\{[^\n]*\n', re.M)
+
 
 def patch_gradle_for_pdfbox(build_dir):
     """Add META-INF exclusions to build.gradle for PDFBox compatibility.
     
-    Uses line-based insertion after 'android {' for robustness.
+    Inserts packagingOptions after the 'android {' line.
     Idempotent: skips if our excludes already present.
     """
     gradle_files = get_gradle_files(build_dir)
@@ -107,36 +167,45 @@ def patch_gradle_for_pdfbox(build_dir):
         return False
     
     patched_any = False
+    patched = _HOOK_STATE['patched']
     
     for gradle_file in gradle_files:
-        if not exists(gradle_file):
-            continue
-            
-        with open(gradle_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        content = ''.join(lines)
+        # Our insertion grows the file, so an unchanged size means still patched
+        size = patched.get(gradle_file)
+        if size is not None:
+            try:
+                if os.stat(gradle_file).st_size == size:
+                    continue
+            except FileNotFoundError:
+                continue
         
-        # Check if already patched (idempotent)
-        if "META-INF/DEPENDENCIES" in content:
-            print(f"[hook.py] {gradle_file} already patched, skipping")
+        try:
+            f = open(gradle_file, 'r+b')
+        except FileNotFoundError:
             continue
         
-        # Find 'android {' line and insert packagingOptions after it
-        new_lines = []
-        inserted = False
-        
-        for line in lines:
-            new_lines.append(line)
+        with f:
+            # Check if already patched (idempotent). Our block usually sits
+            # near the top, so look at a prefix before reading the rest.
+            content = f.read(_GRADLE_HEAD_BYTES)
+            if _PATCH_SENTINEL not in content:
+                content += f.read()
+            if _PATCH_SENTINEL in content:
+                print(f"[hook.py] {gradle_file} already patched, skipping")
+                patched[gradle_file] = os.fstat(f.fileno()).st_size
+                continue
             
-            # Insert after 'android {' line
-            if not inserted and line.strip().startswith('android') and '{' in line:
-                new_lines.append(PACKAGING_OPTIONS)
-                inserted = True
+            content, inserted = _ANDROID_BLOCK_RE.subn(
+                lambda m: m.group(0) + _PACKAGING_OPTIONS_BYTES, content, count=1)
+            
+            if inserted:
+                f.seek(0)
+                f.truncate()
+                f.write(content)
+                f.flush()
+                patched[gradle_file] = os.fstat(f.fileno()).st_size
         
         if inserted:
-            with open(gradle_file, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
             print(f"[hook.py] Patched {gradle_file} with packagingOptions")
             patched_any = True
         else:
@@ -149,15 +218,32 @@ def patch_gradle_for_pdfbox(build_dir):
 # Hook entry points called by python-for-android / Buildozer
 # ============================================================
 
+# Set once the manifest is copied and every gradle file is patched, so
+# Buildozer and p4a firing both hook paths do the work only once
+_RAN = [False]
+
+
 def prebuild_android(build_dir):
     """Called before Android build starts (p4a hook)."""
     print("[hook.py] prebuild_android called")
     
+    if _RAN[0]:
+        print("[hook.py] Already applied in this process, skipping")
+        return
+    
+    # The build tree changes between hook calls; walk it fresh once per call
+    _build_tree_cache.pop(build_dir, None)
+    
     # Copy manifest template
-    copy_manifest_template(build_dir)
+    copied = copy_manifest_template(build_dir)
     
     # Patch Gradle BEFORE compilation (critical for PDFBox)
     patch_gradle_for_pdfbox(build_dir)
+    
+    # Before the first build the dist may not exist yet; keep trying then
+    gradle_files = get_gradle_files(build_dir)
+    _RAN[0] = (copied and bool(gradle_files)
+               and all(g in _HOOK_STATE['patched'] for g in gradle_files))
 
 
 def after_apk(build_dir):
@@ -172,16 +258,9 @@ post_build = after_apk
 
 # Buildozer direct hook support
 def before_build():
-    """Buildozer pre-build hook."""
+    """Buildozer pre-build hook; same work as prebuild_android."""
     print("[hook.py] before_build called")
-    
-    build_dir = os.environ.get('BUILDOZER_BUILD_DIR', join(SOURCE_DIR, '.buildozer'))
-    
-    # Copy manifest template
-    copy_manifest_template(build_dir)
-    
-    # Patch Gradle BEFORE compilation
-    patch_gradle_for_pdfbox(build_dir)
+    prebuild_android(os.environ.get('BUILDOZER_BUILD_DIR', join(SOURCE_DIR, '.buildozer')))
 
 
 def after_build():
@@ -4,29 +4,23 @@ Main entry point for the Kivy application.
 """
 import os
 import sys
+import threading
 
 # Set environment variables before importing Kivy
 os.environ['KIVY_LOG_LEVEL'] = 'info'
 os.environ['KIVY_ORIENTATION'] = 'portrait'
 
 from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager, SlideTransition
-from kivy.core.window import Window
 from kivy.clock import Clock
 from kivy.logger import Logger
 from kivy.utils import platform
 
-# App modules
-from app.ui.screens.home import HomeScreen
-from app.ui.screens.scanner import ScannerScreen
-from app.ui.screens.crop_adjust import CropAdjustScreen
-from app.ui.screens.export import ExportScreen
-from app.ui.screens.settings import SettingsScreen
+if platform == 'android':
+    from android.storage import app_storage_path
+
+# App modules (screens, storage and ads are imported where first used
+# so the window appears before the full app graph is loaded)
 from app.ui.theme import Theme
-from app.infra.storage.db import DatabaseManager
-from app.infra.storage.session_store import SessionStore
-from app.infra.storage.repositories import AppStateRepository
-from app.domain.usecases import AdsManager
 
 
 class PDFScannerApp(App):
@@ -40,9 +34,20 @@ class PDFScannerApp(App):
         self.app_state_repo = None
         self.ads_manager = None
         self.screen_manager = None
+        self.scanner_screen = None
+        self._save_session = None
+        self._session_prefetch = None
+        self._pending_session = None
+        self._storage_path = None
+        self._cache_path = None
+        self._docs_path = None
         
     def build(self):
         """Build and return the root widget."""
+        from kivy.core.window import Window
+        from kivy.uix.screenmanager import ScreenManager, SlideTransition
+        from app.ui.screens.home import HomeScreen
+        
         # Set window properties
         Window.clearcolor = self.theme.colors['background']
         
@@ -55,93 +60,142 @@ class PDFScannerApp(App):
         # Create screen manager
         self.screen_manager = ScreenManager(transition=SlideTransition())
         
-        # Add screens
+        # Only home is needed for the first frame; the rest follow next frame
         self.screen_manager.add_widget(HomeScreen(name='home'))
-        self.screen_manager.add_widget(ScannerScreen(name='scanner'))
-        self.screen_manager.add_widget(CropAdjustScreen(name='crop_adjust'))
-        self.screen_manager.add_widget(ExportScreen(name='export'))
-        self.screen_manager.add_widget(SettingsScreen(name='settings'))
+        Clock.schedule_once(self._add_secondary_screens, 0)
         
         # Restore session if needed
         Clock.schedule_once(self._restore_session, 0.5)
         
         return self.screen_manager
     
+    def _add_secondary_screens(self, dt):
+        """Import and add the screens reached from home."""
+        from app.ui.screens.scanner import ScannerScreen
+        from app.ui.screens.crop_adjust import CropAdjustScreen
+        from app.ui.screens.export import ExportScreen
+        from app.ui.screens.settings import SettingsScreen
+        
+        self.scanner_screen = ScannerScreen(name='scanner')
+        self._save_session = getattr(self.scanner_screen, 'save_session', None)
+        self.screen_manager.add_widget(self.scanner_screen)
+        self.screen_manager.add_widget(CropAdjustScreen(name='crop_adjust'))
+        self.screen_manager.add_widget(ExportScreen(name='export'))
+        self.screen_manager.add_widget(SettingsScreen(name='settings'))
+    
     def _init_database(self):
         """Initialize SQLite database and repositories."""
         try:
+            from app.infra.storage.db import DatabaseManager
+            from app.infra.storage.session_store import SessionStore
+            from app.infra.storage.repositories import AppStateRepository
+            
             db_path = self._get_db_path()
             self.db_manager = DatabaseManager(db_path)
             self.db_manager.initialize()
             self.session_store = SessionStore(self.db_manager)
             self.app_state_repo = AppStateRepository(self.db_manager)
+            
+            # Load the session to restore while the screens are being built
+            self._session_prefetch = threading.Thread(
+                target=self._prefetch_session, daemon=True
+            )
+            self._session_prefetch.start()
             Logger.info("App: Database initialized successfully")
         except Exception as e:
-            Logger.error(f"App: Failed to initialize database: {e}")
+            Logger.error("App: Failed to initialize database: %s", e)
     
     def _init_ads(self):
         """Initialize ads manager and check purchase state."""
         try:
+            from app.domain.usecases import AdsManager
+            
             self.ads_manager = AdsManager(self.app_state_repo)
             # Check if ads should be shown
             if platform == 'android':
-                Clock.schedule_once(lambda dt: self.ads_manager.initialize(), 1.0)
+                Clock.schedule_once(self._init_ads_delayed, 0)
             Logger.info("App: Ads manager initialized")
         except Exception as e:
-            Logger.error(f"App: Failed to initialize ads: {e}")
+            Logger.error("App: Failed to initialize ads: %s", e)
+    
+    def _init_ads_delayed(self, dt):
+        """Start the ads SDK right after the first frame."""
+        self.ads_manager.initialize()
+    
+    def _prefetch_session(self):
+        """Query the active session off the UI thread (worker thread)."""
+        session = self.session_store.get_active_session()
+        if session:
+            # Pages load lazily on first access; do that here, not on the UI thread
+            session.pages
+        self._pending_session = session
     
     def _restore_session(self, dt):
         """Restore incomplete scan session if exists."""
+        prefetch = self._session_prefetch
+        if prefetch is not None and prefetch.is_alive():
+            # Don't block the UI thread on the query; check again shortly
+            Clock.schedule_once(self._restore_session, 0.1)
+            return
+        
         try:
-            if self.session_store:
-                session = self.session_store.get_active_session()
-                if session and session.pages:
-                    Logger.info(f"App: Restoring session with {len(session.pages)} pages")
-                    scanner_screen = self.screen_manager.get_screen('scanner')
-                    scanner_screen.restore_session(session)
+            session = self._pending_session
+            self._pending_session = None
+            if session and session.pages:
+                Logger.info("App: Restoring session with %d pages", len(session.pages))
+                self.scanner_screen.restore_session(session)
         except Exception as e:
-            Logger.error(f"App: Failed to restore session: {e}")
+            Logger.error("App: Failed to restore session: %s", e)
     
     def _get_db_path(self):
         """Get the database file path based on platform."""
-        if platform == 'android':
-            from android.storage import app_storage_path
-            return os.path.join(app_storage_path(), 'pdf_scanner.db')
-        else:
-            # Desktop fallback for testing
-            return os.path.join(os.path.dirname(__file__), 'pdf_scanner.db')
+        return os.path.join(self.get_app_storage_path(), 'pdf_scanner.db')
     
     def get_app_storage_path(self):
         """Get app-private storage path."""
-        if platform == 'android':
-            from android.storage import app_storage_path
-            return app_storage_path()
-        else:
-            return os.path.dirname(__file__)
+        if self._storage_path is None:
+            if platform == 'android':
+                self._storage_path = app_storage_path()
+            else:
+                # Desktop fallback for testing
+                self._storage_path = os.path.dirname(__file__)
+        return self._storage_path
+    
+    # The storage path always exists, so its subdirs need a single mkdir
     
     def get_cache_path(self):
         """Get cache directory path."""
-        base = self.get_app_storage_path()
-        cache_dir = os.path.join(base, 'cache')
-        os.makedirs(cache_dir, exist_ok=True)
-        return cache_dir
+        if self._cache_path is None:
+            cache_dir = os.path.join(self.get_app_storage_path(), 'cache')
+            try:
+                os.mkdir(cache_dir)
+            except FileExistsError:
+                pass
+            self._cache_path = cache_dir
+        return self._cache_path
     
     def get_documents_path(self):
         """Get documents directory path."""
-        base = self.get_app_storage_path()
-        docs_dir = os.path.join(base, 'documents')
-        os.makedirs(docs_dir, exist_ok=True)
-        return docs_dir
+        if self._docs_path is None:
+            docs_dir = os.path.join(self.get_app_storage_path(), 'documents')
+            try:
+                os.mkdir(docs_dir)
+            except FileExistsError:
+                pass
+            self._docs_path = docs_dir
+        return self._docs_path
     
     def on_pause(self):
         """Called when the app is paused (Android)."""
         Logger.info("App: Pausing - saving session")
         try:
-            scanner_screen = self.screen_manager.get_screen('scanner')
-            if hasattr(scanner_screen, 'save_session'):
-                scanner_screen.save_session()
+            if self._save_session:
+                self._save_session()
+            if self.session_store:
+                # The app may be killed while paused
+                self.session_store.flush()
         except Exception as e:
-            Logger.error(f"App: Error saving session on pause: {e}")
+            Logger.error("App: Error saving session on pause: %s", e)
         return True
     
     def on_resume(self):
@@ -155,13 +209,14 @@ class PDFScannerApp(App):
         """Called when the app is stopping."""
         Logger.info("App: Stopping")
         try:
-            scanner_screen = self.screen_manager.get_screen('scanner')
-            if hasattr(scanner_screen, 'save_session'):
-                scanner_screen.save_session()
+            if self._save_session:
+                self._save_session()
+            if self.session_store:
+                self.session_store.flush()
             if self.db_manager:
                 self.db_manager.close()
         except Exception as e:
-            Logger.error(f"App: Error on stop: {e}")
+            Logger.error("App: Error on stop: %s", e)
 
 
 def main():
@@ -181,7 +236,6 @@ def main():
             
             # 1. App storage (always writable)
             if platform == 'android':
-                from android.storage import app_storage_path
                 log_dir = app_storage_path()
             else:
                 log_dir = os.path.dirname(os.path.abspath(__file__))